@@ -1,13 +1,30 @@
+import asyncio
 import importlib
 import inspect
 import os
-from typing import List, Optional, Dict, Any, Type
+from typing import List, Literal, Optional, Dict, Any, Type
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, ValidationError
 
 # Base simulation class for type hinting and discovery logic
-from backend.simulations.base_simulation import SimulationModule, BaseSimulationParams, BaseSimulationResult
+from backend.simulations.base_simulation import SimulationModule, BaseSimulationParams, BaseSimulationResult, iter_result_events
+from backend.simulation_cache import params_fingerprint, simulation_cache
+from backend.simulation_executor import simulation_executor
+from backend.result_encoding import (
+    COLUMNAR_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    accepts_media_type,
+    aiter_ndjson_lines,
+    encode_columnar,
+    get_accepted_media_type_params,
+    iter_ndjson_lines,
+)
+from backend.simulation_sweep import SweepRequest, run_sweep
+from backend.series_decimation import decimate_result
 
 # CORS Middleware
 from fastapi.middleware.cors import CORSMiddleware
@@ -25,6 +42,7 @@ class Experiment(BaseModel):
     category: str
     description: str
     image_url: Optional[str] = "/images/placeholder.png"
+    operations: List[str] = []
 
 class SimulationData(BaseModel):
     experiment_type: str
@@ -90,6 +108,61 @@ def discover_simulation_modules() -> Dict[str, SimulationModule]:
 
 simulation_modules_registry: Dict[str, SimulationModule] = discover_simulation_modules()
 
+# --- Simulation Dispatch ---
+
+# Execuções em andamento por impressão digital dos parâmetros (single-flight):
+# requisições idênticas simultâneas aguardam a mesma tarefa em vez de recalcular.
+_inflight_simulations: Dict[str, "asyncio.Task[BaseModel]"] = {}
+
+async def _execute_and_cache(module_instance: SimulationModule, params_object: BaseModel, cache_key: Optional[str]) -> BaseModel:
+    result = await simulation_executor.run_simulation(module_instance, params_object)
+    if cache_key is not None:
+        simulation_cache.put(cache_key, result)
+    return result
+
+def _release_inflight(fingerprint: str, task: "asyncio.Task[BaseModel]") -> None:
+    _inflight_simulations.pop(fingerprint, None)
+    # Marca a exceção como consumida caso todos os clientes tenham desistido antes do fim.
+    if not task.cancelled():
+        task.exception()
+
+async def find_shared_result(module_instance: SimulationModule, params_object: BaseModel) -> Optional[BaseModel]:
+    """Resultado já no cache ou em cálculo por outra requisição idêntica; None se for preciso executar."""
+    if not module_instance.is_result_cacheable():
+        return None
+    experiment_name = module_instance.get_name()
+    fingerprint = params_fingerprint(experiment_name, params_object)
+    if simulation_cache.is_enabled_for(experiment_name):
+        cached_result = simulation_cache.get(fingerprint)
+        if cached_result is not None:
+            return cached_result
+    task = _inflight_simulations.get(fingerprint)
+    # shield: se um cliente desconectar, a execução continua para os demais que aguardam.
+    return await asyncio.shield(task) if task is not None else None
+
+async def dispatch_simulation(module_instance: SimulationModule, params_object: BaseModel) -> BaseModel:
+    if not module_instance.is_result_cacheable():
+        return await simulation_executor.run_simulation(module_instance, params_object)
+
+    # Sem execução em andamento, find_shared_result não suspende, então nenhuma outra
+    # requisição idêntica pode registrar uma tarefa antes da criada abaixo.
+    shared_result = await find_shared_result(module_instance, params_object)
+    if shared_result is not None:
+        return shared_result
+
+    experiment_name = module_instance.get_name()
+    fingerprint = params_fingerprint(experiment_name, params_object)
+    use_cache = simulation_cache.is_enabled_for(experiment_name)
+    task = asyncio.ensure_future(_execute_and_cache(module_instance, params_object, fingerprint if use_cache else None))
+    _inflight_simulations[fingerprint] = task
+    task.add_done_callback(lambda finished: _release_inflight(fingerprint, finished))
+    return await asyncio.shield(task)
+
+def streams_incrementally(module_instance: SimulationModule) -> bool:
+    # A implementação padrão de stream_simulation calcula o resultado inteiro antes do
+    # primeiro evento; nesse caso é melhor passar pelo cache e pelo single-flight.
+    return type(module_instance).stream_simulation is not SimulationModule.stream_simulation
+
 # --- API Endpoints ---
 
 @app.get("/api/experiments", response_model=List[Experiment])
@@ -101,32 +174,152 @@ async def get_experiments():
                 id=mod_instance.get_name(),
                 name=mod_instance.get_display_name(),
                 category=mod_instance.get_category(),
-                description=mod_instance.get_description()
+                description=mod_instance.get_description(),
+                operations=list(mod_instance.get_operations())
             )
         )
     return experiments_data
 
+async def parse_request_params(request: Request, ParameterModel: Type[BaseModel]) -> BaseModel:
+    try:
+        payload_json = await request.json()
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON payload: {e}")
+
+    try:
+        return ParameterModel.model_validate(payload_json)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=jsonable_encoder(e.errors()))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error processing parameters: {e}")
+
 @app.post("/api/simulation/{experiment_name}/start")
-async def start_generic_simulation(experiment_name: str, request: Request):
+async def start_generic_simulation(
+    experiment_name: str,
+    request: Request,
+    max_points: Optional[int] = Query(None, ge=2, description="Reduz cada série numérica do resultado a no máximo este número de pontos."),
+    decimate: Literal["lttb"] = Query("lttb", description="Método de redução usado com max_points."),
+):
     module_instance = simulation_modules_registry.get(experiment_name)
     if not module_instance:
         raise HTTPException(status_code=404, detail=f"Experiment '{experiment_name}' not found.")
 
+    params_object = await parse_request_params(request, module_instance.get_parameter_schema())
+
+    result: Optional[BaseModel] = None
+    if accepts_media_type(request, NDJSON_MEDIA_TYPE) and max_points is None and streams_incrementally(module_instance):
+        # Modo de transmissão: o resumo sai primeiro e os pontos seguem à medida que são gerados.
+        # Um resultado já no cache (ou em cálculo para outra requisição) é reaproveitado.
+        result = await find_shared_result(module_instance, params_object)
+        if result is None:
+            # O primeiro evento é obtido antes de responder para que erros ainda virem um status HTTP.
+            events = simulation_executor.stream_call(module_instance.stream_simulation, params_object)
+            first_event = await anext(events, None)
+            return StreamingResponse(aiter_ndjson_lines(first_event, events), media_type=NDJSON_MEDIA_TYPE)
+
+    if result is None:
+        result = await dispatch_simulation(module_instance, params_object)
+    if max_points is not None:
+        # A redução é feita sobre o resultado completo (que fica no cache), para que clientes
+        # com resoluções diferentes reaproveitem a mesma simulação.
+        result = await run_in_threadpool(decimate_result, result, max_points, decimate)
+
+    if accepts_media_type(request, NDJSON_MEDIA_TYPE):
+        events = iter_result_events(result)
+        return StreamingResponse(iter_ndjson_lines(next(events), events), media_type=NDJSON_MEDIA_TYPE)
+
+    columnar_params = get_accepted_media_type_params(request, COLUMNAR_MEDIA_TYPE)
+    if columnar_params is not None:
+        # Formato binário compacto para séries numéricas longas (ver backend/result_encoding.py).
+        payload = encode_columnar(result, columnar_params.get("dtype", "float64"))
+        return Response(content=payload, media_type=COLUMNAR_MEDIA_TYPE)
+    # Serialização direta pelo pydantic-core: bem mais rápida que o jsonable_encoder em séries longas.
+    return Response(content=result.model_dump_json(), media_type="application/json")
+
+# Limite de itens por requisição de lote, para evitar que um único cliente monopolize o worker.
+MAX_BATCH_SIZE = 1000
+
+def run_simulation_batch(module_instance: SimulationModule, payloads: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Executa uma lista de payloads de parâmetros em um único módulo.
+    Payloads idênticos são validados, executados e serializados apenas uma vez;
+    cada item recebe seu próprio resultado ou erro, sem interromper o lote.
+    """
     ParameterModel: Type[BaseSimulationParams] = module_instance.get_parameter_schema()
+    outcomes_by_key: Dict[str, Dict[str, Any]] = {}
+    batch_results: List[Dict[str, Any]] = []
+
+    for index, payload in enumerate(payloads):
+        try:
+            payload_key = json.dumps(payload, sort_keys=True)
+        except (TypeError, ValueError):
+            payload_key = None
+
+        outcome = outcomes_by_key.get(payload_key) if payload_key is not None else None
+        if outcome is None:
+            try:
+                params_object = ParameterModel.model_validate(payload)
+                result = module_instance.run_simulation(params_object)
+                outcome = {"status_code": 200, "result": result.model_dump(mode="json")}
+            except ValidationError as e:
+                outcome = {"status_code": 422, "error": jsonable_encoder(e.errors())}
+            except HTTPException as e:
+                outcome = {"status_code": e.status_code, "error": e.detail}
+            except Exception as e:
+                outcome = {"status_code": 500, "error": f"Erro inesperado na simulação: {e}"}
+            if payload_key is not None:
+                outcomes_by_key[payload_key] = outcome
+
+        batch_results.append({"index": index, **outcome})
+
+    return batch_results
+
+@app.post("/api/simulation/{experiment_name}/batch")
+async def batch_generic_simulation(experiment_name: str, request: Request):
+    module_instance = simulation_modules_registry.get(experiment_name)
+    if not module_instance:
+        raise HTTPException(status_code=404, detail=f"Experiment '{experiment_name}' not found.")
 
     try:
         payload_json = await request.json()
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid JSON payload: {e}")
 
-    try:
-        params_object = ParameterModel.model_validate(payload_json)
-    except ValidationError as e:
-        raise HTTPException(status_code=422, detail=e.errors())
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error processing parameters: {e}")
+    # Aceita tanto uma lista simples quanto {"items": [...]}.
+    items = payload_json.get("items") if isinstance(payload_json, dict) else payload_json
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="O lote deve ser uma lista de payloads de parâmetros.")
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"O lote contém {len(items)} itens e excede o limite de {MAX_BATCH_SIZE}.")
+
+    # Os resultados já estão serializados; JSONResponse evita a segunda passagem do jsonable_encoder.
+    batch_results = await simulation_executor.run_call(module_instance, run_simulation_batch, module_instance, items)
+    return JSONResponse(content={"results": batch_results})
+
+@app.post("/api/simulation/{experiment_name}/sweep")
+async def sweep_generic_simulation(experiment_name: str, sweep: SweepRequest):
+    module_instance = simulation_modules_registry.get(experiment_name)
+    if not module_instance:
+        raise HTTPException(status_code=404, detail=f"Experiment '{experiment_name}' not found.")
+
+    return JSONResponse(content=await run_sweep(module_instance, sweep))
+
+@app.post("/api/simulation/{experiment_name}/operations/{operation_name}")
+async def run_simulation_operation(experiment_name: str, operation_name: str, request: Request):
+    module_instance = simulation_modules_registry.get(experiment_name)
+    if not module_instance:
+        raise HTTPException(status_code=404, detail=f"Experiment '{experiment_name}' not found.")
+    operation = module_instance.get_operations().get(operation_name)
+    if operation is None:
+        raise HTTPException(status_code=404, detail=f"Operation '{operation_name}' not found for experiment '{experiment_name}'.")
+
+    params_object = await parse_request_params(request, operation.parameter_schema)
+    result = await simulation_executor.run_call(module_instance, operation.handler, params_object)
+    return Response(content=result.model_dump_json(), media_type="application/json")
 
-    return module_instance.run_simulation(params_object)
+@app.get("/api/simulation-cache/stats")
+async def get_simulation_cache_stats():
+    return simulation_cache.stats()
 
 @app.post("/api/simulations/save", status_code=201)
 async def save_simulation(simulation_data: SimulationData):
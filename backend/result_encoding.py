@@ -0,0 +1,144 @@
+import json
+import struct
+import sys
+import typing
+from array import array
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Type
+
+from fastapi import HTTPException, Request
+from pydantic import BaseModel
+
+from backend.simulations.base_simulation import get_series_fields
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+COLUMNAR_MEDIA_TYPE = "application/vnd.simulajuls.columnar"
+
+# Formato colunar: MAGIC, tamanho do cabeçalho (uint32 little-endian), cabeçalho JSON
+# completado com espaços até múltiplo de 8 bytes, e então as colunas de cada série,
+# contíguas e em little-endian, com offsets relativos ao início da área de dados.
+COLUMNAR_MAGIC = b"SJC1"
+COLUMNAR_DTYPES = {"float64": "d", "float32": "f"}
+
+
+def get_accepted_media_type_params(request: Request, media_type: str) -> Optional[Dict[str, str]]:
+    """
+    Retorna os parâmetros (ex: {'dtype': 'float32'}) com que `media_type` aparece no
+    cabeçalho Accept, ou None se o tipo não foi pedido explicitamente.
+    """
+    accept_header = request.headers.get("accept", "")
+    for part in accept_header.split(","):
+        media_range, *raw_params = part.split(";")
+        if media_range.strip().lower() != media_type:
+            continue
+        params: Dict[str, str] = {}
+        for raw_param in raw_params:
+            key, _, value = raw_param.partition("=")
+            params[key.strip().lower()] = value.strip().strip('"')
+        return params
+    return None
+
+
+def accepts_media_type(request: Request, media_type: str) -> bool:
+    """Verifica se o cabeçalho Accept da requisição pede explicitamente `media_type`."""
+    return get_accepted_media_type_params(request, media_type) is not None
+
+
+def _encode_json_line(event: Dict[str, Any]) -> bytes:
+    return (json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def iter_ndjson_lines(first_event: Optional[Dict[str, Any]], events: Iterator[Dict[str, Any]]) -> Iterator[bytes]:
+    """
+    Serializa os eventos de SimulationModule.stream_simulation como NDJSON,
+    uma linha por evento, terminando com um evento 'end' com o total de pontos.
+    `first_event` é o evento já consumido pelo chamador (para que erros de
+    validação aconteçam antes de a resposta começar).
+    """
+    points_count = 0
+    if first_event is not None:
+        yield _encode_json_line(first_event)
+    for event in events:
+        if event.get("event") == "point":
+            points_count += 1
+        yield _encode_json_line(event)
+    yield _encode_json_line({"event": "end", "points": points_count})
+
+
+async def aiter_ndjson_lines(first_event: Optional[Dict[str, Any]], events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Versão de iter_ndjson_lines para eventos produzidos de forma assíncrona (ver SimulationExecutor.stream_call)."""
+    points_count = 0
+    if first_event is not None:
+        yield _encode_json_line(first_event)
+    async for event in events:
+        if event.get("event") == "point":
+            points_count += 1
+        yield _encode_json_line(event)
+    yield _encode_json_line({"event": "end", "points": points_count})
+
+
+def _series_item_model(annotation: Any) -> Type[BaseModel]:
+    if typing.get_origin(annotation) is typing.Union:
+        annotation = next(arg for arg in typing.get_args(annotation) if arg is not type(None))
+    return typing.get_args(annotation)[0]
+
+
+def encode_columnar(result: BaseModel, dtype: str = "float64") -> bytes:
+    """
+    Codifica um resultado com séries numéricas como estrutura de arrays:
+    os campos escalares vão no cabeçalho JSON e cada coluna das séries
+    (ex: trajectory.time/x/y) vira um bloco binário contínuo.
+    """
+    typecode = COLUMNAR_DTYPES.get(dtype)
+    if typecode is None:
+        raise HTTPException(status_code=406, detail=f"dtype '{dtype}' não suportado. Permitidos: {list(COLUMNAR_DTYPES)}.")
+
+    series_fields = get_series_fields(type(result))
+    header: Dict[str, Any] = {
+        "result": result.model_dump(mode="json", exclude=set(series_fields)),
+        "dtype": dtype,
+        "byte_order": "little",
+        "series": {},
+    }
+
+    blocks = []
+    offset = 0
+    item_size = array(typecode).itemsize
+    for series_name in series_fields:
+        points = getattr(result, series_name) or []
+        item_schema = type(result).model_fields[series_name].annotation
+        column_names = list(_series_item_model(item_schema).model_fields)
+        columns_header: Dict[str, Dict[str, int]] = {}
+        for column_name in column_names:
+            column = array(typecode, [getattr(point, column_name) for point in points])
+            if sys.byteorder == "big":
+                column.byteswap()
+            blocks.append(column.tobytes())
+            columns_header[column_name] = {"offset": offset}
+            offset += len(points) * item_size
+        header["series"][series_name] = {"length": len(points), "columns": columns_header}
+
+    header_bytes = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    # Alinha o início dos dados a 8 bytes para que o cliente possa criar Float64Array sem cópia.
+    prefix_size = len(COLUMNAR_MAGIC) + 4
+    header_bytes += b" " * (-(prefix_size + len(header_bytes)) % 8)
+    return COLUMNAR_MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes + b"".join(blocks)
+
+
+def decode_columnar(payload: bytes) -> Dict[str, Any]:
+    """Inverso de encode_columnar: retorna o cabeçalho com as colunas como listas de floats."""
+    if payload[:len(COLUMNAR_MAGIC)] != COLUMNAR_MAGIC:
+        raise ValueError("Payload colunar inválido (assinatura ausente).")
+    (header_length,) = struct.unpack_from("<I", payload, len(COLUMNAR_MAGIC))
+    data_start = len(COLUMNAR_MAGIC) + 4 + header_length
+    header = json.loads(payload[len(COLUMNAR_MAGIC) + 4:data_start])
+    typecode = COLUMNAR_DTYPES[header["dtype"]]
+    item_size = array(typecode).itemsize
+    for series in header["series"].values():
+        for column in series["columns"].values():
+            start = data_start + column["offset"]
+            values = array(typecode)
+            values.frombytes(payload[start:start + series["length"] * item_size])
+            if sys.byteorder == "big":
+                values.byteswap()
+            column["values"] = values.tolist()
+    return header
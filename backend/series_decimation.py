@@ -0,0 +1,92 @@
+from typing import List, Sequence
+
+from pydantic import BaseModel
+
+from backend.simulations.base_simulation import get_series_fields
+
+# Métodos de redução aceitos pelo parâmetro 'decimate' do endpoint de simulação.
+DECIMATION_METHODS = ("lttb",)
+
+
+def _normalized(values: Sequence[float]) -> List[float]:
+    # Colunas com unidades diferentes (ex: tempo e altura) são levadas a [0, 1] para que as áreas sejam comparáveis.
+    low, high = min(values), max(values)
+    span = high - low
+    if span == 0:
+        return [0.0] * len(values)
+    return [(value - low) / span for value in values]
+
+
+def lttb_indices(x_values: Sequence[float], y_columns: Sequence[Sequence[float]], threshold: int) -> List[int]:
+    """
+    Largest-Triangle-Three-Buckets: escolhe `threshold` índices que preservam
+    a forma visual da série. O primeiro e o último ponto são sempre mantidos;
+    os demais são divididos em baldes e, de cada balde, fica o ponto que forma
+    o maior triângulo com o ponto escolhido antes e a média do balde seguinte.
+    Com várias colunas y, a área considerada é a soma das áreas em cada coluna.
+    """
+    n = len(x_values)
+    if threshold >= n or n <= 2:
+        return list(range(n))
+    if threshold <= 2:
+        return [0, n - 1]
+
+    xs = _normalized(x_values)
+    ys = [_normalized(column) for column in y_columns]
+    bucket_size = (n - 2) / (threshold - 2)
+
+    selected = [0]
+    previous = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        next_start, next_end = end, min(int((bucket + 2) * bucket_size) + 1, n)
+        if next_start >= n - 1:
+            next_start, next_end = n - 1, n
+        count = next_end - next_start
+        average_x = sum(xs[next_start:next_end]) / count
+        average_ys = [sum(column[next_start:next_end]) / count for column in ys]
+
+        best_index, best_area = start, -1.0
+        for i in range(start, end):
+            # Dobro da área do triângulo (constante irrelevante para a comparação).
+            area = sum(
+                abs((xs[previous] - average_x) * (column[i] - column[previous]) - (xs[previous] - xs[i]) * (average_y - column[previous]))
+                for column, average_y in zip(ys, average_ys)
+            )
+            if area > best_area:
+                best_index, best_area = i, area
+        selected.append(best_index)
+        previous = best_index
+
+    selected.append(n - 1)
+    return selected
+
+
+def decimate_result(result: BaseModel, max_points: int, method: str = "lttb") -> BaseModel:
+    """
+    Reduz cada série numérica do resultado (ex: 'trajectory', 'titration_curve')
+    a no máximo `max_points` pontos. O primeiro campo dos pontos é usado como
+    eixo x e os demais como colunas y. Retorna uma cópia; o resultado original
+    (possivelmente em cache) não é alterado.
+    """
+    if method not in DECIMATION_METHODS:
+        raise ValueError(f"Método de redução desconhecido: {method}")
+
+    updates = {}
+    for series_name in get_series_fields(type(result)):
+        points = getattr(result, series_name)
+        if not points or len(points) <= max_points:
+            continue
+        x_field, *y_fields = type(points[0]).model_fields
+        indices = lttb_indices(
+            [getattr(point, x_field) for point in points],
+            [[getattr(point, field) for point in points] for field in y_fields],
+            max_points,
+        )
+        updates[series_name] = [points[i] for i in indices]
+        # Resultados com colunas paralelas à série (ex: unit_views do lançamento) as reduzem com os mesmos índices.
+        aligned_updates = getattr(result, "aligned_series_updates", None)
+        if aligned_updates is not None:
+            updates.update(aligned_updates(series_name, indices))
+    return result.model_copy(update=updates) if updates else result
@@ -0,0 +1,125 @@
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from backend.simulation_executor import read_int_env
+
+# Dígitos significativos mantidos ao normalizar floats, para que 0.1 + 0.2 e 0.3 gerem a mesma impressão digital.
+FINGERPRINT_FLOAT_DIGITS = 12
+
+
+def _normalize_value(value: Any) -> Any:
+    if isinstance(value, float):
+        if math.isnan(value) or math.isinf(value):
+            return repr(value)
+        normalized = float(f"{value:.{FINGERPRINT_FLOAT_DIGITS}g}")
+        return 0.0 if normalized == 0 else normalized # também elimina -0.0
+    if isinstance(value, dict):
+        return {str(key): _normalize_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize_value(item) for item in value]
+    return value
+
+
+def params_fingerprint(experiment_name: str, params: BaseModel) -> str:
+    """
+    Impressão digital canônica de um conjunto de parâmetros já validado.
+    Usa o dump do modelo (com os valores padrão resolvidos, ex.: OutputUnitSelection),
+    campos ordenados e floats normalizados.
+    """
+    canonical = json.dumps(_normalize_value(params.model_dump(mode="json")), sort_keys=True, separators=(",", ":"))
+    return f"{experiment_name}:{hashlib.sha256(canonical.encode('utf-8')).hexdigest()}"
+
+
+class SimulationResultCache:
+    """
+    Cache LRU com expiração (TTL) para resultados de simulações determinísticas.
+    Pode ser desabilitado por módulo; mantém contadores de acertos e falhas.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, disabled_modules: Optional[Set[str]] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disabled_modules: Set[str] = set(disabled_modules or ())
+        self._entries: "OrderedDict[str, Tuple[float, BaseModel]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.module_stats: Dict[str, Dict[str, int]] = {}
+
+    def is_enabled_for(self, experiment_name: str) -> bool:
+        return self.max_entries > 0 and experiment_name not in self.disabled_modules
+
+    def set_module_enabled(self, experiment_name: str, enabled: bool) -> None:
+        if enabled:
+            self.disabled_modules.discard(experiment_name)
+        else:
+            self.disabled_modules.add(experiment_name)
+            self.invalidate_module(experiment_name)
+
+    def _count(self, experiment_name: str, counter: str) -> None:
+        stats = self.module_stats.setdefault(experiment_name, {"hits": 0, "misses": 0})
+        stats[counter] += 1
+
+    def get(self, key: str) -> Optional[BaseModel]:
+        experiment_name = key.split(":", 1)[0]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                self._count(experiment_name, "misses")
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self._count(experiment_name, "hits")
+            return entry[1]
+
+    def put(self, key: str, result: BaseModel) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_module(self, experiment_name: str) -> None:
+        prefix = f"{experiment_name}:"
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "disabled_modules": sorted(self.disabled_modules),
+                "modules": {name: dict(counters) for name, counters in self.module_stats.items()},
+            }
+
+
+simulation_cache = SimulationResultCache(
+    max_entries=read_int_env("SIMULATION_CACHE_MAX_ENTRIES", 256),
+    ttl_seconds=read_int_env("SIMULATION_CACHE_TTL_SECONDS", 600),
+    disabled_modules={name.strip() for name in os.environ.get("SIMULATION_CACHE_DISABLED_MODULES", "").split(",") if name.strip()},
+)
@@ -0,0 +1,177 @@
+import asyncio
+import itertools
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from backend.simulations.base_simulation import SimulationModule
+
+# Eventos consumidos por ida ao pool de threads ao transmitir uma simulação.
+STREAM_BATCH_SIZE = 256
+
+# Tipo de pool usado para cada dica de custo declarada pelos módulos (ver SimulationModule.get_execution_cost).
+COST_HINT_POOLS: Dict[str, str] = {
+    "light": "thread",
+    "heavy": "process",
+}
+
+
+def read_int_env(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        print(f"Warning: invalid value for {name}, using default {default}.")
+        return default
+
+
+def parse_pool_overrides(raw: str) -> Dict[str, str]:
+    """Lê substituições no formato 'modulo=thread,outro-modulo=process'."""
+    overrides: Dict[str, str] = {}
+    for entry in raw.split(","):
+        if not entry.strip():
+            continue
+        module_name, _, pool_kind = entry.partition("=")
+        pool_kind = pool_kind.strip()
+        if pool_kind not in ("thread", "process"):
+            print(f"Warning: ignoring execution override '{entry}' (pool must be 'thread' or 'process').")
+            continue
+        overrides[module_name.strip()] = pool_kind
+    return overrides
+
+
+def _invoke_in_worker(func: Callable[..., Any], args: Tuple[Any, ...]) -> Tuple[str, Any]:
+    # HTTPException não pode ser serializada entre processos; é transportada como tupla e recriada no processo principal.
+    try:
+        return ("ok", func(*args))
+    except HTTPException as e:
+        return ("http_error", (e.status_code, e.detail))
+
+
+def _start_stream(func: Callable[..., Any], args: Tuple[Any, ...]) -> Tuple[Iterator[Any], List[Any]]:
+    # Cria o iterador dentro do pool: implementações que calculam tudo ao serem chamadas não bloqueiam o event loop.
+    events = iter(func(*args))
+    return events, list(itertools.islice(events, 1))
+
+
+def _next_batch(events: Iterator[Any], count: int) -> List[Any]:
+    return list(itertools.islice(events, count))
+
+
+def _run_simulation(module_instance: SimulationModule, params: BaseModel) -> BaseModel:
+    return module_instance.run_simulation(params)
+
+
+class SimulationExecutor:
+    """
+    Executa simulações fora do event loop, em um pool de threads ou de processos
+    escolhido pela dica de custo de cada módulo. O número de execuções pendentes
+    é limitado; acima do limite a requisição é recusada com 503.
+    """
+
+    def __init__(self, thread_workers: int, process_workers: int, max_pending: int,
+                 pool_overrides: Optional[Dict[str, str]] = None):
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.max_pending = max_pending
+        self.pool_overrides: Dict[str, str] = pool_overrides or {}
+        self.pending = 0
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+
+    def get_thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix="simulation")
+        return self._thread_pool
+
+    def get_process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.process_workers)
+        return self._process_pool
+
+    def pool_kind_for(self, module_instance: SimulationModule) -> str:
+        override = self.pool_overrides.get(module_instance.get_name())
+        if override:
+            return override
+        return COST_HINT_POOLS.get(module_instance.get_execution_cost(), "thread")
+
+    def _reserve(self, count: int) -> None:
+        if self.pending + count > self.max_pending:
+            raise HTTPException(
+                status_code=503,
+                detail="Servidor ocupado: a fila de simulações está cheia. Tente novamente em instantes.",
+                headers={"Retry-After": "1"},
+            )
+        # O contador só é alterado no event loop, portanto não precisa de lock.
+        self.pending += count
+
+    def _get_pool(self, pool_kind: str) -> Executor:
+        return self.get_process_pool() if pool_kind == "process" else self.get_thread_pool()
+
+    @staticmethod
+    def _unwrap(outcome: Tuple[str, Any]) -> Any:
+        status, value = outcome
+        if status == "http_error":
+            status_code, detail = value
+            raise HTTPException(status_code=status_code, detail=detail)
+        return value
+
+    async def run_call(self, module_instance: SimulationModule, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Executa `func(*args)` no pool adequado a `module_instance`. Para o pool de
+        processos, `func` e seus argumentos precisam ser serializáveis com pickle.
+        """
+        self._reserve(1)
+        try:
+            pool = self._get_pool(self.pool_kind_for(module_instance))
+            outcome = await asyncio.get_running_loop().run_in_executor(pool, _invoke_in_worker, func, args)
+        finally:
+            self.pending -= 1
+        return self._unwrap(outcome)
+
+    async def map_calls(self, pool_kind: str, func: Callable[..., Any], args_list: List[Tuple[Any, ...]]) -> List[Any]:
+        """
+        Executa `func(*args)` para cada item de `args_list` em paralelo no pool
+        `pool_kind`. Cada chamada ocupa uma vaga da fila; as vagas são reservadas
+        todas de uma vez, ou a requisição inteira é recusada com 503.
+        """
+        self._reserve(len(args_list))
+        try:
+            pool = self._get_pool(pool_kind)
+            loop = asyncio.get_running_loop()
+            outcomes = await asyncio.gather(*[loop.run_in_executor(pool, _invoke_in_worker, func, args) for args in args_list])
+        finally:
+            self.pending -= len(args_list)
+        return [self._unwrap(outcome) for outcome in outcomes]
+
+    async def stream_call(self, func: Callable[..., Any], *args: Any) -> AsyncIterator[Any]:
+        """
+        Itera os eventos de `func(*args)` no pool de threads: o primeiro sozinho
+        (para que erros apareçam antes de a resposta começar) e os demais em
+        lotes de STREAM_BATCH_SIZE. A transmissão ocupa uma vaga da fila do
+        primeiro evento até terminar ou ser interrompida.
+        """
+        self._reserve(1)
+        try:
+            pool = self.get_thread_pool()
+            loop = asyncio.get_running_loop()
+            events, batch = await loop.run_in_executor(pool, _start_stream, func, args)
+            while batch:
+                for event in batch:
+                    yield event
+                batch = await loop.run_in_executor(pool, _next_batch, events, STREAM_BATCH_SIZE)
+        finally:
+            self.pending -= 1
+
+    async def run_simulation(self, module_instance: SimulationModule, params: BaseModel) -> BaseModel:
+        return await self.run_call(module_instance, _run_simulation, module_instance, params)
+
+
+simulation_executor = SimulationExecutor(
+    thread_workers=read_int_env("SIMULATION_THREAD_WORKERS", min(32, (os.cpu_count() or 1) + 4)),
+    process_workers=read_int_env("SIMULATION_PROCESS_WORKERS", os.cpu_count() or 1),
+    max_pending=read_int_env("SIMULATION_MAX_PENDING", 64),
+    pool_overrides=parse_pool_overrides(os.environ.get("SIMULATION_POOL_OVERRIDES", "")),
+)
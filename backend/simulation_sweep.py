@@ -0,0 +1,210 @@
+import copy
+import importlib
+import itertools
+import math
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, Field, ValidationError, model_validator
+
+from backend.simulation_executor import simulation_executor
+from backend.simulations.base_simulation import SimulationModule
+
+# Limite de combinações por varredura e tamanho abaixo do qual não vale a pena
+# pagar o custo de enviar o trabalho para outros processos.
+MAX_SWEEP_POINTS = 20000
+SWEEP_INLINE_THRESHOLD = 64
+SWEEP_CHUNKS_PER_WORKER = 4
+
+
+class SweepAxis(BaseModel):
+    """
+    Define os valores de um eixo da varredura: uma lista explícita (`values`),
+    um intervalo com passo (`start`, `stop`, `step`) ou um número fixo de pontos
+    (`start`, `stop`, `num`) em escala linear ou logarítmica.
+    """
+    values: Optional[List[Any]] = Field(default=None, description="Valores explícitos do eixo.")
+    start: Optional[float] = Field(default=None, allow_inf_nan=False, description="Primeiro valor do intervalo.")
+    stop: Optional[float] = Field(default=None, allow_inf_nan=False, description="Último valor do intervalo (inclusivo).")
+    step: Optional[float] = Field(default=None, gt=0, allow_inf_nan=False, description="Passo do intervalo linear.")
+    num: Optional[int] = Field(default=None, ge=1, le=MAX_SWEEP_POINTS, description="Número de pontos entre start e stop.")
+    scale: Literal["linear", "log"] = Field(default="linear", description="Espaçamento dos pontos quando 'num' é usado.")
+
+    @model_validator(mode='after')
+    def check_axis_definition(self) -> 'SweepAxis':
+        if self.values is not None:
+            if not self.values:
+                raise ValueError("A lista 'values' do eixo não pode ser vazia.")
+            return self
+        if self.start is None or self.stop is None:
+            raise ValueError("Um eixo deve definir 'values' ou 'start' e 'stop'.")
+        if (self.step is None) == (self.num is None):
+            raise ValueError("Um eixo de intervalo deve definir exatamente um entre 'step' e 'num'.")
+        if self.scale == "log":
+            if self.num is None:
+                raise ValueError("Eixos em escala logarítmica devem usar 'num'.")
+            if self.start <= 0 or self.stop <= 0:
+                raise ValueError("Eixos em escala logarítmica exigem 'start' e 'stop' positivos.")
+        if self.step is not None and not math.isfinite(abs(self.stop - self.start) / self.step):
+            raise ValueError("O passo do eixo é pequeno demais para o intervalo.")
+        return self
+
+    def length(self) -> int:
+        """Número de valores do eixo, calculado sem expandi-lo."""
+        if self.values is not None:
+            return len(self.values)
+        if self.num is not None:
+            return self.num
+        return int(math.floor(abs(self.stop - self.start) / self.step + 1e-9)) + 1
+
+    def expand(self) -> List[Any]:
+        if self.values is not None:
+            return list(self.values)
+        if self.num is not None:
+            if self.num == 1:
+                return [self.start]
+            if self.scale == "log":
+                log_start, log_stop = math.log10(self.start), math.log10(self.stop)
+                return [10 ** (log_start + (log_stop - log_start) * i / (self.num - 1)) for i in range(self.num)]
+            return [self.start + (self.stop - self.start) * i / (self.num - 1) for i in range(self.num)]
+        # Intervalo com passo: calcula cada valor a partir do índice para não acumular erro de arredondamento.
+        direction = 1.0 if self.stop >= self.start else -1.0
+        return [self.start + direction * self.step * i for i in range(self.length())]
+
+
+class SweepRequest(BaseModel):
+    base: Dict[str, Any] = Field(default_factory=dict, description="Payload base compartilhado por todas as combinações.")
+    axes: Dict[str, SweepAxis] = Field(..., min_length=1, description="Eixos varridos, por nome de campo (aceita caminhos com '.' para campos aninhados).")
+
+
+def _set_field(payload: Dict[str, Any], field_path: str, value: Any) -> None:
+    target = payload
+    *parents, leaf = field_path.split(".")
+    for key in parents:
+        nested = target.get(key)
+        if not isinstance(nested, dict):
+            nested = {}
+            target[key] = nested
+        target = nested
+    target[leaf] = value
+
+
+def build_sweep_grid(sweep: SweepRequest) -> Tuple[Dict[str, List[Any]], List[int], List[Dict[str, Any]]]:
+    """
+    Expande os eixos e gera um payload por combinação, em ordem C
+    (o último eixo varia mais rápido). O limite de combinações é verificado
+    antes de expandir qualquer eixo.
+    """
+    shape = [axis.length() for axis in sweep.axes.values()]
+    total_points = math.prod(shape)
+    if total_points > MAX_SWEEP_POINTS:
+        raise HTTPException(status_code=400, detail=f"A varredura gera {total_points} combinações e excede o limite de {MAX_SWEEP_POINTS}.")
+    axis_values = {name: axis.expand() for name, axis in sweep.axes.items()}
+
+    payloads: List[Dict[str, Any]] = []
+    for combination in itertools.product(*axis_values.values()):
+        payload = copy.deepcopy(sweep.base)
+        for field_path, value in zip(axis_values.keys(), combination):
+            _set_field(payload, field_path, value)
+        payloads.append(payload)
+    return axis_values, shape, payloads
+
+
+# --- Execução (também usada dentro dos processos de trabalho) ---
+
+_worker_modules: Dict[Tuple[str, str], SimulationModule] = {}
+
+def _get_module_instance(module_ref: Tuple[str, str]) -> SimulationModule:
+    instance = _worker_modules.get(module_ref)
+    if instance is None:
+        module_path, class_name = module_ref
+        instance = getattr(importlib.import_module(module_path), class_name)()
+        _worker_modules[module_ref] = instance
+    return instance
+
+
+def _is_scalar(value: Any) -> bool:
+    return value is None or isinstance(value, (int, float, str, bool))
+
+
+def _scalar_fields(result: BaseModel) -> Dict[str, Any]:
+    """
+    Achata os campos de primeiro nível do resultado em colunas escalares
+    (parameters_used fica de fora). Uma lista de escalares vira o primeiro
+    elemento em '<campo>' e o tamanho em '<campo>_count'; uma série de pontos
+    vira o tamanho e os campos do primeiro e do último ponto
+    ('<campo>.first.<x>', '<campo>.last.<x>'). Assim o mesmo campo gera a
+    mesma coluna em todas as combinações, seja None ou uma lista.
+    """
+    row: Dict[str, Any] = {}
+    for name, value in result.model_dump(exclude={"parameters_used"}).items():
+        if _is_scalar(value):
+            row[name] = value
+        elif isinstance(value, list):
+            row[f"{name}_count"] = len(value)
+            if all(_is_scalar(item) for item in value):
+                row[name] = value[0] if value else None
+            elif value and all(isinstance(item, dict) for item in value):
+                for label, point in (("first", value[0]), ("last", value[-1])):
+                    row.update({f"{name}.{label}.{key}": item for key, item in point.items() if _is_scalar(item)})
+    return row
+
+
+def run_sweep_chunk(module_ref: Tuple[str, str], payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Executa um bloco de combinações. Os retornos contêm apenas tipos simples para serem transportáveis entre processos."""
+    module_instance = _get_module_instance(module_ref)
+    ParameterModel = module_instance.get_parameter_schema()
+    outcomes: List[Dict[str, Any]] = []
+    for payload in payloads:
+        try:
+            params_object = ParameterModel.model_validate(payload)
+            outcomes.append({"status_code": 200, "values": _scalar_fields(module_instance.run_simulation(params_object))})
+        except ValidationError as e:
+            outcomes.append({"status_code": 422, "error": jsonable_encoder(e.errors(include_context=False))})
+        except HTTPException as e:
+            outcomes.append({"status_code": e.status_code, "error": e.detail})
+        except Exception as e:
+            outcomes.append({"status_code": 500, "error": f"Erro inesperado na simulação: {e}"})
+    return outcomes
+
+
+async def run_sweep(module_instance: SimulationModule, sweep: SweepRequest) -> Dict[str, Any]:
+    axis_values, shape, payloads = build_sweep_grid(sweep)
+    module_ref = (type(module_instance).__module__, type(module_instance).__name__)
+
+    # As duas rotas passam pela fila do executor: o event loop não é bloqueado
+    # e a varredura conta para o limite de execuções pendentes (503).
+    if len(payloads) <= SWEEP_INLINE_THRESHOLD:
+        outcomes = await simulation_executor.run_call(module_instance, run_sweep_chunk, module_ref, payloads)
+    else:
+        # Cada bloco ocupa uma vaga, então o número de blocos não passa do tamanho da fila.
+        chunk_count = min(simulation_executor.process_workers * SWEEP_CHUNKS_PER_WORKER, simulation_executor.max_pending)
+        chunk_size = max(1, math.ceil(len(payloads) / max(1, chunk_count)))
+        chunk_results = await simulation_executor.map_calls("process", run_sweep_chunk, [
+            (module_ref, payloads[i:i + chunk_size]) for i in range(0, len(payloads), chunk_size)
+        ])
+        outcomes = [outcome for chunk in chunk_results for outcome in chunk]
+
+    return collect_sweep_columns(axis_values, shape, outcomes)
+
+
+def collect_sweep_columns(axis_values: Dict[str, List[Any]], shape: List[int], outcomes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Transpõe os resultados por combinação em colunas achatadas (ordem C), com None onde a combinação falhou."""
+    column_names: List[str] = []
+    for outcome in outcomes:
+        for name in outcome.get("values", {}):
+            if name not in column_names:
+                column_names.append(name)
+
+    columns: Dict[str, List[Any]] = {name: [] for name in column_names}
+    errors: List[Dict[str, Any]] = []
+    for index, outcome in enumerate(outcomes):
+        values = outcome.get("values")
+        if values is None:
+            errors.append({"index": index, "status_code": outcome["status_code"], "error": outcome["error"]})
+            values = {}
+        for name in column_names:
+            columns[name].append(values.get(name))
+
+    return {"axes": axis_values, "shape": shape, "columns": columns, "errors": errors}
@@ -1,6 +1,7 @@
+import typing
 from abc import ABC, abstractmethod
 from pydantic import BaseModel
-from typing import Type, Dict, Any
+from typing import Type, Dict, Any, Callable, Iterator, List, NamedTuple
 
 class BaseSimulationParams(BaseModel):
     """
@@ -17,6 +18,45 @@ class BaseSimulationResult(BaseModel):
     parameters_used: Dict[str, Any]
 
 
+def get_series_fields(result_schema: Type[BaseModel]) -> List[str]:
+    """
+    Retorna os nomes dos campos do resultado que são séries numéricas
+    (listas de modelos Pydantic cujos campos são todos float/int,
+    ex: 'trajectory', 'titration_curve').
+    """
+    series_fields: List[str] = []
+    for name, field_info in result_schema.model_fields.items():
+        annotation = field_info.annotation
+        if typing.get_origin(annotation) is typing.Union: # Optional[List[...]]
+            annotation = next((arg for arg in typing.get_args(annotation) if arg is not type(None)), annotation)
+        if typing.get_origin(annotation) is list:
+            item_args = typing.get_args(annotation)
+            if item_args and isinstance(item_args[0], type) and issubclass(item_args[0], BaseModel) and \
+               all(item_field.annotation in (float, int) for item_field in item_args[0].model_fields.values()):
+                series_fields.append(name)
+    return series_fields
+
+
+class SimulationOperation(NamedTuple):
+    """
+    Operação auxiliar de um módulo (ex: consulta analítica, problema inverso),
+    exposta em /api/simulation/{nome}/operations/{operação}. O handler recebe
+    uma instância validada de `parameter_schema` e retorna um modelo Pydantic.
+    """
+    parameter_schema: Type[BaseModel]
+    handler: Callable[[BaseModel], BaseModel]
+    description: str = ""
+
+
+def iter_result_events(result: BaseModel) -> Iterator[Dict[str, Any]]:
+    """Eventos 'summary' e 'point' (ver SimulationModule.stream_simulation) de um resultado já calculado."""
+    series_fields = get_series_fields(type(result))
+    yield {"event": "summary", "series": series_fields, "data": result.model_dump(mode="json", exclude=set(series_fields))}
+    for series_name in series_fields:
+        for point in getattr(result, series_name) or []:
+            yield {"event": "point", "series": series_name, "data": point.model_dump(mode="json")}
+
+
 class SimulationModule(ABC):
     """
     Interface abstrata para um módulo de simulação.
@@ -60,6 +100,29 @@ class SimulationModule(ABC):
         """
         pass
 
+    def get_execution_cost(self) -> str:
+        """
+        Dica de custo usada pelo backend para escolher onde executar a simulação:
+        'light' (pool de threads) ou 'heavy' (pool de processos).
+        Módulos com laços longos em Python devem sobrescrever e retornar 'heavy'.
+        """
+        return "light"
+
+    def is_result_cacheable(self) -> bool:
+        """
+        Indica se o resultado depende apenas dos parâmetros validados, podendo ser
+        reaproveitado pelo cache de resultados. Módulos com aleatoriedade ou estado
+        externo devem retornar False.
+        """
+        return True
+
+    def get_operations(self) -> Dict[str, SimulationOperation]:
+        """
+        Operações auxiliares do módulo, por nome. Servem para perguntas que não
+        precisam do resultado completo da simulação. Por padrão não há nenhuma.
+        """
+        return {}
+
     @abstractmethod
     def run_simulation(self, params: BaseModel) -> BaseModel:
         """
@@ -70,3 +133,14 @@ class SimulationModule(ABC):
         A implementação deve incluir o preenchimento de 'parameters_used' no resultado.
         """
         pass
+
+    def stream_simulation(self, params: BaseModel) -> Iterator[Dict[str, Any]]:
+        """
+        Executa a simulação como uma sequência de eventos: primeiro um evento
+        'summary' com os campos escalares do resultado, depois um evento 'point'
+        por item de cada série. Campos que só se conhecem depois das séries vão
+        em um evento 'summary_update' ao final, a ser mesclado no resumo. A
+        implementação padrão executa run_simulation por completo; módulos com
+        séries longas podem sobrescrever para gerar os pontos sob demanda.
+        """
+        return iter_result_events(self.run_simulation(params))
@@ -1,32 +1,14 @@
-import math
 from typing import Type, Optional, Tuple # Removed Dict, Any as they are not directly used in this new version
 
 from fastapi import HTTPException
 
 from backend.simulations.base_simulation import SimulationModule
+from backend.simulations.chemistry.equilibrium_solver import AcidBaseComposition, PKW, solve_ph
 from backend.simulations.chemistry.models_acid_base import AcidBaseSimulationParams, AcidBaseSimulationResult
-
-KW = 1e-14
-
-def solve_quadratic(a: float, b: float, c: float) -> Optional[float]:
-    # Solves ax^2 + bx + c = 0 for x, returning the positive root.
-    discriminant = b**2 - 4*a*c
-    if discriminant < 0:
-        return None
-
-    sqrt_discriminant = math.sqrt(discriminant)
-    # For x^2 + Kx - KC = 0 (where a=1, b=K, c=-KC), K > 0, C_initial > 0.
-    # The positive root is given by (-K + sqrt(K^2 + 4KC)) / 2.
-    # More generally, for ax^2+bx+c=0, if a solution for concentration [H+] or [OH-] is sought,
-    # it must be positive.
-    x1 = (-b + sqrt_discriminant) / (2*a)
-    x2 = (-b - sqrt_discriminant) / (2*a)
-
-    if x1 > 1e-15: # Using a small epsilon to check for effectively positive
-        return x1
-    elif x2 > 1e-15: # This case might be relevant if 'a' could be negative, but not for typical Ka/Kb forms.
-        return x2
-    return None
+from backend.simulations.chemistry.strong_electrolytes import (
+    strong_acid_factor, strong_acid_terms, strong_acid_weak_steps, strong_base_factor,
+)
+from backend.simulations.unit_registry import conversion_factor
 
 
 class AcidBaseModule(SimulationModule):
@@ -40,7 +22,7 @@ class AcidBaseModule(SimulationModule):
         return "Chemistry"
 
     def get_description(self) -> str:
-        return "Simula reações ácido-base, incluindo ácidos/bases fortes e fracos (monopróticos puros), calculando o pH e cor do indicador."
+        return "Simula reações ácido-base entre ácidos/bases fortes e fracos (monopróticos), calculando o pH pelo balanço de cargas e a cor do indicador."
 
     def get_parameter_schema(self) -> Type[AcidBaseSimulationParams]:
         return AcidBaseSimulationParams
@@ -60,8 +42,9 @@ class AcidBaseModule(SimulationModule):
         if params.base_kb is not None and params.base_kb <= 0:
             raise HTTPException(status_code=400, detail="Kb da base deve ser positivo.")
 
-        acid_volume_l = params.acid_volume / 1000
-        base_volume_l = params.base_volume / 1000
+        ml_to_l = conversion_factor("mL", "L")
+        acid_volume_l = params.acid_volume * ml_to_l
+        base_volume_l = params.base_volume * ml_to_l
 
         final_ph: Optional[float] = -1.0 # Default to error/undefined
         final_poh: Optional[float] = None
@@ -74,18 +57,12 @@ class AcidBaseModule(SimulationModule):
         ka_val_used = None
         kb_val_used = None
 
-        # Stoichiometry factors (only apply if NOT weak acid/base)
-        mols_h_plus_factor = 1.0
-        if not params.acid_ka: # Not a weak acid
-            normalized_acid_name = params.acid_name.lower().strip() if params.acid_name else ""
-            if "h2so4" in normalized_acid_name or "h₂so₄" in normalized_acid_name:
-                mols_h_plus_factor = 2.0
-
-        mols_oh_minus_factor = 1.0
-        if not params.base_kb: # Not a weak base
-            normalized_base_name = params.base_name.lower().strip() if params.base_name else ""
-            if "ca(oh)2" in normalized_base_name or "ca(oh)₂" in normalized_base_name:
-                mols_oh_minus_factor = 2.0
+        # Stoichiometry factors (only apply if NOT weak acid/base). The factor counts every
+        # neutralizable H+; steps that don't dissociate completely (HSO4-) enter the charge
+        # balance as weak acids (see strong_electrolytes).
+        mols_h_plus_factor = 1.0 if params.acid_ka else strong_acid_factor(params.acid_name)
+        acid_weak_steps = () if params.acid_ka else strong_acid_weak_steps(params.acid_name)
+        mols_oh_minus_factor = 1.0 if params.base_kb else strong_base_factor(params.base_name)
 
         # Calculate initial mols based on potential stoichiometry for strong species
         mols_h_initial = params.acid_concentration * acid_volume_l * mols_h_plus_factor
@@ -99,6 +76,9 @@ class AcidBaseModule(SimulationModule):
         is_acid_present_active = acid_volume_l > 0 and params.acid_concentration > 0
         is_base_present_active = base_volume_l > 0 and params.base_concentration > 0
 
+        # Each scenario only describes the solution; the pH always comes from the charge balance below.
+        composition: Optional[AcidBaseComposition] = None
+
         if not is_acid_present_active and not is_base_present_active:
             final_ph = 7.0
             status_val = "Neutra (água pura)"
@@ -112,23 +92,11 @@ class AcidBaseModule(SimulationModule):
             if params.acid_ka:
                 is_weak_acid_calc = True
                 ka_val_used = params.acid_ka
-                # For weak acid HA: Ka = [H+][A-]/[HA] = x^2 / (C_acid - x) => x^2 + Ka*x - Ka*C_acid = 0
-                x = solve_quadratic(1, ka_val_used, -ka_val_used * C_acid)
-                if x is not None and x > 1e-15:
-                    final_ph = -math.log10(x)
-                else:
-                    message_val = "Não foi possível calcular [H+] para ácido fraco (raiz inválida ou não positiva)."
-                    final_ph = -1.0
-                status_val = "Ácida"
-            else: # Strong acid
-                # For strong acid, [H+] is C_acid * factor (e.g., H2SO4)
-                conc_h_strong = C_acid * mols_h_plus_factor
-                if conc_h_strong > 1e-15:
-                    final_ph = -math.log10(conc_h_strong)
-                else:
-                    final_ph = 7.0 # Effectively water if concentration is zero/negligible
-                    message_val = "Concentração de ácido forte muito baixa, pH tratado como neutro."
-                status_val = "Ácida"
+                composition = AcidBaseComposition(weak_acids=((C_acid, ka_val_used),))
+            else: # Strong acid; H2SO4 releases its second H+ through Ka2
+                strong_acid, weak_acids = strong_acid_terms(C_acid, mols_h_plus_factor, acid_weak_steps)
+                composition = AcidBaseComposition(strong_acid=strong_acid, weak_acids=weak_acids)
+            status_val = "Ácida"
 
         # Scenario 2: Only Base present (and active)
         elif is_base_present_active and not is_acid_present_active:
@@ -136,207 +104,95 @@ class AcidBaseModule(SimulationModule):
             if params.base_kb:
                 is_weak_base_calc = True
                 kb_val_used = params.base_kb
-                # For weak base B: Kb = [BH+][OH-]/[B] = x^2 / (C_base - x) => x^2 + Kb*x - Kb*C_base = 0
-                x = solve_quadratic(1, kb_val_used, -kb_val_used * C_base)
-                if x is not None and x > 1e-15:
-                    final_poh = -math.log10(x)
-                    final_ph = 14.0 - final_poh
-                else:
-                    message_val = "Não foi possível calcular [OH-] para base fraca (raiz inválida ou não positiva)."
-                    final_ph = -1.0
-                status_val = "Básica"
+                composition = AcidBaseComposition(weak_bases=((C_base, kb_val_used),))
             else: # Strong base
-                conc_oh_strong = C_base * mols_oh_minus_factor
-                if conc_oh_strong > 1e-15:
-                    final_poh = -math.log10(conc_oh_strong)
-                    final_ph = 14.0 - final_poh
-                else:
-                    final_ph = 7.0 # Effectively water
-                    message_val = "Concentração de base forte muito baixa, pH tratado como neutro."
-                status_val = "Básica"
+                composition = AcidBaseComposition(strong_base=C_base * mols_oh_minus_factor)
+            status_val = "Básica"
 
         # Scenario 3: Mixture of Acid and Base (both active)
-        elif is_acid_present_active and is_base_present_active:
-            if total_volume_l <= 1e-9: # Avoid division by zero if sum of volumes is tiny
-                 final_ph = -1.0; message_val="Erro: Volume total da mistura é zero ou desprezível."; status_val="Erro"
+        elif total_volume_l <= 1e-9: # Avoid division by zero if sum of volumes is tiny
+            final_ph = -1.0; message_val="Erro: Volume total da mistura é zero ou desprezível."; status_val="Erro"
+        else:
+            # Analytical concentrations after mixing; weak species keep their Ka/Kb instead of a stoichiometry factor
+            C_acid_mix = mols_h_initial / total_volume_l
+            C_base_mix = mols_oh_initial / total_volume_l
+            if params.acid_ka:
+                strong_acid, weak_acids = 0.0, ((C_acid_mix, params.acid_ka),)
+            else:
+                strong_acid, weak_acids = strong_acid_terms(
+                    C_acid_mix / mols_h_plus_factor, mols_h_plus_factor, acid_weak_steps)
+            composition = AcidBaseComposition(
+                strong_acid=strong_acid,
+                strong_base=0.0 if params.base_kb else C_base_mix,
+                weak_acids=weak_acids,
+                weak_bases=((C_base_mix, params.base_kb),) if params.base_kb else (),
+            )
+            is_equivalence = abs(mols_h_initial - mols_oh_initial) < 1e-9 # Absolute comparison for mols
+
             # Case 3.1: Strong Acid + Strong Base (no Ka, no Kb)
-            elif not params.acid_ka and not params.base_kb:
-                # Mols already adjusted by factors if applicable
-                if abs(mols_h_initial - mols_oh_initial) < 1e-9: # Neutralization (using absolute comparison for mols)
-                    final_ph = 7.0
+            if not params.acid_ka and not params.base_kb:
+                if is_equivalence:
                     status_val = "Neutra"
                     excess_reactant_val = "Nenhum"
                     message_val = "Neutralização completa entre ácido forte e base forte."
                 elif mols_h_initial > mols_oh_initial:
-                    mols_h_excess = mols_h_initial - mols_oh_initial
-                    conc_h_final = mols_h_excess / total_volume_l
-                    if conc_h_final > 1e-15:
-                        final_ph = -math.log10(conc_h_final)
-                    else: # Excess H+ is negligible
-                        final_ph = 7.0
-                        message_val = "Excesso de H+ desprezível após reação forte-forte."
                     status_val = "Ácida"
                     excess_reactant_val = "H+"
-                else: # mols_oh_initial > mols_h_initial
-                    mols_oh_excess = mols_oh_initial - mols_h_initial
-                    conc_oh_final = mols_oh_excess / total_volume_l
-                    if conc_oh_final > 1e-15:
-                        final_poh = -math.log10(conc_oh_final)
-                        final_ph = 14.0 - final_poh
-                    else: # Excess OH- is negligible
-                        final_ph = 7.0
-                        message_val = "Excesso de OH- desprezível após reação forte-forte."
+                else:
                     status_val = "Básica"
                     excess_reactant_val = "OH-"
-            # Cases involving weak acids/bases in mixtures
-            elif params.acid_ka or params.base_kb: # This is the block to modify extensively
-                # Case 3.2: Weak Acid (Ka) + Strong Base (no Kb)
-                if params.acid_ka and not params.base_kb:
-                    is_weak_acid_calc = True
-                    ka_val_used = params.acid_ka
-                    Ka = ka_val_used
-
-                    # mols_h_initial here represents initial mols of HA (weak acid)
-                    # mols_oh_initial here represents mols of OH- (strong base) added
-
-                    # Check for equivalence point with a small tolerance
-                    # Tolerance should be relative to the scale of mols, e.g., a fraction of total_volume_l
-                    # or a very small absolute number if volumes are consistent.
-                    # Using a small absolute tolerance for mols comparison here.
-                    if abs(mols_h_initial - mols_oh_initial) < 1e-9:
-                        status_val = "Básica (Hidrólise de A⁻ no P.E.)"
-                        # At P.E., all HA converted to A-. Concentration of A- is initial HA mols / total volume
-                        C_anion = mols_h_initial / total_volume_l if total_volume_l > 1e-9 else 0
-                        if C_anion > 1e-9:
-                            Kb_anion = KW / Ka
-                            x = solve_quadratic(1, Kb_anion, -Kb_anion * C_anion) # x = [OH-] from hydrolysis
-                            if x is not None and x > 1e-15:
-                                final_poh = -math.log10(x)
-                                final_ph = 14.0 - final_poh
-                            else:
-                                message_val = "Erro no cálculo de hidrólise do ânion A⁻ (raiz inválida)."
-                                final_ph = -1.0
-                        else: # Concentration of anion is negligible
-                            final_ph = 7.0
-                            message_val = "Ponto de equivalência com concentração de ânion desprezível, pH neutro."
-                        excess_reactant_val = "Nenhum (P.E.)"
-
-                    elif mols_oh_initial < mols_h_initial: # Before P.E. - Buffer region HA/A-
-                        status_val = "Ácida (Tampão HA/A⁻)"
-                        mols_HA_remaining = mols_h_initial - mols_oh_initial
-                        mols_A_minus_formed = mols_oh_initial
-                        C_HA = mols_HA_remaining / total_volume_l if total_volume_l > 1e-9 else 0
-                        C_A_minus = mols_A_minus_formed / total_volume_l if total_volume_l > 1e-9 else 0
-
-                        if C_A_minus > 1e-9 and C_HA > 1e-9: # Henderson-Hasselbalch applicable
-                            final_ph = -math.log10(Ka) + math.log10(C_A_minus / C_HA)
-                        elif C_HA > 1e-9 : # Mostly HA, very little A- (e.g., start of titration)
-                            # Use quadratic for HA dissociation as if it's a pure weak acid solution at this new C_HA
-                            x = solve_quadratic(1, Ka, -Ka * C_HA) # x = [H+]
-                            final_ph = -math.log10(x) if (x is not None and x > 1e-15) else -1.0
-                            if final_ph == -1.0: message_val = "Erro no cálculo do tampão (principalmente HA)."
-                        else: # Should imply C_HA is very low, meaning near P.E. or error
-                             message_val = "Erro no cálculo do tampão HA/A⁻ (concentração de HA muito baixa, não P.E.)."
-                             final_ph = -1.0
-                        excess_reactant_val = "HA/A⁻"
-
-                    else: # mols_oh_initial > mols_h_initial (After P.E. - Excess of Strong Base)
-                        status_val = "Básica (Excesso de OH⁻)"
-                        mols_OH_excess_strong = mols_oh_initial - mols_h_initial
-                        conc_OH_final = mols_OH_excess_strong / total_volume_l if total_volume_l > 1e-9 else 0
-                        if conc_OH_final > 1e-15:
-                            final_poh = -math.log10(conc_OH_final)
-                            final_ph = 14.0 - final_poh
-                        else: # Excess OH- is negligible, should have been caught by P.E.
-                            final_ph = 7.0 # Or -1.0 if error state preferred
-                            message_val = "Excesso de base forte desprezível, pH tratado como neutro (ou erro no P.E.)."
-                        excess_reactant_val = "OH⁻ (excesso)"
-
-                # Case 3.3: Strong Acid (no Ka) + Weak Base (Kb)
-                elif not params.acid_ka and params.base_kb:
-                    is_weak_base_calc = True
-                    kb_val_used = params.base_kb
-                    Kb = kb_val_used
-
-                    # mols_oh_initial here represents initial mols of B (weak base)
-                    # mols_h_initial here represents mols of H+ (strong acid) added
-
-                    if abs(mols_oh_initial - mols_h_initial) < 1e-9: # Equivalence Point
-                        status_val = "Ácida (Hidrólise de BH⁺ no P.E.)"
-                        C_cation = mols_oh_initial / total_volume_l if total_volume_l > 1e-9 else 0 # mols BH+ formed = mols B initial
-                        if C_cation > 1e-9:
-                            Ka_cation = KW / Kb
-                            x = solve_quadratic(1, Ka_cation, -Ka_cation * C_cation) # x = [H+] from hydrolysis
-                            if x is not None and x > 1e-15:
-                                final_ph = -math.log10(x)
-                            else:
-                                message_val = "Erro no cálculo de hidrólise do cátion BH⁺ (raiz inválida)."
-                                final_ph = -1.0
-                        else: # Concentration of cation is negligible
-                            final_ph = 7.0
-                            message_val = "Ponto de equivalência com concentração de cátion desprezível, pH neutro."
-                        excess_reactant_val = "Nenhum (P.E.)"
-
-                    elif mols_h_initial < mols_oh_initial: # Before P.E. - Buffer region B/BH+
-                        status_val = "Básica (Tampão B/BH⁺)"
-                        mols_B_remaining = mols_oh_initial - mols_h_initial
-                        mols_BH_plus_formed = mols_h_initial
-                        C_B = mols_B_remaining / total_volume_l if total_volume_l > 1e-9 else 0
-                        C_BH_plus = mols_BH_plus_formed / total_volume_l if total_volume_l > 1e-9 else 0
-
-                        if C_BH_plus > 1e-9 and C_B > 1e-9: # Henderson-Hasselbalch for base buffer
-                            # pOH = pKb + log([BH+]/[B])
-                            final_poh = -math.log10(Kb) + math.log10(C_BH_plus / C_B)
-                            final_ph = 14.0 - final_poh
-                        elif C_B > 1e-9: # Mostly B, very little BH+ (e.g., start of titration)
-                            # Use quadratic for B dissociation
-                            x = solve_quadratic(1, Kb, -Kb * C_B) # x = [OH-]
-                            if x is not None and x > 1e-15:
-                                final_poh = -math.log10(x)
-                                final_ph = 14.0 - final_poh
-                            else:
-                                final_ph = -1.0
-                                message_val = "Erro no cálculo do tampão (principalmente B)."
-                        else:
-                            message_val = "Erro no cálculo do tampão B/BH⁺ (concentração de B muito baixa, não P.E.)."
-                            final_ph = -1.0
-                        excess_reactant_val = "B/BH⁺"
-
-                    else: # mols_h_initial > mols_oh_initial (After P.E. - Excess of Strong Acid)
-                        status_val = "Ácida (Excesso de H⁺)"
-                        mols_H_excess_strong = mols_h_initial - mols_oh_initial
-                        conc_H_final = mols_H_excess_strong / total_volume_l if total_volume_l > 1e-9 else 0
-                        if conc_H_final > 1e-15:
-                            final_ph = -math.log10(conc_H_final)
-                        else:
-                            final_ph = 7.0 # Or -1.0
-                            message_val = "Excesso de ácido forte desprezível, pH tratado como neutro (ou erro no P.E.)."
-                        excess_reactant_val = "H⁺ (excesso)"
-
-                # Case 3.4: Weak Acid (Ka) + Weak Base (Kb)
-                elif params.acid_ka and params.base_kb:
-                    is_weak_acid_calc = True
-                    is_weak_base_calc = True
-                    ka_val_used = params.acid_ka
-                    kb_val_used = params.base_kb
-                    message_val = "Cálculo para ácido fraco vs. base fraca não é suportado nesta versão."
-                    final_ph = -1.0
-                    status_val = "Indeterminado (WA vs WB)"
-
-                else: # Should not happen if logic is structured correctly (e.g. one is weak, other must be strong or also weak)
-                    message_val = "Combinação de ácido/base fraco não reconhecida para mistura (lógica interna). Contate o suporte."
-                    final_ph = -1.0
-                    status_val = "Erro Interno"
-
-            else: # Fallback for any unhandled strong/weak mix - this should ideally not be reached if above logic is complete
-                message_val = "Combinação de ácido/base não reconhecida para mistura (fallback geral). Contate o suporte."
-                final_ph = -1.0
-                status_val = "Erro Interno"
-        else: # Should be covered by Scenario 0, but as a fallback
-            if not (final_ph == 7.0 and status_val == "Neutra (água pura)"):
-                final_ph = 7.0
-                status_val = "Neutra (água)"
-                message_val = message_val or "Configuração de entrada não resultou em reação calculável ou foi tratada como água."
+
+            # Case 3.2: Weak Acid (Ka) + Strong Base (no Kb)
+            elif params.acid_ka and not params.base_kb:
+                is_weak_acid_calc = True
+                ka_val_used = params.acid_ka
+                if is_equivalence: # All HA converted to A-, which hydrolyses
+                    status_val = "Básica (Hidrólise de A⁻ no P.E.)"
+                    excess_reactant_val = "Nenhum (P.E.)"
+                elif mols_oh_initial < mols_h_initial: # Before P.E. - Buffer region HA/A-
+                    status_val = "Ácida (Tampão HA/A⁻)"
+                    excess_reactant_val = "HA/A⁻"
+                else: # After P.E. - Excess of Strong Base
+                    status_val = "Básica (Excesso de OH⁻)"
+                    excess_reactant_val = "OH⁻ (excesso)"
+
+            # Case 3.3: Strong Acid (no Ka) + Weak Base (Kb)
+            elif not params.acid_ka and params.base_kb:
+                is_weak_base_calc = True
+                kb_val_used = params.base_kb
+                if is_equivalence: # All B converted to BH+, which hydrolyses
+                    status_val = "Ácida (Hidrólise de BH⁺ no P.E.)"
+                    excess_reactant_val = "Nenhum (P.E.)"
+                elif mols_h_initial < mols_oh_initial: # Before P.E. - Buffer region B/BH+
+                    status_val = "Básica (Tampão B/BH⁺)"
+                    excess_reactant_val = "B/BH⁺"
+                else: # After P.E. - Excess of Strong Acid
+                    status_val = "Ácida (Excesso de H⁺)"
+                    excess_reactant_val = "H⁺ (excesso)"
+
+            # Case 3.4: Weak Acid (Ka) + Weak Base (Kb)
+            else:
+                is_weak_acid_calc = True
+                is_weak_base_calc = True
+                ka_val_used = params.acid_ka
+                kb_val_used = params.base_kb
+                if is_equivalence:
+                    excess_reactant_val = "Nenhum (P.E.)"
+                elif mols_h_initial > mols_oh_initial:
+                    excess_reactant_val = "HA/A⁻"
+                else:
+                    excess_reactant_val = "B/BH⁺"
+                message_val = "pH do par ácido fraco/base fraca calculado pelo balanço de cargas."
+
+        if composition is not None:
+            final_ph = solve_ph(composition)
+            final_poh = PKW - final_ph
+            if is_weak_acid_calc and is_weak_base_calc:
+                # The weak/weak mixture can fall on either side of neutrality, so the status follows the pH.
+                rounded_ph = round(final_ph, 2)
+                if rounded_ph < 7.0: status_val = "Ácida (WA vs WB)"
+                elif rounded_ph == 7.0: status_val = "Neutra (WA vs WB)"
+                else: status_val = "Básica (WA vs WB)"
 
         # pH and pOH constraints and rounding
         if final_ph is not None and final_ph != -1.0: # If pH was calculated and not an error
@@ -389,12 +245,13 @@ class AcidBaseModule(SimulationModule):
         # Determine actual total volume for result reporting
         # For pure substances, total_volume_l was not used for pH calculation, but for reporting it's the volume of that substance
         reported_total_volume_ml: float
+        l_to_ml = conversion_factor("L", "mL")
         if is_acid_present_active and not is_base_present_active:
-            reported_total_volume_ml = acid_volume_l * 1000
+            reported_total_volume_ml = acid_volume_l * l_to_ml
         elif is_base_present_active and not is_acid_present_active:
-            reported_total_volume_ml = base_volume_l * 1000
+            reported_total_volume_ml = base_volume_l * l_to_ml
         elif is_acid_present_active and is_base_present_active: # Mixture
-            reported_total_volume_ml = total_volume_l * 1000
+            reported_total_volume_ml = total_volume_l * l_to_ml
         else: # Pure water / no active reactants
             reported_total_volume_ml = 0 # Or could be sum of volumes if they were non-zero but concentrations were zero
 
@@ -1,16 +1,25 @@
-from typing import Type, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Type
 from fastapi import HTTPException
 
 from backend.simulations.base_simulation import SimulationModule
-from backend.simulations.chemistry.models_acid_base import TitrationParams, TitrationResult, TitrationDataPoint, AcidBaseSimulationParams
-from backend.simulations.chemistry.acid_base_module import AcidBaseModule
+from backend.simulations.chemistry.models_acid_base import TitrationParams, TitrationResult, TitrationDataPoint
+from backend.simulations.chemistry.titration_engine import (
+    TitrationSystem,
+    adaptive_titrant_volumes,
+    build_titration_system,
+    compute_titration_ph,
+    detect_equivalence_volume,
+    stoichiometric_equivalence_volume,
+)
+
+# Limite de pontos por curva. O cálculo é feito em lote pelo titration_engine,
+# então o limite é bem maior que os 2000 pontos do cálculo ponto a ponto.
+MAX_TITRATION_POINTS = 10_000
+# Pontos calculados por vez ao transmitir a curva (stream_simulation).
+STREAM_CHUNK_POINTS = 256
 
 class AcidBaseTitrationModule(SimulationModule):
 
-    def __init__(self):
-        super().__init__()
-        self.acid_base_calculator = AcidBaseModule()
-
     def get_name(self) -> str:
         return "acid-base-titration"
 
@@ -30,15 +39,81 @@ class AcidBaseTitrationModule(SimulationModule):
         return TitrationResult
 
     def run_simulation(self, params: TitrationParams) -> TitrationResult:
+        system = build_titration_system(params)
+        titrant_volumes = self._titrant_volumes(params, system)
+        ph_values = compute_titration_ph(system, titrant_volumes)
+        titration_curve_data: List[TitrationDataPoint] = list(self._iter_curve_points(titrant_volumes, ph_values))
+
+        return TitrationResult(
+            titration_curve=titration_curve_data,
+            parameters_used=params.model_dump(),
+            message=self._curve_message(len(titration_curve_data)),
+            equivalence_points_ml=self._equivalence_points(params, system),
+            inflection_points_ml=self._inflection_points(system, titrant_volumes, ph_values),
+        )
+
+    def stream_simulation(self, params: TitrationParams) -> Iterator[Dict[str, Any]]:
+        """
+        O resumo sai antes de qualquer pH: os volumes (e portanto o número de
+        pontos) e o ponto de equivalência estequiométrico não dependem da curva.
+        Os pontos são calculados e enviados em blocos de STREAM_CHUNK_POINTS; o
+        ponto de inflexão, que precisa da curva inteira, vai em um evento
+        'summary_update' no fim. Da curva só ficam guardados os valores de pH.
+        """
+        system = build_titration_system(params)
+        titrant_volumes = self._titrant_volumes(params, system)
+        summary = {
+            "parameters_used": params.model_dump(mode="json"),
+            "message": self._curve_message(len(titrant_volumes)),
+            "equivalence_points_ml": self._equivalence_points(params, system),
+        }
+        yield {"event": "summary", "series": ["titration_curve"], "data": summary}
+
+        ph_values: List[float] = []
+        for start in range(0, len(titrant_volumes), STREAM_CHUNK_POINTS):
+            volumes_chunk = titrant_volumes[start:start + STREAM_CHUNK_POINTS]
+            ph_chunk = compute_titration_ph(system, volumes_chunk)
+            ph_values.extend(ph_chunk)
+            for point in self._iter_curve_points(volumes_chunk, ph_chunk):
+                yield {"event": "point", "series": "titration_curve", "data": point.model_dump()}
+        yield {"event": "summary_update", "data": {"inflection_points_ml": self._inflection_points(system, titrant_volumes, ph_values)}}
+
+    def _equivalence_points(self, params: TitrationParams, system: TitrationSystem) -> Optional[List[float]]:
+        """Ponto de equivalência estequiométrico, só informado se estiver dentro do intervalo simulado."""
+        equivalence_ml = stoichiometric_equivalence_volume(system)
+        in_range = (
+            equivalence_ml is not None
+            and params.initial_titrant_volume_ml - 1e-9 <= equivalence_ml <= params.final_titrant_volume_ml + 1e-9
+        )
+        return [round(equivalence_ml, 3)] if in_range else None
+
+    def _inflection_points(self, system: TitrationSystem, titrant_volumes: List[float],
+                           ph_values: List[float]) -> Optional[List[float]]:
+        """Ponto de inflexão (dpH/dV máximo) estimado a partir da curva."""
+        inflection_ml = detect_equivalence_volume(system, titrant_volumes, ph_values)
+        return [round(inflection_ml, 3)] if inflection_ml is not None else None
+
+    def _curve_message(self, points_count: int) -> str:
+        return f"Curva de titulação gerada com {points_count} pontos." if points_count else "Nenhum ponto gerado para a curva."
+
+    def _titrant_volumes(self, params: TitrationParams, system: TitrationSystem) -> List[float]:
         if not isinstance(params, TitrationParams):
             raise TypeError("Parâmetros fornecidos não são do tipo TitrationParams.")
 
         if params.final_titrant_volume_ml < params.initial_titrant_volume_ml:
             raise HTTPException(status_code=400, detail="O volume final do titulante deve ser maior ou igual ao volume inicial.")
+
+        if params.sampling == "adaptive":
+            # O orçamento de pontos já é limitado pelo modelo; o incremento fixo não é usado.
+            return adaptive_titrant_volumes(
+                system, params.initial_titrant_volume_ml, params.final_titrant_volume_ml,
+                params.max_ph_step, params.max_points,
+            )
+
         if params.volume_increment_ml <= 0:
             raise HTTPException(status_code=400, detail="O incremento de volume deve ser positivo.")
 
-        max_points = 2000
+        max_points = MAX_TITRATION_POINTS
         num_expected_points = 0
         if params.volume_increment_ml > 1e-9: # Evitar divisão por zero
             num_expected_points = abs(params.final_titrant_volume_ml - params.initial_titrant_volume_ml) / params.volume_increment_ml
@@ -53,7 +128,7 @@ class AcidBaseTitrationModule(SimulationModule):
         if num_expected_points > max_points:
             raise HTTPException(status_code=400, detail=f"Número de pontos ({int(num_expected_points)}) excede o limite de {max_points}. Aumente o incremento ou reduza o intervalo.")
 
-        titration_curve_data: List[TitrationDataPoint] = []
+        titrant_volumes: List[float] = []
         current_titrant_vol_ml = params.initial_titrant_volume_ml
 
         iteration_count = 0
@@ -67,55 +142,7 @@ class AcidBaseTitrationModule(SimulationModule):
             if actual_volume_to_simulate > params.final_titrant_volume_ml:
                 actual_volume_to_simulate = params.final_titrant_volume_ml
 
-            point_params_dict = {}
-
-            if params.titrant_is_acid:
-                point_params_dict = {
-                    "acid_name": params.titrant_name,
-                    "acid_concentration": params.titrant_concentration,
-                    "acid_volume": actual_volume_to_simulate,
-                    "acid_ka": None, # Titulante forte
-
-                    "base_name": params.base_name,
-                    "base_concentration": params.base_concentration,
-                    "base_volume": params.base_volume,
-                    "base_kb": params.base_kb,
-                    "indicator_name": None
-                }
-            else:
-                point_params_dict = {
-                    "acid_name": params.acid_name,
-                    "acid_concentration": params.acid_concentration,
-                    "acid_volume": params.acid_volume,
-                    "acid_ka": params.acid_ka,
-
-                    "base_name": params.titrant_name,
-                    "base_concentration": params.titrant_concentration,
-                    "base_volume": actual_volume_to_simulate,
-                    "base_kb": None, # Titulante forte
-                    "indicator_name": None
-                }
-
-            try:
-                current_point_simulation_params = AcidBaseSimulationParams.model_validate(point_params_dict)
-            except Exception as e:
-                 raise HTTPException(status_code=400, detail=f"Erro ao criar parâmetros para o ponto de titulação (vol={actual_volume_to_simulate:.2f}mL): {e}")
-
-            current_ph = -1.0 # Default para caso de erro no cálculo do pH
-            try:
-                ph_result = self.acid_base_calculator.run_simulation(current_point_simulation_params)
-                current_ph = ph_result.final_ph
-                # Se ph_result.message existir e current_ph for -1.0, essa info pode ser útil, mas não é adicionada por ponto
-            except HTTPException as e:
-                raise HTTPException(status_code=400,
-                                    detail=f"Erro ao calcular pH no volume {actual_volume_to_simulate:.2f}mL do titulante: {e.detail}")
-            except Exception as e:
-                raise HTTPException(status_code=500,
-                                    detail=f"Erro inesperado ao calcular pH no volume {actual_volume_to_simulate:.2f}mL do titulante: {str(e)}")
-
-            titration_curve_data.append(
-                TitrationDataPoint(titrant_volume_added_ml=round(actual_volume_to_simulate, 3), ph=current_ph)
-            )
+            titrant_volumes.append(actual_volume_to_simulate)
 
             if actual_volume_to_simulate >= params.final_titrant_volume_ml:
                 break
@@ -126,9 +153,8 @@ class AcidBaseTitrationModule(SimulationModule):
                  # Log ou mensagem de que o loop foi interrompido pela salvaguarda
                  break
 
-        return TitrationResult(
-            titration_curve=titration_curve_data,
-            parameters_used=params.model_dump(),
-            message=f"Curva de titulação gerada com {len(titration_curve_data)} pontos." if titration_curve_data else "Nenhum ponto gerado para a curva.",
-            equivalence_points_ml=None
-        )
+        return titrant_volumes
+
+    def _iter_curve_points(self, titrant_volumes: List[float], ph_values: List[float]) -> Iterator[TitrationDataPoint]:
+        for volume_ml, ph in zip(titrant_volumes, ph_values):
+            yield TitrationDataPoint(titrant_volume_added_ml=round(volume_ml, 3), ph=ph)
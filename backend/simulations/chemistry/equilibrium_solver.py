@@ -0,0 +1,196 @@
+"""
+pH de misturas de ácidos e bases pelo balanço de cargas.
+
+Para uma solução com ácidos fortes (concentração Sa de ânions espectadores),
+bases fortes (Sb de cátions espectadores), ácidos fracos HA (C, Ka) e bases
+fracas B (C, Kb), a neutralidade elétrica exige
+
+    [H⁺] + Sb + Σ [BH⁺] = [OH⁻] + Sa + Σ [A⁻]
+
+com [A⁻] = C·Ka / ([H⁺] + Ka), [BH⁺] = C·[H⁺] / ([H⁺] + Kw/Kb) e
+[OH⁻] = Kw / [H⁺]. Sem aproximações por região (Henderson–Hasselbalch,
+hidrólise no ponto de equivalência etc.), a mesma equação vale para qualquer
+combinação, inclusive ácido fraco com base fraca.
+
+Espécies polipróticas recebem a lista de constantes por etapa (Ka1, Ka2, ...):
+a carga de um ácido HnA é C·n̄, com n̄ o número médio de prótons cedidos,
+calculado pelas frações α de cada forma (alpha_fractions). Uma base fraca é
+tratada pelo seu ácido conjugado totalmente protonado (Ka' = Kw/Kb, em ordem
+inversa), com carga C·(n − n̄).
+
+A incógnita é u = ln[H⁺]. O lado esquerdo P cresce e o direito N decresce com
+[H⁺], então g(u) = ln P − ln N é estritamente crescente e tem uma única raiz;
+em escala logarítmica g é quase linear longe dela, e o método de Newton
+converge em poucas iterações. Cada iteração estreita um intervalo que sempre
+contém a raiz; passos de Newton que saem dele são trocados por bissecção.
+Com uma única espécie fraca monoprótica (o caso das titulações), a estimativa
+inicial vem das fórmulas fechadas por região e em geral basta uma iteração.
+"""
+import math
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+KW = 1e-14
+PKW = 14.0
+
+# Critério de parada em ln[H⁺] (equivale a ~4e-13 unidades de pH) e limite de iterações.
+LOG_H_TOLERANCE = 1e-12
+NEWTON_FINAL_STEP = math.sqrt(LOG_H_TOLERANCE)
+MAX_ITERATIONS = 100
+
+
+# Constante de uma espécie monoprótica ou lista das constantes por etapa de uma poliprótica.
+DissociationConstants = Union[float, Sequence[float]]
+
+
+class AcidBaseComposition(NamedTuple):
+    """Concentrações analíticas (mol/L) já na solução final, após a mistura."""
+    strong_acid: float = 0.0
+    strong_base: float = 0.0
+    weak_acids: Sequence[Tuple[float, DissociationConstants]] = () # (concentração, Ka ou [Ka1, Ka2, ...])
+    weak_bases: Sequence[Tuple[float, DissociationConstants]] = () # (concentração, Kb ou [Kb1, Kb2, ...])
+
+
+def stepwise_constants(constants: DissociationConstants) -> Tuple[float, ...]:
+    return (float(constants),) if isinstance(constants, (int, float)) else tuple(constants)
+
+
+def conjugate_acid_constants(kb_values: DissociationConstants) -> Tuple[float, ...]:
+    """Ka por etapa do ácido conjugado totalmente protonado de uma base (BHn → ... → B)."""
+    return tuple(KW / kb for kb in reversed(stepwise_constants(kb_values)))
+
+
+def alpha_fractions(h: float, ka_values: Sequence[float]) -> List[float]:
+    """
+    Fração de cada forma de um ácido HnA com [H⁺] = h, da mais protonada (HnA)
+    à totalmente desprotonada (Aⁿ⁻). Cada forma é obtida da anterior
+    multiplicando por Ka_i / h, sem potências de h.
+    """
+    terms = [1.0]
+    for ka in ka_values:
+        terms.append(terms[-1] * ka / h)
+    total = sum(terms)
+    return [term / total for term in terms]
+
+
+def _deprotonation_moments(h: float, ka_values: Sequence[float]) -> Tuple[float, float]:
+    """
+    Número médio de prótons cedidos n̄ e sua variância. Como α_i ∝ h^(n−i), a
+    derivada de n̄ em relação a ln h é −variância.
+    """
+    if len(ka_values) == 1:
+        fraction = ka_values[0] / (h + ka_values[0])
+        return fraction, fraction * (1.0 - fraction)
+    alphas = alpha_fractions(h, ka_values)
+    mean = sum(i * alpha for i, alpha in enumerate(alphas))
+    second_moment = sum(i * i * alpha for i, alpha in enumerate(alphas))
+    return mean, max(second_moment - mean * mean, 0.0)
+
+
+def _positive_root(b: float, c: float) -> float:
+    """Raiz positiva de x² + b·x − c = 0 (c > 0), na forma estável para qualquer sinal de b."""
+    discriminant = math.sqrt(b * b + 4 * c)
+    return 2 * c / (b + discriminant) if b >= 0 else (discriminant - b) / 2
+
+
+def _closed_form_log_h(sa: float, sb: float, acids: Sequence[Tuple[float, Tuple[float, ...]]],
+                       bases: Sequence[Tuple[float, Tuple[float, ...]]]) -> Optional[float]:
+    """
+    Estimativa de ln[H⁺] para uma única espécie fraca monoprótica com ácidos e
+    bases fortes, desprezando a autoionização da água: as fórmulas fechadas
+    por região (ácido fraco, tampão, hidrólise do sal, excesso de titulante)
+    reunidas em duas equações do 2º grau. Uma base B equivale ao ácido
+    conjugado BH⁺ mais a mesma quantidade de base forte. Retorna None para
+    outras composições.
+    """
+    if len(acids) + len(bases) != 1:
+        return None
+    c, ka_values = acids[0] if acids else bases[0]
+    if len(ka_values) != 1:
+        return None
+    ka = ka_values[0]
+    net_base = sb - sa + (c if bases else 0.0)
+    if net_base < c:
+        # HA parcialmente neutralizado: (h + S)(h + Ka) = C·Ka.
+        h = _positive_root(ka + net_base, ka * (c - net_base))
+    else:
+        # Todo o HA virou A⁻: o excesso E de base forte mais a hidrólise x de A⁻ (Kb = Kw/Ka).
+        excess, kb = net_base - c, KW / ka
+        h = KW / (excess + _positive_root(excess + kb, kb * c))
+    return math.log(h) if h > 0 else None
+
+
+def solve_log_h(composition: AcidBaseComposition, initial_log_h: Optional[float] = None) -> float:
+    """
+    ln[H⁺] que satisfaz o balanço de cargas. `initial_log_h` (por exemplo, a
+    solução de um ponto vizinho da curva) só acelera a convergência; fora do
+    intervalo que contém a raiz é ignorado.
+    """
+    sa, sb = composition.strong_acid, composition.strong_base
+    acids = [(c, stepwise_constants(ka)) for c, ka in composition.weak_acids if c > 0]
+    # Bases fracas entram pelas constantes do ácido conjugado.
+    bases = [(c, conjugate_acid_constants(kb)) for c, kb in composition.weak_bases if c > 0]
+    # [H⁺] não passa do total de prótons ácidos (+ a contribuição máxima da água) e [OH⁻] não passa do total de base.
+    total_acid, total_base = sa + 1e-7, sb + 1e-7
+    for c, ka_values in acids:
+        total_acid += c * len(ka_values)
+    for c, ka_values in bases:
+        total_base += c * len(ka_values)
+    low, high = math.log(KW / total_base), math.log(total_acid)
+    if initial_log_h is None:
+        initial_log_h = _closed_form_log_h(sa, sb, acids, bases)
+    if initial_log_h is None:
+        # Sem fórmula fechada, parte do excesso estequiométrico como se todas as espécies fossem fortes.
+        excess = total_acid - total_base
+        initial_log_h = math.log(excess) if excess > 1e-7 else math.log(KW / -excess) if excess < -1e-7 else math.log(1e-7)
+    u = initial_log_h if low < initial_log_h < high else (low + high) / 2
+
+    for _ in range(MAX_ITERATIONS):
+        h = math.exp(u)
+        positive, d_positive = h + sb, h
+        for c, ka_values in bases:
+            mean, variance = _deprotonation_moments(h, ka_values)
+            positive += c * (len(ka_values) - mean)
+            d_positive += c * variance
+        water = KW / h
+        negative, d_negative = water + sa, water
+        for c, ka_values in acids:
+            mean, variance = _deprotonation_moments(h, ka_values)
+            negative += c * mean
+            d_negative += c * variance
+
+        g = math.log(positive / negative)
+        if g == 0.0:
+            return u
+        if g > 0:
+            high = u
+        else:
+            low = u
+        # d(ln P)/du + d(−ln N)/du, ambos positivos.
+        step = g / (d_positive / positive + d_negative / negative)
+        # Newton converge quadraticamente: após um passo menor que √tolerância, o erro
+        # restante é da ordem de passo² e já está dentro da tolerância.
+        if abs(step) < NEWTON_FINAL_STEP:
+            return u - step
+        u = u - step if low < u - step < high else (low + high) / 2
+    return u
+
+
+def solve_ph(composition: AcidBaseComposition, initial_ph: Optional[float] = None) -> float:
+    """pH exato (sem limitar a 0–14) da composição."""
+    initial_log_h = -initial_ph * math.log(10) if initial_ph is not None else None
+    return -solve_log_h(composition, initial_log_h) / math.log(10)
+
+
+def solve_ph_batch(compositions: Iterable[AcidBaseComposition], warm_start: bool = True) -> List[float]:
+    """
+    pH de várias composições. Com `warm_start`, cada solução parte da anterior,
+    o que reduz as iterações quando as composições vêm em sequência e não têm
+    fórmula fechada (misturas de várias espécies); a ordem não altera os
+    resultados, só o custo.
+    """
+    ph_values: List[float] = []
+    log_h: Optional[float] = None
+    for composition in compositions:
+        log_h = solve_log_h(composition, log_h if warm_start else None)
+        ph_values.append(-log_h / math.log(10))
+    return ph_values
@@ -1,5 +1,5 @@
-from typing import Optional, Dict, Any, List # Adicionado List
-from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, List, Literal # Adicionado List
+from pydantic import BaseModel, Field, model_validator
 from backend.simulations.base_simulation import BaseSimulationParams, BaseSimulationResult
 
 class AcidBaseSimulationParams(BaseSimulationParams):
@@ -46,11 +46,22 @@ class TitrationParams(AcidBaseSimulationParams): # Herda do titulado
     # Parâmetros da Titulação
     initial_titrant_volume_ml: float = Field(default=0.0, ge=0, description="Volume inicial de titulante a ser considerado (mL).")
     final_titrant_volume_ml: float = Field(gt=0, description="Volume final de titulante a ser adicionado (mL).")
-    volume_increment_ml: float = Field(gt=0, description="Volume de cada incremento de titulante (mL).")
+    volume_increment_ml: Optional[float] = Field(default=None, gt=0, description="Volume de cada incremento de titulante (mL). Obrigatório na amostragem 'fixed' e ignorado na 'adaptive'.")
+
+    # Amostragem adaptativa: pontos concentrados onde o pH varia mais (salto da equivalência).
+    sampling: Literal["fixed", "adaptive"] = Field(default="fixed", description="'fixed' usa incrementos constantes; 'adaptive' limita a variação de pH entre pontos consecutivos.")
+    max_ph_step: float = Field(default=0.1, gt=0, description="Variação máxima de pH desejada entre pontos consecutivos (amostragem adaptativa).")
+    max_points: int = Field(default=200, ge=2, le=10_000, description="Orçamento de pontos da curva na amostragem adaptativa.")
 
     # Sobrescrever indicator_name para não ser obrigatório ou ter um default diferente se não for usado
     indicator_name: Optional[str] = Field(default=None, description="Indicador de pH (opcional para curva de titulação).")
 
+    @model_validator(mode='after')
+    def check_sampling(self) -> 'TitrationParams':
+        if self.sampling == "fixed" and self.volume_increment_ml is None:
+            raise ValueError("A amostragem 'fixed' exige 'volume_increment_ml'.")
+        return self
+
 
 class TitrationDataPoint(BaseModel):
     titrant_volume_added_ml: float = Field(description="Volume total de titulante adicionado acumulado naquele ponto (mL).")
@@ -62,9 +73,117 @@ class TitrationResult(BaseSimulationResult):
     titration_curve: List[TitrationDataPoint] = Field(description="Lista de pontos de dados (volume adicionado, pH) para plotar a curva.")
     # Para o futuro, mas bom de prever no modelo:
     equivalence_points_ml: Optional[List[float]] = Field(default=None, description="Lista opcional de volumes de titulante (mL) onde os pontos de equivalência foram detectados.")
+    inflection_points_ml: Optional[List[float]] = Field(default=None, description="Volumes de titulante (mL) de maior inclinação da curva (dpH/dV máximo), estimados numericamente.")
 
     # Garantir que o parameters_used seja explicitamente TitrationParams no schema gerado, se possível,
     # ou que a documentação gerada seja clara. Pydantic deve lidar com isso na serialização.
     # Se precisarmos ser explícitos para OpenAPI:
     # parameters_used: TitrationParams # Substituiria o Dict[str, Any] da classe base.
     # Por enquanto, vamos confiar na herança e na passagem correta do dict.
+
+
+# Modelos para Especiação de Ácidos/Bases Polipróticos
+
+MAX_DISSOCIATION_STEPS = 6
+MAX_DIAGRAM_POINTS = 5_001
+
+
+class SpeciationParams(BaseSimulationParams):
+    name: Optional[str] = Field(default=None, description="Nome da espécie (ex: H₃PO₄, CO₃²⁻), apenas para exibição.")
+    pka_values: Optional[List[float]] = Field(
+        default=None, min_length=1, max_length=MAX_DISSOCIATION_STEPS,
+        description="pKa de cada etapa de um ácido, na ordem de dissociação (pKa1, pKa2, ...).",
+    )
+    pkb_values: Optional[List[float]] = Field(
+        default=None, min_length=1, max_length=MAX_DISSOCIATION_STEPS,
+        description="pKb de cada etapa de uma base, na ordem de protonação (pKb1, pKb2, ...).",
+    )
+    concentration: Optional[float] = Field(default=None, gt=0, description="Concentração analítica (mol/L). Se informada, calcula o pH da solução pura e a concentração de cada forma.")
+    include_diagram: bool = Field(default=True, description="Se deve devolver o diagrama de distribuição (α de cada forma em função do pH).")
+    ph_min: float = Field(default=0.0, ge=-2, le=16, description="Início da grade de pH do diagrama.")
+    ph_max: float = Field(default=14.0, ge=-2, le=16, description="Fim da grade de pH do diagrama.")
+    ph_points: int = Field(default=281, ge=2, le=MAX_DIAGRAM_POINTS, description="Pontos da grade de pH do diagrama.")
+
+    @model_validator(mode='after')
+    def check_constants(self) -> 'SpeciationParams':
+        if (self.pka_values is None) == (self.pkb_values is None):
+            raise ValueError("Informe exatamente um entre 'pka_values' (ácido) e 'pkb_values' (base).")
+        for pk in self.pka_values or self.pkb_values:
+            if not -5 <= pk <= 20:
+                raise ValueError("Os valores de pK devem estar entre -5 e 20.")
+        if self.ph_min >= self.ph_max:
+            raise ValueError("'ph_min' deve ser menor que 'ph_max'.")
+        return self
+
+    @property
+    def is_base(self) -> bool:
+        return self.pkb_values is not None
+
+
+class SpeciationResult(BaseSimulationResult):
+    species: List[str] = Field(description="Formas da espécie, da mais protonada à menos protonada.")
+    pka_values: List[float] = Field(description="pKa por etapa a partir da forma mais protonada (para bases, do ácido conjugado).")
+    ph: Optional[float] = Field(default=None, description="pH da solução pura, se 'concentration' foi informada.")
+    poh: Optional[float] = Field(default=None, description="pOH da solução pura, se 'concentration' foi informada.")
+    alpha: Optional[List[float]] = Field(default=None, description="Fração de cada forma no pH da solução.")
+    species_concentrations: Optional[List[float]] = Field(default=None, description="Concentração de equilíbrio de cada forma (mol/L).")
+    dominant_species: Optional[str] = Field(default=None, description="Forma predominante no pH da solução.")
+    diagram_ph: Optional[List[float]] = Field(default=None, description="Grade de pH do diagrama de distribuição.")
+    diagram_alpha: Optional[List[List[float]]] = Field(default=None, description="Para cada forma (na ordem de 'species'), α em cada pH de 'diagram_ph'.")
+
+
+# Modelos para Mistura de Várias Soluções
+
+MAX_MIXER_SOLUTIONS = 20
+
+
+class MixerSolution(BaseModel):
+    name: Optional[str] = Field(default=None, description="Nome da solução (ex: HCl, CH₃COOH, NH₃), apenas para exibição.")
+    kind: Literal["acid", "base"] = Field(description="Se o soluto é um ácido ou uma base.")
+    concentration: float = Field(gt=0, description="Concentração molar do soluto (mol/L).")
+    volume_ml: float = Field(gt=0, description="Volume adicionado à mistura (mL).")
+    ka_values: Optional[List[float]] = Field(
+        default=None, min_length=1, max_length=MAX_DISSOCIATION_STEPS,
+        description="Ka de cada etapa de um ácido fraco (Ka1, Ka2, ...). Omitido: ácido forte.",
+    )
+    kb_values: Optional[List[float]] = Field(
+        default=None, min_length=1, max_length=MAX_DISSOCIATION_STEPS,
+        description="Kb de cada etapa de uma base fraca (Kb1, Kb2, ...). Omitido: base forte.",
+    )
+    equivalents: int = Field(default=1, ge=1, le=3, description="H⁺ ou OH⁻ liberados por fórmula de um ácido/base forte (ex: 2 para H₂SO₄ e Ca(OH)₂).")
+
+    @model_validator(mode='after')
+    def check_constants(self) -> 'MixerSolution':
+        if self.kind == "acid" and self.kb_values is not None:
+            raise ValueError("Um ácido aceita apenas 'ka_values'.")
+        if self.kind == "base" and self.ka_values is not None:
+            raise ValueError("Uma base aceita apenas 'kb_values'.")
+        if any(k <= 0 for k in self.ka_values or self.kb_values or []):
+            raise ValueError("As constantes de dissociação devem ser positivas.")
+        return self
+
+    @property
+    def constants(self) -> Optional[List[float]]:
+        return self.ka_values if self.kind == "acid" else self.kb_values
+
+
+class SolutionMixerParams(BaseSimulationParams):
+    solutions: List[MixerSolution] = Field(..., min_length=1, max_length=MAX_MIXER_SOLUTIONS, description="Soluções misturadas, todas no mesmo recipiente.")
+
+
+class MixedSpecies(BaseModel):
+    solution_index: int = Field(description="Índice da solução de origem em 'solutions'.")
+    name: Optional[str] = None
+    analytical_concentration: float = Field(description="Concentração do soluto após a diluição na mistura (mol/L).")
+    forms: List[str] = Field(description="Formas do soluto na mistura, da mais protonada à menos protonada.")
+    form_concentrations: List[float] = Field(description="Concentração de equilíbrio de cada forma (mol/L).")
+
+
+class SolutionMixerResult(BaseSimulationResult):
+    ph: float = Field(description="pH de equilíbrio da mistura (limitado a 0–14).")
+    poh: float = Field(description="pOH de equilíbrio da mistura.")
+    status: str = Field(description="Ácida, Neutra ou Básica.")
+    total_volume_ml: float
+    h_concentration: float = Field(description="[H⁺] de equilíbrio (mol/L).")
+    oh_concentration: float = Field(description="[OH⁻] de equilíbrio (mol/L).")
+    species: List[MixedSpecies]
@@ -0,0 +1,95 @@
+from typing import List, Type
+
+from backend.simulations.base_simulation import SimulationModule
+from backend.simulations.chemistry.equilibrium_solver import (
+    KW, PKW, AcidBaseComposition, alpha_fractions, conjugate_acid_constants, solve_ph,
+)
+from backend.simulations.chemistry.models_acid_base import (
+    MixedSpecies, MixerSolution, SolutionMixerParams, SolutionMixerResult,
+)
+from backend.simulations.chemistry.speciation import species_labels
+from backend.simulations.unit_registry import conversion_factor
+
+
+def mixture_composition(solutions: List[MixerSolution], total_volume_l: float) -> AcidBaseComposition:
+    """Concentrações analíticas de todos os solutos após a diluição no volume total."""
+    ml_to_l = conversion_factor("mL", "L")
+    strong_acid = strong_base = 0.0
+    weak_acids, weak_bases = [], []
+    for solution in solutions:
+        concentration = solution.concentration * solution.volume_ml * ml_to_l / total_volume_l
+        if solution.constants is not None:
+            (weak_acids if solution.kind == "acid" else weak_bases).append((concentration, solution.constants))
+        elif solution.kind == "acid":
+            strong_acid += concentration * solution.equivalents
+        else:
+            strong_base += concentration * solution.equivalents
+    return AcidBaseComposition(strong_acid, strong_base, weak_acids, weak_bases)
+
+
+def _strong_ion_label(solution: MixerSolution) -> str:
+    # Íon espectador de um ácido/base forte: ânion Aⁿ⁻ ou cátion Mⁿ⁺.
+    charge = "" if solution.equivalents == 1 else str(solution.equivalents).translate(str.maketrans("23", "²³"))
+    return f"A{charge}⁻" if solution.kind == "acid" else f"M{charge}⁺"
+
+
+class SolutionMixerModule(SimulationModule):
+
+    def get_name(self) -> str:
+        return "solution-mixer"
+
+    def get_display_name(self) -> str:
+        return "Mistura de Soluções Ácido-Base"
+
+    def get_category(self) -> str:
+        return "Chemistry"
+
+    def get_description(self) -> str:
+        return "Mistura várias soluções de ácidos e bases (fortes, fracos ou polipróticos) e calcula o pH de equilíbrio e a concentração de cada espécie."
+
+    def get_parameter_schema(self) -> Type[SolutionMixerParams]:
+        return SolutionMixerParams
+
+    def get_result_schema(self) -> Type[SolutionMixerResult]:
+        return SolutionMixerResult
+
+    def run_simulation(self, params: SolutionMixerParams) -> SolutionMixerResult:
+        """
+        Todas as soluções entram em um único balanço de cargas, resolvido uma
+        vez; a concentração de cada forma sai das frações α no pH encontrado.
+        """
+        total_volume_l = sum(solution.volume_ml for solution in params.solutions) * conversion_factor("mL", "L")
+        composition = mixture_composition(params.solutions, total_volume_l)
+        exact_ph = solve_ph(composition)
+        h = 10 ** -exact_ph
+
+        ml_to_l = conversion_factor("mL", "L")
+        species: List[MixedSpecies] = []
+        for index, solution in enumerate(params.solutions):
+            concentration = solution.concentration * solution.volume_ml * ml_to_l / total_volume_l
+            if solution.constants is None:
+                forms, form_concentrations = [_strong_ion_label(solution)], [concentration]
+            else:
+                is_base = solution.kind == "base"
+                ka_values = conjugate_acid_constants(solution.constants) if is_base else solution.constants
+                forms = species_labels(len(solution.constants), is_base)
+                form_concentrations = [concentration * fraction for fraction in alpha_fractions(h, ka_values)]
+            species.append(MixedSpecies(
+                solution_index=index,
+                name=solution.name,
+                analytical_concentration=concentration,
+                forms=forms,
+                form_concentrations=form_concentrations,
+            ))
+
+        ph = round(min(max(exact_ph, 0.0), 14.0), 2)
+        return SolutionMixerResult(
+            ph=ph,
+            poh=round(PKW - ph, 2),
+            status="Ácida" if ph < 7.0 else "Neutra" if ph == 7.0 else "Básica",
+            total_volume_ml=round(total_volume_l * conversion_factor("L", "mL"), 3),
+            h_concentration=h,
+            oh_concentration=KW / h,
+            species=species,
+            parameters_used=params.model_dump(),
+        )
@@ -0,0 +1,68 @@
+"""
+Especiação de ácidos e bases polipróticos a partir da lista de pKa.
+
+As formas são sempre ordenadas da mais protonada para a menos protonada
+(H₃A, H₂A⁻, HA²⁻, A³⁻ / BH₂²⁺, BH⁺, B). Para uma base, os pKb informados são
+convertidos nos pKa do ácido conjugado (pKa' = pKw − pKb, em ordem inversa),
+e as frações vêm da mesma função dos ácidos.
+"""
+import math
+from typing import List, Sequence, Tuple
+
+from backend.simulations.chemistry.equilibrium_solver import PKW, AcidBaseComposition, alpha_fractions, solve_ph
+
+_SUBSCRIPTS = str.maketrans("0123456789", "₀₁₂₃₄₅₆₇₈₉")
+_SUPERSCRIPTS = str.maketrans("0123456789", "⁰¹²³⁴⁵⁶⁷⁸⁹")
+
+
+def _charge_label(charge: int) -> str:
+    if charge == 0:
+        return ""
+    sign = "⁺" if charge > 0 else "⁻"
+    return sign if abs(charge) == 1 else str(abs(charge)).translate(_SUPERSCRIPTS) + sign
+
+
+def species_labels(step_count: int, is_base: bool) -> List[str]:
+    """Rótulos das formas, da mais protonada à menos protonada."""
+    labels: List[str] = []
+    for released in range(step_count + 1):
+        protons = step_count - released
+        hydrogens = "" if protons == 0 else "H" if protons == 1 else "H" + str(protons).translate(_SUBSCRIPTS)
+        # Uma base BHn^(n+) cede prótons até a base neutra B; um ácido HnA, até Aⁿ⁻.
+        labels.append("B" + hydrogens + _charge_label(protons) if is_base else hydrogens + "A" + _charge_label(-released))
+    return labels
+
+
+def acid_pka_values(pk_values: Sequence[float], is_base: bool) -> List[float]:
+    """pKa por etapa da forma mais protonada (para bases, do ácido conjugado)."""
+    return [PKW - pkb for pkb in reversed(pk_values)] if is_base else list(pk_values)
+
+
+def solution_speciation(concentration: float, pk_values: Sequence[float], is_base: bool) -> Tuple[float, List[float]]:
+    """
+    pH de uma solução do ácido (pKa por etapa) ou da base (pKb por etapa) pura
+    e as frações α de cada forma nesse pH.
+    """
+    constants = [10 ** -pk for pk in pk_values]
+    if is_base:
+        composition = AcidBaseComposition(weak_bases=((concentration, constants),))
+    else:
+        composition = AcidBaseComposition(weak_acids=((concentration, constants),))
+    ph = solve_ph(composition)
+    return ph, alpha_fractions(10 ** -ph, [10 ** -pka for pka in acid_pka_values(pk_values, is_base)])
+
+
+def ph_grid(ph_min: float, ph_max: float, points: int) -> List[float]:
+    step = (ph_max - ph_min) / (points - 1)
+    return [ph_min + step * i for i in range(points - 1)] + [ph_max]
+
+
+def distribution_diagram(pka_values: Sequence[float], ph_values: Sequence[float]) -> List[List[float]]:
+    """
+    Diagrama de distribuição: para cada forma, a série de frações α em todos os
+    pH de `ph_values` (uma lista por forma, na ordem de species_labels).
+    """
+    ka_values = [10 ** -pka for pka in pka_values]
+    ln10 = math.log(10)
+    rows = [alpha_fractions(math.exp(-ph * ln10), ka_values) for ph in ph_values]
+    return [list(column) for column in zip(*rows)]
@@ -0,0 +1,73 @@
+from typing import List, Optional, Type
+
+from backend.simulations.base_simulation import SimulationModule
+from backend.simulations.chemistry.equilibrium_solver import PKW
+from backend.simulations.chemistry.models_acid_base import SpeciationParams, SpeciationResult
+from backend.simulations.chemistry.speciation import (
+    acid_pka_values,
+    distribution_diagram,
+    ph_grid,
+    solution_speciation,
+    species_labels,
+)
+
+
+class AcidBaseSpeciationModule(SimulationModule):
+
+    def get_name(self) -> str:
+        return "acid-base-speciation"
+
+    def get_display_name(self) -> str:
+        return "Especiação de Ácidos e Bases Polipróticos"
+
+    def get_category(self) -> str:
+        return "Chemistry"
+
+    def get_description(self) -> str:
+        return "Frações de cada forma de um ácido ou base poliprótico a partir dos pKa, pH da solução e diagrama de distribuição."
+
+    def get_parameter_schema(self) -> Type[SpeciationParams]:
+        return SpeciationParams
+
+    def get_result_schema(self) -> Type[SpeciationResult]:
+        return SpeciationResult
+
+    def run_simulation(self, params: SpeciationParams) -> SpeciationResult:
+        """
+        Com 'concentration', resolve o balanço de cargas da solução pura e
+        devolve o pH e as frações nesse ponto. O diagrama avalia as frações em
+        toda a grade de pH de uma vez.
+        """
+        pk_values = params.pkb_values if params.is_base else params.pka_values
+        pka_values = acid_pka_values(pk_values, params.is_base)
+        species = species_labels(len(pk_values), params.is_base)
+
+        ph: Optional[float] = None
+        alpha: Optional[List[float]] = None
+        species_concentrations: Optional[List[float]] = None
+        dominant_species: Optional[str] = None
+        if params.concentration is not None:
+            exact_ph, alpha = solution_speciation(params.concentration, pk_values, params.is_base)
+            ph = round(min(max(exact_ph, 0.0), 14.0), 2)
+            species_concentrations = [params.concentration * fraction for fraction in alpha]
+            dominant_species = species[max(range(len(alpha)), key=alpha.__getitem__)]
+
+        diagram_ph: Optional[List[float]] = None
+        diagram_alpha: Optional[List[List[float]]] = None
+        if params.include_diagram:
+            grid = ph_grid(params.ph_min, params.ph_max, params.ph_points)
+            diagram_ph = [round(value, 4) for value in grid]
+            diagram_alpha = [[round(fraction, 6) for fraction in series] for series in distribution_diagram(pka_values, grid)]
+
+        return SpeciationResult(
+            species=species,
+            pka_values=[round(pka, 4) for pka in pka_values],
+            ph=ph,
+            poh=round(PKW - ph, 2) if ph is not None else None,
+            alpha=alpha,
+            species_concentrations=species_concentrations,
+            dominant_species=dominant_species,
+            diagram_ph=diagram_ph,
+            diagram_alpha=diagram_alpha,
+            parameters_used=params.model_dump(),
+        )
@@ -0,0 +1,47 @@
+"""
+Ácidos e bases fortes reconhecidos pelo nome e a sua parcela no balanço de cargas.
+
+O fator estequiométrico conta todos os H⁺ (OH⁻) neutralizáveis por fórmula. As
+etapas de dissociação que não são completas entram no balanço de cargas
+(equilibrium_solver) como ácido fraco, com o seu Ka, em vez de serem somadas
+ao ácido forte.
+"""
+from typing import Optional, Sequence, Tuple
+
+# H₂SO₄: a primeira dissociação é completa; a segunda (HSO₄⁻ ⇌ H⁺ + SO₄²⁻) tem Ka2 ≈ 1,2·10⁻².
+KA2_H2SO4 = 1.2e-2
+
+
+def _normalized(name: Optional[str]) -> str:
+    return name.lower().strip() if name else ""
+
+
+def _is_sulfuric_acid(name: Optional[str]) -> bool:
+    normalized_name = _normalized(name)
+    return "h2so4" in normalized_name or "h₂so₄" in normalized_name
+
+
+def strong_acid_factor(name: Optional[str]) -> float:
+    return 2.0 if _is_sulfuric_acid(name) else 1.0
+
+
+def strong_base_factor(name: Optional[str]) -> float:
+    # O Ca(OH)₂ dissolvido libera os dois OH⁻ por completo, então não há etapa fraca.
+    normalized_name = _normalized(name)
+    return 2.0 if "ca(oh)2" in normalized_name or "ca(oh)₂" in normalized_name else 1.0
+
+
+def strong_acid_weak_steps(name: Optional[str]) -> Tuple[float, ...]:
+    """Ka das etapas de dissociação incompletas do ácido (vazio quando todas são completas)."""
+    return (KA2_H2SO4,) if _is_sulfuric_acid(name) else ()
+
+
+def strong_acid_terms(formal_concentration: float, factor: float,
+                      weak_steps: Sequence[float]) -> Tuple[float, Tuple[Tuple[float, Tuple[float, ...]], ...]]:
+    """
+    Ácido forte e ácidos fracos (concentração, [Ka, ...]) da AcidBaseComposition
+    para `formal_concentration` mol/L de um ácido forte na solução final.
+    """
+    strong_acid = formal_concentration * (factor - len(weak_steps))
+    weak_acids = ((formal_concentration, tuple(weak_steps)),) if weak_steps else ()
+    return strong_acid, weak_acids
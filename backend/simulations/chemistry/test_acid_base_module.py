@@ -113,13 +113,14 @@ def test_h2so4_with_naoh_neutral():
     # H2SO4 (0.05M) vs NaOH (0.1M) - Volumes iguais para neutralização
     # Mols H+ = 0.05 * V * 2 = 0.1 * V
     # Mols OH- = 0.1 * V * 1 = 0.1 * V
+    # No P.E. sobra SO4²⁻ 0.025M, base muito fraca (Kb = Kw/Ka2): [OH-]² = Kw + Kb * 0.025 -> pH 7.24
     params = AcidBaseSimulationParams(
         acid_name="H2SO4", acid_concentration=0.05, acid_volume=50,
         base_name="NaOH", base_concentration=0.1, base_volume=50,
         indicator_name="Fenolftaleína"
     )
     result = module.run_simulation(params)
-    assert result.final_ph == 7.0
+    assert result.final_ph == 7.24
     assert result.status == "Neutra"
     assert result.parameters_used["acid_name"] == "H2SO4"
     assert result.parameters_used["base_name"] == "NaOH"
@@ -143,17 +144,17 @@ def test_h2so4_with_ca_oh2_acidic():
     # H2SO4 (0.1M, 10mL) vs Ca(OH)2 (0.05M, 10mL)
     # Mols H+ = 0.1 * 0.01L * 2 = 0.002 mols
     # Mols OH- = 0.05 * 0.01L * 2 = 0.001 mols
-    # Excesso H+ = 0.001 mols em 20mL (0.02L)
-    # [H+] = 0.001 / 0.02 = 0.05 M -> pH = -log10(0.05) = 1.30
+    # Excesso H+ = 0.001 mols em 20mL (0.02L), todo na forma de HSO4- 0.05M
+    # [H+]² / (0.05 - [H+]) = Ka2 = 1.2e-2 -> [H+] = 0.019 M -> pH = 1.72
     params = AcidBaseSimulationParams(
         acid_name="H₂SO₄", acid_concentration=0.1, acid_volume=10,
         base_name="Ca(OH)₂", base_concentration=0.05, base_volume=10,
         indicator_name="Alaranjado de Metila"
     )
     result = module.run_simulation(params)
-    assert abs(result.final_ph - 1.30) < 0.01
+    assert abs(result.final_ph - 1.72) < 0.01
     assert result.status == "Ácida"
-    assert result.indicator_color == "Vermelho" # Alaranjado de metila em pH 1.30 é Vermelho
+    assert result.indicator_color == "Vermelho" # Alaranjado de metila em pH 1.72 é Vermelho
     assert result.parameters_used["acid_name"] == "H₂SO₄"
     assert result.parameters_used["base_name"] == "Ca(OH)₂"
 
@@ -356,14 +357,26 @@ def test_weak_acid_weak_base_mixture():
         base_name="NH3", base_concentration=0.1, base_volume=50, base_kb=KB_NH3
     )
     result = module.run_simulation(params)
-    assert result.final_ph == -1.0 # Indicativo de não calculado/erro
-    assert "não é suportado" in result.message
-    assert result.status == "Indeterminado (WA vs WB)"
+    assert result.final_ph == 7.0 # pKa = pKb: sal de ácido e base de mesma força
+    assert result.final_poh == 7.0
+    assert "balanço de cargas" in result.message
+    assert result.status == "Neutra (WA vs WB)"
+    assert result.excess_reactant == "Nenhum (P.E.)"
     assert result.is_weak_acid_calculation is True
     assert result.is_weak_base_calculation is True
     assert result.ka_used == KA_CH3COOH
     assert result.kb_used == KB_NH3
 
+def test_weak_acid_weak_base_mixture_follows_the_weaker_side():
+    # HCN (Ka 6.2e-10) com NH3: o ácido é bem mais fraco que o NH4⁺, então a mistura fica básica.
+    params = AcidBaseSimulationParams(
+        acid_name="HCN", acid_concentration=0.1, acid_volume=50, acid_ka=6.2e-10,
+        base_name="NH3", base_concentration=0.1, base_volume=50, base_kb=KB_NH3
+    )
+    result = module.run_simulation(params)
+    assert abs(result.final_ph - 9.23) < 0.01
+    assert result.status == "Básica (WA vs WB)"
+
 # Teste para Ka inválido
 def test_invalid_ka_value():
     with pytest.raises(HTTPException) as exc_info:
@@ -0,0 +1,98 @@
+import math
+import random
+
+import pytest
+
+from backend.simulations.chemistry import equilibrium_solver
+from backend.simulations.chemistry.equilibrium_solver import KW, AcidBaseComposition, alpha_fractions, solve_ph, solve_ph_batch
+
+KA_CH3COOH = 1.8e-5
+KB_NH3 = 1.8e-5
+KA_HCN = 6.2e-10
+
+def charge_imbalance(composition: AcidBaseComposition, ph: float) -> float:
+    """Diferença relativa entre cargas positivas e negativas no pH dado."""
+    h = 10 ** -ph
+    positive = h + composition.strong_base + sum(c * h / (h + KW / kb) for c, kb in composition.weak_bases)
+    negative = KW / h + composition.strong_acid + sum(c * ka / (h + ka) for c, ka in composition.weak_acids)
+    return abs(positive - negative) / max(positive, negative)
+
+@pytest.mark.parametrize("composition, expected_ph", [
+    (AcidBaseComposition(), 7.0),
+    (AcidBaseComposition(strong_acid=0.1), 1.0),
+    (AcidBaseComposition(strong_base=0.02), 12.30),
+    (AcidBaseComposition(strong_acid=1e-8), 6.98), # a água domina; não é pH 8
+    (AcidBaseComposition(weak_acids=((0.1, KA_CH3COOH),)), 2.88),
+    (AcidBaseComposition(weak_bases=((0.1, KB_NH3),)), 11.12),
+    (AcidBaseComposition(strong_base=0.05, weak_acids=((0.05, KA_CH3COOH),)), 8.72), # P.E. CH3COOH/NaOH
+    (AcidBaseComposition(weak_acids=((0.05, KA_CH3COOH),), weak_bases=((0.05, KB_NH3),)), 7.0),
+    (AcidBaseComposition(weak_acids=((0.05, KA_HCN),), weak_bases=((0.05, KB_NH3),)), 9.23), # ≈ (pKa + pKa(NH4⁺)) / 2
+    (AcidBaseComposition(weak_acids=((0.05, KA_CH3COOH),), weak_bases=((0.025, KB_NH3),)), 4.75), # tampão HA/A⁻ com NH4⁺
+])
+def test_solve_ph_known_values(composition, expected_ph):
+    assert abs(solve_ph(composition) - expected_ph) < 0.01
+
+def test_solve_ph_satisfies_charge_balance_for_random_mixtures():
+    rng = random.Random(7)
+    for _ in range(500):
+        composition = AcidBaseComposition(
+            strong_acid=10 ** rng.uniform(-6, 0) * rng.randint(0, 1),
+            strong_base=10 ** rng.uniform(-6, 0) * rng.randint(0, 1),
+            weak_acids=[(10 ** rng.uniform(-6, 0), 10 ** rng.uniform(-12, -1)) for _ in range(rng.randint(0, 2))],
+            weak_bases=[(10 ** rng.uniform(-6, 0), 10 ** rng.uniform(-12, -1)) for _ in range(rng.randint(0, 2))],
+        )
+        assert charge_imbalance(composition, solve_ph(composition)) < 1e-9
+
+def test_initial_guess_does_not_change_the_root():
+    composition = AcidBaseComposition(strong_base=0.02, weak_acids=((0.05, KA_CH3COOH),))
+    reference = solve_ph(composition)
+    for initial_ph in (-5.0, 0.5, 4.0, 7.0, 13.9, 30.0):
+        assert math.isclose(solve_ph(composition, initial_ph=initial_ph), reference, abs_tol=1e-10)
+
+def test_batch_with_warm_start_matches_independent_solutions():
+    # Curva de titulação de 50 mL de CH3COOH 0,1 M com NaOH 0,1 M.
+    compositions = [
+        AcidBaseComposition(strong_base=0.1 * v / (50 + v), weak_acids=((0.1 * 50 / (50 + v), KA_CH3COOH),))
+        for v in [0.1 * i for i in range(1, 1001)]
+    ]
+    warm = solve_ph_batch(compositions)
+    cold = solve_ph_batch(compositions, warm_start=False)
+    assert len(warm) == len(compositions)
+    assert max(abs(a - b) for a, b in zip(warm, cold)) < 1e-10
+    assert all(b > a for a, b in zip(warm, warm[1:])) # pH cresce monotonicamente com a base adicionada
+
+@pytest.mark.parametrize("composition", [
+    AcidBaseComposition(weak_acids=((0.1, KA_CH3COOH),)),
+    AcidBaseComposition(strong_base=0.03, weak_acids=((0.07, KA_CH3COOH),)), # tampão
+    AcidBaseComposition(strong_base=0.05, weak_acids=((0.05, KA_CH3COOH),)), # equivalência
+    AcidBaseComposition(strong_base=0.06, weak_acids=((0.04, KA_CH3COOH),)), # excesso de titulante
+    AcidBaseComposition(strong_acid=0.02, weak_bases=((0.05, KB_NH3),)),
+    AcidBaseComposition(strong_acid=0.05, weak_bases=((0.05, KB_NH3),)),
+])
+def test_closed_form_estimate_starts_next_to_the_root(composition):
+    acids = [(c, (ka,)) for c, ka in composition.weak_acids]
+    bases = [(c, equilibrium_solver.conjugate_acid_constants(kb)) for c, kb in composition.weak_bases]
+    estimate = equilibrium_solver._closed_form_log_h(composition.strong_acid, composition.strong_base, acids, bases)
+    assert abs(-estimate / math.log(10) - solve_ph(composition)) < 0.01
+
+# Espécies polipróticas: constantes por etapa
+KA_H3PO4 = [10 ** -2.15, 10 ** -7.20, 10 ** -12.35]
+KB_CO3 = [10 ** -3.67, 10 ** -7.65] # CO₃²⁻ (pKb = 14 − pKa2, 14 − pKa1 do H₂CO₃)
+
+@pytest.mark.parametrize("composition, expected_ph", [
+    (AcidBaseComposition(weak_acids=((0.1, KA_H3PO4),)), 1.63),
+    (AcidBaseComposition(strong_base=0.1, weak_acids=((0.1, KA_H3PO4),)), 4.69), # NaH₂PO₄ ≈ (pKa1 + pKa2) / 2
+    (AcidBaseComposition(weak_bases=((0.1, KB_CO3),)), 11.65),
+    (AcidBaseComposition(strong_acid=0.1, weak_bases=((0.1, KB_CO3),)), 8.34), # HCO₃⁻
+])
+def test_solve_ph_polyprotic(composition, expected_ph):
+    assert abs(solve_ph(composition) - expected_ph) < 0.01
+
+def test_single_step_list_matches_monoprotic_constant():
+    assert solve_ph(AcidBaseComposition(weak_acids=((0.1, [KA_CH3COOH]),))) == solve_ph(AcidBaseComposition(weak_acids=((0.1, KA_CH3COOH),)))
+
+def test_alpha_fractions_sum_to_one_and_cross_at_pka():
+    for ph in (0.0, 2.15, 7.2, 12.35, 14.0):
+        assert math.isclose(sum(alpha_fractions(10 ** -ph, KA_H3PO4)), 1.0)
+    alphas = alpha_fractions(10 ** -7.2, KA_H3PO4)
+    assert math.isclose(alphas[1], alphas[2], rel_tol=1e-3) # [H₂PO₄⁻] = [HPO₄²⁻] em pH = pKa2
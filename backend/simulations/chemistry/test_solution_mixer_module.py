@@ -0,0 +1,77 @@
+import math
+
+import pytest
+from pydantic import ValidationError
+
+from backend.simulations.chemistry.acid_base_module import AcidBaseModule
+from backend.simulations.chemistry.models_acid_base import AcidBaseSimulationParams, MixerSolution, SolutionMixerParams
+from backend.simulations.chemistry.solution_mixer_module import SolutionMixerModule
+
+KA_CH3COOH = 1.8e-5
+KB_NH3 = 1.8e-5
+KA_H3PO4 = [7.1e-3, 6.3e-8, 4.5e-13]
+module = SolutionMixerModule()
+
+def mix(*solutions):
+    return module.run_simulation(SolutionMixerParams(solutions=[MixerSolution(**solution) for solution in solutions]))
+
+@pytest.mark.parametrize("acid_ka, base_kb, base_volume", [
+    (KA_CH3COOH, None, 25), # tampão
+    (KA_CH3COOH, None, 50), # P.E.
+    (None, KB_NH3, 75), # excesso de ácido forte
+    (KA_CH3COOH, KB_NH3, 50), # ácido fraco + base fraca
+])
+def test_two_solutions_match_acid_base_module(acid_ka, base_kb, base_volume):
+    result = mix(
+        dict(kind="acid", concentration=0.1, volume_ml=50, ka_values=[acid_ka] if acid_ka else None),
+        dict(kind="base", concentration=0.1, volume_ml=base_volume, kb_values=[base_kb] if base_kb else None),
+    )
+    reference = AcidBaseModule().run_simulation(AcidBaseSimulationParams(
+        acid_name="HA", acid_concentration=0.1, acid_volume=50, acid_ka=acid_ka,
+        base_name="B", base_concentration=0.1, base_volume=base_volume, base_kb=base_kb,
+    ))
+    assert result.ph == reference.final_ph
+    assert result.total_volume_ml == reference.total_volume_ml
+
+def test_mixture_of_several_solutions_balances_mass_and_charge():
+    result = mix(
+        dict(name="H3PO4", kind="acid", concentration=0.1, volume_ml=50, ka_values=KA_H3PO4),
+        dict(name="NaOH", kind="base", concentration=0.1, volume_ml=75),
+        dict(name="NH3", kind="base", concentration=0.05, volume_ml=20, kb_values=[KB_NH3]),
+        dict(name="H2SO4", kind="acid", concentration=0.01, volume_ml=10, equivalents=2),
+        dict(name="CH3COOH", kind="acid", concentration=0.02, volume_ml=30, ka_values=[KA_CH3COOH]),
+    )
+    assert result.total_volume_ml == 185.0
+    assert [s.forms for s in result.species] == [["H₃A", "H₂A⁻", "HA²⁻", "A³⁻"], ["M⁺"], ["BH⁺", "B"], ["A²⁻"], ["HA", "A⁻"]]
+    for species in result.species:
+        assert math.isclose(sum(species.form_concentrations), species.analytical_concentration)
+    phosphate, sodium, ammonia, sulfate, acetate = result.species
+    assert math.isclose(phosphate.analytical_concentration, 0.1 * 50 / 185)
+
+    positive = result.h_concentration + sodium.form_concentrations[0] + ammonia.form_concentrations[0]
+    negative = (result.oh_concentration + 2 * sulfate.form_concentrations[0] + acetate.form_concentrations[1]
+                + sum(i * c for i, c in enumerate(phosphate.form_concentrations)))
+    assert math.isclose(positive, negative, rel_tol=1e-9)
+    assert 6.5 < result.ph < 7.5 # tampão H₂PO₄⁻/HPO₄²⁻
+    assert result.status == ("Ácida" if result.ph < 7 else "Básica")
+    assert math.isclose(result.poh, 14.0 - result.ph)
+
+def test_single_strong_solution():
+    result = mix(dict(kind="base", concentration=0.05, volume_ml=10, equivalents=2, name="Ca(OH)2"))
+    assert result.ph == 13.0
+    assert result.species[0].forms == ["M²⁺"]
+
+@pytest.mark.parametrize("solution", [
+    dict(kind="acid", concentration=0.1, volume_ml=10, kb_values=[1e-5]),
+    dict(kind="base", concentration=0.1, volume_ml=10, ka_values=[1e-5]),
+    dict(kind="acid", concentration=0.1, volume_ml=10, ka_values=[-1e-5]),
+    dict(kind="acid", concentration=0.0, volume_ml=10),
+    dict(kind="acid", concentration=0.1, volume_ml=10, equivalents=4),
+])
+def test_invalid_solution(solution):
+    with pytest.raises(ValidationError):
+        MixerSolution(**solution)
+
+def test_requires_at_least_one_solution():
+    with pytest.raises(ValidationError):
+        SolutionMixerParams(solutions=[])
@@ -0,0 +1,71 @@
+import math
+
+import pytest
+from pydantic import ValidationError
+
+from backend.simulations.chemistry.models_acid_base import SpeciationParams
+from backend.simulations.chemistry.speciation import distribution_diagram, species_labels
+from backend.simulations.chemistry.speciation_module import AcidBaseSpeciationModule
+
+module = AcidBaseSpeciationModule()
+PKA_H3PO4 = [2.15, 7.20, 12.35]
+
+def test_species_labels():
+    assert species_labels(3, is_base=False) == ["H₃A", "H₂A⁻", "HA²⁻", "A³⁻"]
+    assert species_labels(1, is_base=False) == ["HA", "A⁻"]
+    assert species_labels(2, is_base=True) == ["BH₂²⁺", "BH⁺", "B"]
+
+def test_phosphoric_acid_solution_and_diagram():
+    result = module.run_simulation(SpeciationParams(name="H3PO4", pka_values=PKA_H3PO4, concentration=0.1, ph_points=141))
+    assert result.species == ["H₃A", "H₂A⁻", "HA²⁻", "A³⁻"]
+    assert abs(result.ph - 1.63) < 0.01
+    assert result.poh == round(14.0 - result.ph, 2)
+    assert result.dominant_species == "H₃A"
+    assert math.isclose(sum(result.alpha), 1.0)
+    assert math.isclose(sum(result.species_concentrations), 0.1)
+
+    assert len(result.diagram_ph) == 141
+    assert result.diagram_ph[0] == 0.0 and result.diagram_ph[-1] == 14.0
+    assert len(result.diagram_alpha) == 4
+    assert all(len(series) == 141 for series in result.diagram_alpha)
+    for i in range(141):
+        assert abs(sum(series[i] for series in result.diagram_alpha) - 1.0) < 1e-5
+    # Cada forma predomina entre pKa consecutivos.
+    by_ph = dict(zip(result.diagram_ph, zip(*result.diagram_alpha)))
+    assert max(range(4), key=by_ph[1.0].__getitem__) == 0
+    assert max(range(4), key=by_ph[5.0].__getitem__) == 1
+    assert max(range(4), key=by_ph[10.0].__getitem__) == 2
+    assert max(range(4), key=by_ph[13.0].__getitem__) == 3
+
+def test_diagram_matches_single_point_evaluations():
+    grid = [0.5 * i for i in range(29)]
+    diagram = distribution_diagram(PKA_H3PO4, grid)
+    for i, ph in enumerate(grid):
+        point = distribution_diagram(PKA_H3PO4, [ph])
+        assert [series[i] for series in diagram] == [series[0] for series in point]
+
+def test_carbonate_base_uses_conjugate_acid_pka():
+    result = module.run_simulation(SpeciationParams(name="CO3", pkb_values=[3.67, 7.65], concentration=0.1, include_diagram=False))
+    assert result.species == ["BH₂²⁺", "BH⁺", "B"]
+    assert result.pka_values == [6.35, 10.33]
+    assert abs(result.ph - 11.65) < 0.01
+    assert result.dominant_species == "B"
+    assert result.diagram_ph is None and result.diagram_alpha is None
+
+def test_diagram_only_without_concentration():
+    result = module.run_simulation(SpeciationParams(pka_values=[4.74], ph_min=2, ph_max=8, ph_points=7))
+    assert result.ph is None and result.alpha is None
+    assert result.diagram_ph == [2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0]
+    assert result.diagram_alpha[0][0] > 0.99 and result.diagram_alpha[1][-1] > 0.99
+
+@pytest.mark.parametrize("overrides", [
+    {},
+    {"pka_values": [4.74], "pkb_values": [4.74]},
+    {"pka_values": []},
+    {"pka_values": [1, 2, 3, 4, 5, 6, 7]},
+    {"pka_values": [25.0]},
+    {"pka_values": [4.74], "ph_min": 10, "ph_max": 2},
+])
+def test_invalid_params(overrides):
+    with pytest.raises(ValidationError):
+        SpeciationParams(**overrides)
@@ -0,0 +1,127 @@
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from backend.simulations.chemistry.acid_base_module import AcidBaseModule
+from backend.simulations.chemistry.acid_base_titration_module import AcidBaseTitrationModule, MAX_TITRATION_POINTS
+from backend.simulations.chemistry.models_acid_base import AcidBaseSimulationParams, TitrationParams
+from backend.simulations.chemistry.titration_engine import build_titration_system, compute_titration_ph
+
+KA_CH3COOH = 1.8e-5
+KB_NH3 = 1.8e-5
+titration_module = AcidBaseTitrationModule()
+acid_base_module = AcidBaseModule()
+
+def weak_acid_params(**overrides) -> TitrationParams:
+    params = dict(
+        acid_name="CH3COOH", acid_concentration=0.1, acid_volume=50, acid_ka=KA_CH3COOH,
+        titrant_is_acid=False, titrant_name="NaOH", titrant_concentration=0.1,
+        initial_titrant_volume_ml=0.0, final_titrant_volume_ml=100.0, volume_increment_ml=1.0,
+    )
+    params.update(overrides)
+    return TitrationParams(**params)
+
+@pytest.mark.parametrize("params", [
+    weak_acid_params(),
+    weak_acid_params(acid_ka=None, acid_name="H2SO4"),
+    TitrationParams(
+        base_name="NH3", base_concentration=0.1, base_volume=50, base_kb=KB_NH3,
+        titrant_is_acid=True, titrant_name="HCl", titrant_concentration=0.1,
+        final_titrant_volume_ml=100.0, volume_increment_ml=1.0,
+    ),
+    TitrationParams(
+        base_name="Ca(OH)2", base_concentration=0.05, base_volume=20,
+        titrant_is_acid=True, titrant_name="HCl", titrant_concentration=0.1,
+        final_titrant_volume_ml=40.0, volume_increment_ml=0.5,
+    ),
+])
+def test_engine_matches_point_by_point_module(params):
+    system = build_titration_system(params)
+    volumes = [v for v in titration_module._titrant_volumes(params, system) if v > 0]
+    engine_ph = compute_titration_ph(system, volumes)
+    for volume, ph in zip(volumes, engine_ph):
+        if params.titrant_is_acid:
+            point = AcidBaseSimulationParams(
+                acid_name=params.titrant_name, acid_concentration=params.titrant_concentration, acid_volume=volume,
+                base_name=params.base_name, base_concentration=params.base_concentration, base_volume=params.base_volume, base_kb=params.base_kb,
+            )
+        else:
+            point = AcidBaseSimulationParams(
+                acid_name=params.acid_name, acid_concentration=params.acid_concentration, acid_volume=params.acid_volume, acid_ka=params.acid_ka,
+                base_name=params.titrant_name, base_concentration=params.titrant_concentration, base_volume=volume,
+            )
+        assert acid_base_module.run_simulation(point).final_ph == ph
+
+def test_curve_starts_at_zero_titrant_volume():
+    result = titration_module.run_simulation(weak_acid_params())
+    assert result.titration_curve[0].titrant_volume_added_ml == 0.0
+    assert abs(result.titration_curve[0].ph - 2.88) < 0.01 # CH3COOH 0.1M puro
+    ph_by_volume = {point.titrant_volume_added_ml: point.ph for point in result.titration_curve}
+    assert abs(ph_by_volume[25.0] - 4.74) < 0.01
+    assert abs(ph_by_volume[50.0] - 8.72) < 0.01
+
+def test_point_limit_was_raised():
+    result = titration_module.run_simulation(weak_acid_params(volume_increment_ml=0.02))
+    assert len(result.titration_curve) >= 5001
+    with pytest.raises(HTTPException) as exc_info:
+        titration_module.run_simulation(weak_acid_params(volume_increment_ml=100.0 / MAX_TITRATION_POINTS / 2))
+    assert exc_info.value.status_code == 400
+
+@pytest.mark.parametrize("increment", [2.0, 1.0, 0.1])
+def test_equivalence_point_from_coarse_curve(increment):
+    result = titration_module.run_simulation(weak_acid_params(volume_increment_ml=increment))
+    assert result.equivalence_points_ml == [50.0]
+    assert result.inflection_points_ml is not None
+    assert abs(result.inflection_points_ml[0] - 50.0) < 0.01
+
+def test_equivalence_point_with_weak_base_and_diprotic_acid():
+    result = titration_module.run_simulation(TitrationParams(
+        base_name="NH3", base_concentration=0.1, base_volume=30, base_kb=KB_NH3,
+        titrant_is_acid=True, titrant_name="H2SO4", titrant_concentration=0.05,
+        final_titrant_volume_ml=60.0, volume_increment_ml=2.0,
+    ))
+    assert result.equivalence_points_ml == [30.0]
+    assert abs(result.inflection_points_ml[0] - 30.0) < 0.01
+def test_h2so4_second_dissociation_is_partial():
+    # H2SO4 0.1M puro: 1ª dissociação completa e HSO4- com Ka2 = 1.2e-2
+    # x(0.1 + x) / (0.1 - x) = 1.2e-2 -> x = 0.0098 -> pH 0.96 (e não 0.70 de 2 H+ fortes)
+    params = weak_acid_params(acid_ka=None, acid_name="H2SO4", acid_volume=25)
+    system = build_titration_system(params)
+    assert system.acid_factor == 2.0 # os dois H+ continuam neutralizáveis
+    assert abs(compute_titration_ph(system, [0.0])[0] - 0.96) < 0.01
+    assert titration_module.run_simulation(params).equivalence_points_ml == [50.0]
+
+def test_no_equivalence_point_outside_curve_range():
+    result = titration_module.run_simulation(weak_acid_params(final_titrant_volume_ml=40.0))
+    assert result.equivalence_points_ml is None
+    assert result.inflection_points_ml is None
+
+def test_adaptive_sampling_respects_budget_and_keeps_endpoints():
+    result = titration_module.run_simulation(weak_acid_params(sampling="adaptive", max_points=60, max_ph_step=0.05))
+    volumes = [point.titrant_volume_added_ml for point in result.titration_curve]
+    assert len(volumes) == 60
+    assert volumes[0] == 0.0 and volumes[-1] == 100.0
+    assert volumes == sorted(set(volumes))
+    assert 50.0 in volumes # volume estequiométrico incluído na grade inicial
+
+def test_adaptive_sampling_concentrates_points_near_equivalence():
+    result = titration_module.run_simulation(weak_acid_params(sampling="adaptive", max_points=200, max_ph_step=0.1))
+    curve = result.titration_curve
+    assert len(curve) < 200 # alvo de variação de pH atingido antes de esgotar o orçamento
+    assert abs(result.inflection_points_ml[0] - 50.0) < 0.01
+    steps = [(curve[i + 1].titrant_volume_added_ml - curve[i].titrant_volume_added_ml, abs(curve[i + 1].ph - curve[i].ph), curve[i].titrant_volume_added_ml)
+             for i in range(len(curve) - 1)]
+    assert min(dv for dv, _, v in steps if 49 < v < 51) < 0.05
+    assert max(dv for dv, _, v in steps if 10 < v < 40) > 1.0
+    # Fora da descontinuidade no ponto exato de equivalência, a variação entre pontos respeita o alvo.
+    assert max(dph for _, dph, v in steps if abs(v - 50.0) > 0.1) <= 0.1 + 0.01
+
+def test_adaptive_sampling_ignores_fixed_increment_limit():
+    result = titration_module.run_simulation(weak_acid_params(sampling="adaptive", volume_increment_ml=0.0001, max_points=100))
+    assert len(result.titration_curve) <= 100
+
+def test_volume_increment_is_required_only_for_fixed_sampling():
+    result = titration_module.run_simulation(weak_acid_params(sampling="adaptive", volume_increment_ml=None, max_points=50))
+    assert len(result.titration_curve) <= 50
+    with pytest.raises(ValidationError):
+        weak_acid_params(volume_increment_ml=None)
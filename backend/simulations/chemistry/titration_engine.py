@@ -0,0 +1,233 @@
+"""
+Motor de curvas de titulação.
+
+Calcula a composição e o pH para todos os volumes de titulante de uma vez,
+resolvendo o balanço de cargas de cada ponto a partir da solução do ponto
+anterior (equilibrium_solver). Reproduz os mesmos resultados do AcidBaseModule
+ponto a ponto, sem validar modelos nem montar resultados intermediários para
+cada incremento.
+"""
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from backend.simulations.chemistry.equilibrium_solver import AcidBaseComposition, solve_ph_batch
+from backend.simulations.chemistry.models_acid_base import TitrationParams
+from backend.simulations.chemistry.strong_electrolytes import (
+    strong_acid_factor, strong_acid_terms, strong_acid_weak_steps, strong_base_factor,
+)
+from backend.simulations.unit_registry import conversion_factor, convert_values
+
+# Valor de pH usado pelo AcidBaseModule para indicar cálculo não suportado/erro.
+PH_ERROR = -1.0
+
+
+class TitrationSystem(NamedTuple):
+    """Descrição da mistura com o titulante já atribuído ao lado ácido ou básico."""
+    acid_concentration: float
+    acid_ka: Optional[float]
+    acid_factor: float
+    base_concentration: float
+    base_kb: Optional[float]
+    base_factor: float
+    titrant_is_acid: bool
+    analyte_volume_ml: float
+    acid_weak_steps: Tuple[float, ...] = () # Ka das etapas incompletas do ácido forte (HSO₄⁻)
+
+
+def build_titration_system(params: TitrationParams) -> TitrationSystem:
+    if params.titrant_is_acid:
+        # Titulante ácido forte; o titulado é a base (forte ou fraca).
+        return TitrationSystem(
+            acid_concentration=params.titrant_concentration,
+            acid_ka=None,
+            acid_factor=strong_acid_factor(params.titrant_name),
+            base_concentration=params.base_concentration or 0.0,
+            base_kb=params.base_kb,
+            base_factor=1.0 if params.base_kb else strong_base_factor(params.base_name),
+            titrant_is_acid=True,
+            analyte_volume_ml=params.base_volume or 0.0,
+            acid_weak_steps=strong_acid_weak_steps(params.titrant_name),
+        )
+    return TitrationSystem(
+        acid_concentration=params.acid_concentration or 0.0,
+        acid_ka=params.acid_ka,
+        acid_factor=1.0 if params.acid_ka else strong_acid_factor(params.acid_name),
+        base_concentration=params.titrant_concentration,
+        base_kb=None,
+        base_factor=strong_base_factor(params.titrant_name),
+        titrant_is_acid=False,
+        analyte_volume_ml=params.acid_volume or 0.0,
+        acid_weak_steps=() if params.acid_ka else strong_acid_weak_steps(params.acid_name),
+    )
+
+
+def _finalize_ph(ph: float, digits: Optional[int]) -> float:
+    if ph == PH_ERROR:
+        return ph
+    clamped = min(max(ph, 0.0), 14.0)
+    return round(clamped, digits) if digits is not None else clamped
+
+
+def compute_titration_ph(system: TitrationSystem, titrant_volumes_ml: Sequence[float],
+                         digits: Optional[int] = 2) -> List[float]:
+    """
+    pH (limitado a 0–14) para cada volume de titulante adicionado. Por padrão é
+    arredondado a 2 casas como no AcidBaseModule; `digits=None` mantém o valor exato.
+    """
+    n = len(titrant_volumes_ml)
+    analyte_volume_l = system.analyte_volume_ml * conversion_factor("mL", "L")
+    if system.titrant_is_acid:
+        acid_volumes_l = convert_values(titrant_volumes_ml, "mL", "L")
+        base_volumes_l = [analyte_volume_l] * n
+    else:
+        acid_volumes_l = [analyte_volume_l] * n
+        base_volumes_l = convert_values(titrant_volumes_ml, "mL", "L")
+
+    ka, kb = system.acid_ka, system.base_kb
+    ph = [7.0] * n # água pura quando nenhum reagente está ativo
+    indices: List[int] = []
+    compositions: List[AcidBaseComposition] = []
+    for i in range(n):
+        acid_active = acid_volumes_l[i] > 0 and system.acid_concentration > 0
+        base_active = base_volumes_l[i] > 0 and system.base_concentration > 0
+        if not acid_active and not base_active:
+            continue
+        # Como no AcidBaseModule, só as soluções com reagente ativo entram no volume.
+        volume_l = (acid_volumes_l[i] if acid_active else 0.0) + (base_volumes_l[i] if base_active else 0.0)
+        if acid_active and base_active and volume_l <= 1e-9:
+            ph[i] = PH_ERROR
+            continue
+        acid = system.acid_concentration * acid_volumes_l[i] / volume_l if acid_active else 0.0
+        base = system.base_concentration * base_volumes_l[i] * system.base_factor / volume_l if base_active else 0.0
+        if ka:
+            strong_acid, weak_acids = 0.0, ((acid, ka),)
+        else:
+            strong_acid, weak_acids = strong_acid_terms(acid, system.acid_factor, system.acid_weak_steps)
+        indices.append(i)
+        compositions.append(AcidBaseComposition(
+            strong_acid=strong_acid,
+            strong_base=0.0 if kb else base,
+            weak_acids=weak_acids,
+            weak_bases=((base, kb),) if kb else (),
+        ))
+
+    # Cada ponto parte da fórmula fechada da sua região (ver equilibrium_solver), que fica
+    # mais perto da raiz do que a solução do ponto anterior.
+    for i, value in zip(indices, solve_ph_batch(compositions, warm_start=False)):
+        ph[i] = value
+    return [_finalize_ph(value, digits) for value in ph]
+
+
+# --- Amostragem adaptativa ---
+
+# Pontos da grade uniforme inicial e menor distância entre pontos (o dobro da precisão de
+# 0,001 mL com que os volumes são informados, para que continuem distintos após o arredondamento).
+ADAPTIVE_INITIAL_POINTS = 17
+MIN_ADAPTIVE_STEP_ML = 0.002
+
+
+def adaptive_titrant_volumes(system: TitrationSystem, initial_ml: float, final_ml: float,
+                             max_ph_step: float, max_points: int) -> List[float]:
+    """
+    Escolhe os volumes de titulante de modo que o pH varie no máximo `max_ph_step`
+    entre pontos consecutivos, sem passar de `max_points` pontos. Parte de uma
+    grade uniforme grossa (mais o volume estequiométrico, quando no intervalo) e
+    subdivide ao meio os intervalos de maior variação; cada rodada avalia todos
+    os novos pontos de uma vez no motor.
+    """
+    if final_ml - initial_ml <= 1e-9:
+        return [initial_ml]
+
+    initial_count = min(ADAPTIVE_INITIAL_POINTS, max_points)
+    step = (final_ml - initial_ml) / (initial_count - 1)
+    volumes = [initial_ml + step * i for i in range(initial_count - 1)] + [final_ml]
+    equivalence_ml = stoichiometric_equivalence_volume(system)
+    if (equivalence_ml is not None and len(volumes) < max_points and initial_ml < equivalence_ml < final_ml
+            and min(abs(v - equivalence_ml) for v in volumes) >= MIN_ADAPTIVE_STEP_ML):
+        volumes = sorted(volumes + [equivalence_ml])
+    ph_values = compute_titration_ph(system, volumes, digits=None)
+
+    while len(volumes) < max_points:
+        candidates = sorted(
+            (
+                (abs(ph_values[i + 1] - ph_values[i]), i) for i in range(len(volumes) - 1)
+                if volumes[i + 1] - volumes[i] >= 2 * MIN_ADAPTIVE_STEP_ML
+                and ph_values[i] != PH_ERROR and ph_values[i + 1] != PH_ERROR
+                and abs(ph_values[i + 1] - ph_values[i]) > max_ph_step
+            ),
+            reverse=True,
+        )[:max_points - len(volumes)]
+        if not candidates:
+            break
+        midpoints = [(volumes[i] + volumes[i + 1]) / 2 for _, i in candidates]
+        points = sorted(zip(volumes + midpoints, ph_values + compute_titration_ph(system, midpoints, digits=None)))
+        volumes = [volume for volume, _ in points]
+        ph_values = [ph for _, ph in points]
+    return volumes
+
+
+# --- Pontos de equivalência ---
+
+# Pontos avaliados por iteração e número de iterações do refinamento numérico.
+REFINE_SAMPLES = 16
+REFINE_ITERATIONS = 4
+# Quantas vezes a inclinação máxima deve superar a inclinação média da curva para ser reconhecida como salto.
+MIN_EQUIVALENCE_SLOPE_RATIO = 5.0
+
+
+def stoichiometric_equivalence_volume(system: TitrationSystem) -> Optional[float]:
+    """Volume de titulante (mL) em que os mols de H⁺ e OH⁻ se igualam."""
+    if system.titrant_is_acid:
+        analyte_mols = system.base_concentration * system.base_factor * system.analyte_volume_ml
+        titrant_strength = system.acid_concentration * system.acid_factor
+    else:
+        analyte_mols = system.acid_concentration * system.acid_factor * system.analyte_volume_ml
+        titrant_strength = system.base_concentration * system.base_factor
+    if analyte_mols <= 0 or titrant_strength <= 0:
+        return None
+    return analyte_mols / titrant_strength
+
+
+def _steepest_segment(volumes: Sequence[float], ph_values: Sequence[float]) -> Optional[int]:
+    best_index, best_slope = None, 0.0
+    for i in range(len(volumes) - 1):
+        dv = volumes[i + 1] - volumes[i]
+        # O trecho que parte do analito puro (sem titulante) não é um salto de equivalência.
+        if dv <= 0 or volumes[i] <= 0 or ph_values[i] == PH_ERROR or ph_values[i + 1] == PH_ERROR:
+            continue
+        slope = abs(ph_values[i + 1] - ph_values[i]) / dv
+        if slope > best_slope:
+            best_index, best_slope = i, slope
+    return best_index
+
+
+def detect_equivalence_volume(system: TitrationSystem, volumes: Sequence[float],
+                              ph_values: Sequence[float]) -> Optional[float]:
+    """
+    Estima o ponto de equivalência pela derivada máxima dpH/dV da curva. O
+    segmento mais inclinado é localizado na curva e depois refinado avaliando
+    o motor (sem arredondamento) em grades cada vez mais finas ao redor dele.
+    Retorna None se o salto não estiver contido no intervalo da curva.
+    """
+    index = _steepest_segment(volumes, ph_values)
+    # O salto precisa estar no interior da curva, com pontos dos dois lados.
+    if index is None or index == 0 or index + 1 == len(volumes) - 1:
+        return None
+    slope = abs(ph_values[index + 1] - ph_values[index]) / (volumes[index + 1] - volumes[index])
+    mean_slope = abs(ph_values[-1] - ph_values[0]) / (volumes[-1] - volumes[0])
+    if slope < MIN_EQUIVALENCE_SLOPE_RATIO * mean_slope:
+        return None
+    low, high = volumes[index - 1], volumes[index + 2]
+
+    for _ in range(REFINE_ITERATIONS):
+        step = (high - low) / REFINE_SAMPLES
+        grid = [low + step * i for i in range(REFINE_SAMPLES)] + [high]
+        refined = _steepest_segment(grid, compute_titration_ph(system, grid, digits=None))
+        if refined is None:
+            break
+        low, high = grid[max(refined - 1, 0)], grid[min(refined + 2, REFINE_SAMPLES)]
+    estimate = (low + high) / 2
+    # No início da curva de um analito fraco a inclinação é máxima perto de V=0 (quase nenhum
+    # ânion formado ainda); esse máximo de borda não é uma equivalência.
+    if not volumes[1] < estimate < volumes[-2]:
+        return None
+    return estimate
@@ -0,0 +1,219 @@
+"""
+Integração de lançamentos com arrasto aerodinâmico.
+
+Usa o método de Runge–Kutta de Dormand–Prince 5(4) com passo adaptativo,
+saída densa de 4ª ordem (polinômio por passo, para amostrar a trajetória em
+qualquer instante) e detecção de eventos (impacto no solo e ápice) por
+bisseção sobre a saída densa. Vários lançamentos podem ser integrados em uma
+chamada; cada um tem seu próprio controle de passo, o que em Python puro sai
+mais barato que um passo comum limitado pelo lançamento mais exigente.
+
+Modelos de arrasto, com velocidade relativa ao ar u = v − (vento, 0):
+- 'linear':    a = −k·u − g·ŷ          (k em 1/s)
+- 'quadratic': a = −k·|u|·u − g·ŷ      (k em 1/m)
+"""
+import math
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .trajectory_engine import TrajectoryColumns
+
+# Tabela de Butcher de Dormand–Prince (os nós c não aparecem: o sistema é autônomo).
+_A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+)
+_B = (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84)
+# Diferença entre as soluções de 5ª e 4ª ordem (o 7º estágio é f(t + h, y_novo)).
+_E = (-71 / 57600, 0.0, 71 / 16695, -71 / 1920, 17253 / 339200, -22 / 525, 1 / 40)
+# Coeficientes da saída densa: y(t + θh) = y + h · Σ_m θ^(m+1) · Σ_j K_j · P[j][m].
+_P = (
+    (1.0, -8048581381 / 2820520608, 8663915743 / 2820520608, -12715105075 / 11282082432),
+    (0.0, 0.0, 0.0, 0.0),
+    (0.0, 131558114200 / 32700410799, -68118460800 / 10900136933, 87487479700 / 32700410799),
+    (0.0, -1754552775 / 470086768, 14199869525 / 1410260304, -10690763975 / 1880347072),
+    (0.0, 127303824393 / 49829197408, -318862633887 / 49829197408, 701980252875 / 199316789632),
+    (0.0, -282668133 / 205662961, 2019193451 / 616988883, -1453857185 / 822651844),
+    (0.0, 40617522 / 29380423, -110615467 / 29380423, 69997945 / 29380423),
+)
+
+DEFAULT_RTOL = 1e-8
+DEFAULT_ATOL = 1e-8
+MAX_STEPS = 100_000
+_EVENT_BISECTIONS = 60
+
+
+class DragFlight(NamedTuple):
+    """Grandezas de um lançamento integrado, em SI."""
+    impact_time: float
+    impact_x: float
+    impact_velocity_x: float
+    impact_velocity_y: float
+    apex_time: float
+    apex_height: float
+    # Maior módulo de aceleração observado; limita o erro da poligonal (ver trajectory_engine.tolerance_time_step).
+    max_acceleration: float
+
+
+class _DenseStep(NamedTuple):
+    t_start: float
+    h: float
+    y_start: List[float]
+    # q[c] = coeficientes de θ, θ², θ³, θ⁴ para a componente c.
+    q: List[Tuple[float, float, float, float]]
+
+
+class DragSolution(NamedTuple):
+    flights: List[DragFlight]
+    # Passos com saída densa de cada lançamento (apenas quando pedidos em integrate_drag_batch).
+    dense_steps: List[List[_DenseStep]]
+
+    def sample(self, launch_index: int, times: Sequence[float], snap_impact: bool = True) -> TrajectoryColumns:
+        """
+        Amostra (t, x, y) de um lançamento em instantes crescentes, limitados ao
+        voo. Ao amostrar por blocos, só o último bloco deve usar `snap_impact`.
+        """
+        flight = self.flights[launch_index]
+        steps = self.dense_steps[launch_index]
+        xs: List[float] = []
+        ys: List[float] = []
+        step_index = 0
+        for t in times:
+            t = min(max(t, 0.0), flight.impact_time)
+            while step_index < len(steps) - 1 and t > steps[step_index].t_start + steps[step_index].h:
+                step_index += 1
+            x, y = _dense_components(steps[step_index], t, 0, 2) if steps else (0.0, 0.0)
+            xs.append(x)
+            ys.append(max(y, 0.0))
+        times = list(times)
+        # Como em compute_trajectory_si, um último ponto a menos de 1e-4 s do impacto é o próprio impacto.
+        if snap_impact and times and abs(times[-1] - flight.impact_time) < 1e-4:
+            times[-1], xs[-1], ys[-1] = flight.impact_time, flight.impact_x, 0.0
+        return TrajectoryColumns(times, xs, ys)
+
+
+def _dense_components(step: _DenseStep, t: float, offset: int, count: int) -> List[float]:
+    theta = (t - step.t_start) / step.h if step.h > 0 else 0.0
+    values = []
+    for c in range(offset, offset + count):
+        q1, q2, q3, q4 = step.q[c]
+        values.append(step.y_start[c] + step.h * theta * (q1 + theta * (q2 + theta * (q3 + theta * q4))))
+    return values
+
+
+def _dense_step(t: float, h: float, state: List[float], stages: List[List[float]]) -> _DenseStep:
+    q = [
+        tuple(sum(stage[c] * p_row[m] for stage, p_row in zip(stages, _P)) for m in range(4))
+        for c in range(len(state))
+    ]
+    return _DenseStep(t, h, state, q)
+
+
+def _dormand_prince_step(state: List[float], k0: List[float], h: float,
+                         derivatives: Callable[[List[float]], List[float]]) -> Tuple[List[float], List[List[float]], List[float]]:
+    """Um passo de Dormand–Prince: novo estado, os 7 estágios e o erro local estimado por componente."""
+    (a10,), (a20, a21), (a30, a31, a32), (a40, a41, a42, a43), (a50, a51, a52, a53, a54) = _A[1:]
+    b0, _, b2, b3, b4, b5 = _B
+    e0, _, e2, e3, e4, e5, e6 = _E
+    k1 = derivatives([y + h * a10 * d0 for y, d0 in zip(state, k0)])
+    k2 = derivatives([y + h * (a20 * d0 + a21 * d1) for y, d0, d1 in zip(state, k0, k1)])
+    k3 = derivatives([y + h * (a30 * d0 + a31 * d1 + a32 * d2) for y, d0, d1, d2 in zip(state, k0, k1, k2)])
+    k4 = derivatives([y + h * (a40 * d0 + a41 * d1 + a42 * d2 + a43 * d3) for y, d0, d1, d2, d3 in zip(state, k0, k1, k2, k3)])
+    k5 = derivatives([y + h * (a50 * d0 + a51 * d1 + a52 * d2 + a53 * d3 + a54 * d4) for y, d0, d1, d2, d3, d4 in zip(state, k0, k1, k2, k3, k4)])
+    new_state = [y + h * (b0 * d0 + b2 * d2 + b3 * d3 + b4 * d4 + b5 * d5) for y, d0, d2, d3, d4, d5 in zip(state, k0, k2, k3, k4, k5)]
+    k6 = derivatives(new_state)
+    errors = [
+        h * (e0 * d0 + e2 * d2 + e3 * d3 + e4 * d4 + e5 * d5 + e6 * d6)
+        for d0, d2, d3, d4, d5, d6 in zip(k0, k2, k3, k4, k5, k6)
+    ]
+    return new_state, [k0, k1, k2, k3, k4, k5, k6], errors
+
+
+def _bisect_event(step: _DenseStep, component: int, t_low: float, t_high: float) -> float:
+    """Instante em que a componente passa de positiva para ≤ 0 dentro do passo."""
+    for _ in range(_EVENT_BISECTIONS):
+        t_mid = (t_low + t_high) / 2
+        if _dense_components(step, t_mid, component, 1)[0] > 0:
+            t_low = t_mid
+        else:
+            t_high = t_mid
+    return t_high
+
+
+def _integrate_launch(initial_state: Tuple[float, float, float, float], g: float, model: str, k: float, wind: float,
+                      rtol: float, atol: float, keep_dense: bool) -> Tuple[DragFlight, List[_DenseStep]]:
+    x0, y0, vx0, vy0 = initial_state
+    if y0 <= 0 and vy0 <= 0:
+        # Já no solo e sem subir: o voo termina em t = 0.
+        return DragFlight(0.0, x0, vx0, vy0, 0.0, max(y0, 0.0), g), []
+
+    def derivatives(values: List[float]) -> List[float]:
+        _, _, vx, vy = values
+        rel_vx = vx - wind
+        drag = k * math.hypot(rel_vx, vy) if model == "quadratic" else k
+        return [vx, vy, -drag * rel_vx, -g - drag * vy]
+
+    state = [float(x0), float(y0), float(vx0), float(vy0)]
+    apex: Optional[Tuple[float, float]] = (0.0, y0) if vy0 <= 0 else None
+    max_accel = 0.0
+    dense_steps: List[_DenseStep] = []
+
+    # Passo inicial a partir do tempo de voo sem arrasto (que é um limite superior).
+    h = max((vy0 + math.sqrt(vy0 * vy0 + 2 * g * max(y0, 0.0))) / g / 100, 1e-6)
+    t = 0.0
+    k0 = derivatives(state)
+
+    for _ in range(MAX_STEPS):
+        new_state, stages, errors = _dormand_prince_step(state, k0, h, derivatives)
+        error_norm = math.sqrt(sum(
+            (error / (atol + rtol * max(abs(old), abs(new)))) ** 2
+            for error, old, new in zip(errors, state, new_state)
+        ) / 4)
+        if error_norm > 1.0:
+            h *= max(0.2, 0.9 * error_norm ** -0.2)
+            continue
+
+        step = _dense_step(t, h, state, stages) if keep_dense else None
+        if step is not None:
+            dense_steps.append(step)
+        max_accel = max(max_accel, math.hypot(stages[0][2], stages[0][3]), math.hypot(stages[6][2], stages[6][3]))
+
+        if apex is None and new_state[3] <= 0:
+            # O polinômio do passo só é montado quando há evento a localizar.
+            step = step or _dense_step(t, h, state, stages)
+            apex_t = _bisect_event(step, 3, t, t + h)
+            apex = (apex_t, _dense_components(step, apex_t, 1, 1)[0])
+        if new_state[1] <= 0:
+            step = step or _dense_step(t, h, state, stages)
+            impact_t = _bisect_event(step, 1, t, t + h)
+            impact_x, _, impact_vx, impact_vy = _dense_components(step, impact_t, 0, 4)
+            apex_t, apex_y = apex if apex is not None else (impact_t, 0.0)
+            return DragFlight(impact_t, impact_x, impact_vx, impact_vy, apex_t, apex_y, max_accel), dense_steps
+
+        t += h
+        state = new_state
+        k0 = stages[6] # FSAL: o último estágio é a derivada no início do próximo passo.
+        h *= min(10.0, 0.9 * error_norm ** -0.2) if error_norm > 0 else 10.0
+
+    raise RuntimeError("Integração com arrasto excedeu o número máximo de passos.")
+
+
+def integrate_drag_batch(initial_states: Sequence[Tuple[float, float, float, float]], g: float,
+                         model: str, k: float, wind: float = 0.0,
+                         rtol: float = DEFAULT_RTOL, atol: float = DEFAULT_ATOL,
+                         keep_dense: bool = False) -> DragSolution:
+    """
+    Integra os lançamentos `initial_states` ([x, y, vx, vy] em SI) até cada um
+    atingir o solo (y = 0 descendo). Com `keep_dense`, guarda os polinômios
+    de cada passo para DragSolution.sample.
+    """
+    flights: List[DragFlight] = []
+    dense_steps: List[List[_DenseStep]] = []
+    for initial_state in initial_states:
+        flight, steps = _integrate_launch(initial_state, g, model, k, wind, rtol, atol, keep_dense)
+        flights.append(flight)
+        dense_steps.append(steps)
+    return DragSolution(flights, dense_steps)
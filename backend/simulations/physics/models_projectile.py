@@ -1,5 +1,5 @@
-from typing import List, Optional, Literal
-from pydantic import BaseModel, Field, field_validator
+from typing import Any, Dict, List, Optional, Literal, Sequence, Union
+from pydantic import BaseModel, Field, field_validator, model_validator
 from backend.simulations.base_simulation import BaseSimulationParams, BaseSimulationResult
 
 # Allowed Unit Literals
@@ -55,6 +55,32 @@ class OutputUnitSelection(BaseModel):
         return value
 
 
+MAX_TERRAIN_VERTICES = 200_000
+MAX_OUTPUT_UNIT_SETS = 8
+
+class TerrainProfile(BaseModel):
+    heights: List[float] = Field(..., min_length=2, max_length=MAX_TERRAIN_VERTICES, description="Alturas dos vértices do terreno (y absoluto, como a altura inicial).")
+    x: Optional[List[float]] = Field(None, max_length=MAX_TERRAIN_VERTICES, description="Posições horizontais dos vértices, estritamente crescentes (perfil linear por partes).")
+    spacing: Optional[float] = Field(None, gt=0, description="Espaçamento horizontal constante entre as alturas (perfil amostrado), no lugar de 'x'.")
+    x_start: float = Field(0.0, description="Posição do primeiro vértice de um perfil amostrado.")
+    unit: ALLOWED_LENGTH_UNITS = Field("m", description="Unidade das posições e alturas do terreno.")
+
+    @model_validator(mode='after')
+    def check_vertices(self) -> 'TerrainProfile':
+        if (self.x is None) == (self.spacing is None):
+            raise ValueError("Informe exatamente um entre 'x' e 'spacing'.")
+        if self.x is not None:
+            if len(self.x) != len(self.heights):
+                raise ValueError("'x' e 'heights' devem ter o mesmo número de vértices.")
+            if any(b <= a for a, b in zip(self.x, self.x[1:])):
+                raise ValueError("As posições 'x' do terreno devem ser estritamente crescentes.")
+        return self
+
+    def vertex_positions(self) -> List[float]:
+        if self.x is not None:
+            return list(self.x)
+        return [self.x_start + self.spacing * i for i in range(len(self.heights))]
+
 class ProjectileLaunchParams(BaseSimulationParams):
     initial_velocity: float = Field(..., gt=0, description="Valor da velocidade inicial do projétil.")
     initial_velocity_unit: Optional[ALLOWED_VELOCITY_UNITS] = Field(
@@ -68,10 +94,60 @@ class ProjectileLaunchParams(BaseSimulationParams):
         description="Unidade da altura inicial."
     )
     gravity: Optional[float] = Field(9.81, gt=0, description="Aceleração devido à gravidade. Assume-se m/s^2 e é usada como tal internamente. A conversão de outras unidades de entrada não é diretamente suportada para este campo.")
-    output_units: Optional[OutputUnitSelection] = Field(
+    output_units: Optional[Union[OutputUnitSelection, List[OutputUnitSelection]]] = Field(
         default_factory=OutputUnitSelection,
-        description="Preferências de unidade para os resultados da simulação."
+        description="Preferências de unidade para os resultados da simulação. Uma lista (até 8 conjuntos) calcula a trajetória uma vez e a projeta em cada conjunto em 'unit_views'; os campos principais usam o primeiro."
+    )
+    trajectory_points: Optional[int] = Field(
+        None, ge=2, le=100_000,
+        description="Número exato de pontos da trajetória (alta resolução). Se omitido, o passo de tempo é adaptativo (20 a 2000 pontos)."
+    )
+    trajectory_tolerance: Optional[float] = Field(
+        None, gt=0,
+        description="Distância máxima (m) entre o gráfico em linhas retas e a parábola real. Os pontos são espaçados por esse erro, sempre incluindo o ápice e o impacto. Não pode ser usado junto com trajectory_points."
+    )
+    drag_model: Literal["none", "linear", "quadratic"] = Field(
+        "none",
+        description="Modelo de arrasto do ar: 'none' (solução analítica), 'linear' (a = -k·u) ou 'quadratic' (a = -k·|u|·u), com u a velocidade relativa ao ar."
     )
+    drag_coefficient: float = Field(
+        0.0, ge=0,
+        description="Coeficiente k do arrasto, já dividido pela massa: em 1/s no modelo linear e em 1/m no quadrático."
+    )
+    wind_velocity: float = Field(
+        0.0,
+        description="Velocidade horizontal do vento (m/s), positiva no sentido do lançamento. Só tem efeito com arrasto."
+    )
+    terrain: Optional[TerrainProfile] = Field(
+        None,
+        description="Perfil do solo linear por partes; o voo termina no primeiro ponto em que a trajetória o atinge. Se omitido, o solo é plano em y = 0. Não disponível com arrasto."
+    )
+
+    @model_validator(mode='after')
+    def check_sampling_options(self) -> 'ProjectileLaunchParams':
+        if self.trajectory_points is not None and self.trajectory_tolerance is not None:
+            raise ValueError("Use apenas um entre 'trajectory_points' e 'trajectory_tolerance'.")
+        return self
+
+    @model_validator(mode='after')
+    def check_output_unit_sets(self) -> 'ProjectileLaunchParams':
+        if isinstance(self.output_units, list) and not 1 <= len(self.output_units) <= MAX_OUTPUT_UNIT_SETS:
+            raise ValueError(f"'output_units' deve ter de 1 a {MAX_OUTPUT_UNIT_SETS} conjuntos de unidades.")
+        return self
+
+    def output_unit_sets(self) -> List[OutputUnitSelection]:
+        """Conjuntos de unidades pedidos, sempre como lista; o primeiro é o dos campos principais do resultado."""
+        if self.output_units is None:
+            return [OutputUnitSelection()]
+        if isinstance(self.output_units, list):
+            return self.output_units
+        return [self.output_units]
+
+    @model_validator(mode='after')
+    def check_terrain_options(self) -> 'ProjectileLaunchParams':
+        if self.terrain is not None and self.drag_model != "none":
+            raise ValueError("O perfil de terreno só está disponível sem arrasto (drag_model='none').")
+        return self
 
     @field_validator('initial_velocity_unit')
     @classmethod
@@ -92,6 +168,21 @@ class TrajectoryPoint(BaseModel):
     x: float = Field(..., description="Posição horizontal (x). A unidade corresponderá a ProjectileLaunchResult.max_range_unit.")
     y: float = Field(..., description="Posição vertical (y). A unidade corresponderá a ProjectileLaunchResult.max_height_unit.")
 
+class ProjectileUnitView(BaseModel):
+    """Resumo e colunas x/y da trajetória em um conjunto de unidades; os instantes são os de ProjectileLaunchResult.trajectory."""
+    initial_velocity_x: float
+    initial_velocity_x_unit: str
+    initial_velocity_y: float
+    initial_velocity_y_unit: str
+    total_time: float
+    total_time_unit: str
+    max_range: float
+    max_range_unit: str
+    max_height: float
+    max_height_unit: str
+    x: List[float] = Field(..., description="Posições horizontais, na unidade max_range_unit.")
+    y: List[float] = Field(..., description="Posições verticais, na unidade max_height_unit.")
+
 class ProjectileLaunchResult(BaseSimulationResult):
     initial_velocity_x: float = Field(..., description="Componente X da velocidade inicial.")
     initial_velocity_x_unit: str = Field(..., description="Unidade da componente X da velocidade inicial.")
@@ -109,7 +200,21 @@ class ProjectileLaunchResult(BaseSimulationResult):
 
     trajectory: List[TrajectoryPoint] = Field(..., description="Lista de pontos da trajetória. 'time' é sempre em segundos. 'x' e 'y' terão unidades correspondentes a 'max_range_unit' e 'max_height_unit' respectivamente.")
 
+    unit_views: Optional[List[ProjectileUnitView]] = Field(
+        None,
+        description="Presente quando 'output_units' é uma lista: uma visão por conjunto de unidades, na mesma ordem, com as colunas x/y alinhadas a 'trajectory'."
+    )
+
     parameters_used: ProjectileLaunchParams
+
+    def aligned_series_updates(self, series_name: str, indices: Sequence[int]) -> Dict[str, Any]:
+        """Mantém as colunas de unit_views alinhadas a 'trajectory' quando a série é reduzida (ver series_decimation)."""
+        if series_name != "trajectory" or not self.unit_views:
+            return {}
+        return {"unit_views": [
+            view.model_copy(update={"x": [view.x[i] for i in indices], "y": [view.y[i] for i in indices]})
+            for view in self.unit_views
+        ]}
     # A anotação 'type: ignore[assignment]' foi removida pois o Pydantic v2 geralmente lida bem
     # com a atribuição de um modelo Pydantic onde um Dict[str, Any] é esperado na classe base,
     # especialmente durante a serialização. Se problemas surgirem, pode ser reavaliado.
@@ -118,3 +223,157 @@ class ProjectileLaunchResult(BaseSimulationResult):
         # Pydantic V2 não requer mais `orm_mode = True`. `from_attributes = True` é o substituto se necessário para ORM.
         # Para este caso, a configuração padrão deve ser suficiente.
         pass
+
+
+# Consulta analítica: estado do projétil em instantes/posições sem gerar a trajetória
+
+MAX_QUERY_POINTS = 100_000
+
+class ProjectileQueryParams(ProjectileLaunchParams):
+    times: List[float] = Field(
+        default_factory=list, max_length=MAX_QUERY_POINTS,
+        description="Instantes (s) em que o estado do projétil é consultado."
+    )
+    x_positions: List[float] = Field(
+        default_factory=list, max_length=MAX_QUERY_POINTS,
+        description="Posições horizontais (na unidade de output_units.range_unit) para as quais se quer o instante de passagem e o estado."
+    )
+
+class ProjectileState(BaseModel):
+    time: float = Field(..., description="Tempo em segundos.")
+    x: float = Field(..., description="Posição horizontal, na unidade de ProjectileQueryResult.range_unit.")
+    y: float = Field(..., description="Altura, na unidade de ProjectileQueryResult.height_unit.")
+    velocity_x: float = Field(..., description="Componente X da velocidade, na unidade de ProjectileQueryResult.velocity_unit.")
+    velocity_y: float = Field(..., description="Componente Y da velocidade (negativa na descida).")
+    speed: float = Field(..., description="Módulo da velocidade.")
+
+class ProjectileQueryResult(BaseSimulationResult):
+    states_at_times: List[Optional[ProjectileState]] = Field(..., description="Estado para cada instante de 'times'; null se o instante está fora do voo.")
+    states_at_positions: List[Optional[ProjectileState]] = Field(..., description="Estado na passagem por cada posição de 'x_positions'; null se a posição não é alcançada.")
+    impact: ProjectileState = Field(..., description="Estado no instante do impacto com o solo.")
+    range_unit: str = Field(..., description="Unidade de x.")
+    height_unit: str = Field(..., description="Unidade de y.")
+    velocity_unit: str = Field(..., description="Unidade das velocidades.")
+
+
+# Problema inverso: ângulo/velocidade para atingir um alvo
+
+class ProjectileAimParams(BaseSimulationParams):
+    target_x: float = Field(..., gt=0, description="Distância horizontal até o alvo.")
+    target_y: float = Field(0.0, ge=0, description="Altura do alvo em relação ao solo.")
+    target_unit: ALLOWED_LENGTH_UNITS = Field("m", description="Unidade das coordenadas do alvo.")
+    initial_velocity: Optional[float] = Field(
+        None, gt=0,
+        description="Velocidade de lançamento. Com ela, são calculados os ângulos de arco baixo e alto; a velocidade mínima é sempre calculada."
+    )
+    initial_velocity_unit: ALLOWED_VELOCITY_UNITS = Field("m/s", description="Unidade da velocidade de lançamento.")
+    initial_height: float = Field(0.0, ge=0, description="Altura do ponto de lançamento.")
+    initial_height_unit: ALLOWED_LENGTH_UNITS = Field("m", description="Unidade da altura de lançamento.")
+    gravity: float = Field(9.81, gt=0, description="Aceleração da gravidade (m/s^2).")
+    output_units: OutputUnitSelection = Field(default_factory=OutputUnitSelection, description="Apenas velocity_unit é usada nas soluções.")
+
+class AimSolution(BaseModel):
+    launch_angle: float = Field(..., description="Ângulo de lançamento em graus.")
+    initial_velocity: float = Field(..., description="Velocidade de lançamento, na unidade de ProjectileAimResult.velocity_unit.")
+    time_to_target: float = Field(..., description="Tempo (s) até atingir o alvo.")
+
+class ProjectileAimResult(BaseSimulationResult):
+    reachable: bool = Field(..., description="Se o alvo é atingível com a velocidade informada (sempre verdadeiro sem velocidade).")
+    low_arc: Optional[AimSolution] = Field(None, description="Solução de arco baixo; null se inatingível ou se o ângulo sai do intervalo 0°–90° aceito pelo lançamento.")
+    high_arc: Optional[AimSolution] = Field(None, description="Solução de arco alto; null se inatingível.")
+    minimum_velocity: AimSolution = Field(..., description="Menor velocidade que atinge o alvo e o ângulo correspondente.")
+    velocity_unit: str = Field(..., description="Unidade das velocidades nas soluções.")
+
+
+# Conjuntos de Monte Carlo: incerteza nos parâmetros de lançamento
+
+MAX_ENSEMBLE_SAMPLES = 100_000
+
+class ParameterDistribution(BaseModel):
+    kind: Literal["normal", "uniform"] = Field(..., description="'normal' (média no valor nominal) ou 'uniform' (centrada no valor nominal).")
+    std: Optional[float] = Field(None, gt=0, description="Desvio padrão da distribuição normal, na unidade do campo.")
+    half_width: Optional[float] = Field(None, gt=0, description="Meia largura da distribuição uniforme (valor nominal ± half_width), na unidade do campo.")
+
+    @model_validator(mode='after')
+    def check_spread(self) -> 'ParameterDistribution':
+        if self.kind == "normal" and self.std is None:
+            raise ValueError("A distribuição normal exige 'std'.")
+        if self.kind == "uniform" and self.half_width is None:
+            raise ValueError("A distribuição uniforme exige 'half_width'.")
+        return self
+
+class ProjectileEnsembleParams(ProjectileLaunchParams):
+    distributions: Dict[Literal["initial_velocity", "launch_angle", "initial_height"], ParameterDistribution] = Field(
+        default_factory=dict,
+        description="Distribuição de cada parâmetro incerto, em torno do valor nominal informado no próprio campo."
+    )
+    samples: int = Field(1000, ge=1, le=MAX_ENSEMBLE_SAMPLES, description="Número de lançamentos sorteados.")
+    seed: Optional[int] = Field(None, description="Semente do gerador; se omitida, uma é sorteada e devolvida no resultado.")
+    percentiles: List[float] = Field(default_factory=lambda: [5.0, 25.0, 50.0, 75.0, 95.0], max_length=50, description="Percentis (0–100) calculados para cada grandeza.")
+    histogram_bins: int = Field(20, ge=1, le=500, description="Número de classes do histograma de pontos de queda.")
+
+    @field_validator('percentiles')
+    @classmethod
+    def validate_percentiles(cls, value):
+        if any(not 0 <= percentile <= 100 for percentile in value):
+            raise ValueError("Percentis devem estar entre 0 e 100.")
+        return value
+
+class EnsembleStatistics(BaseModel):
+    mean: float
+    std: float
+    min: float
+    max: float
+    percentiles: Dict[str, float] = Field(..., description="Valor de cada percentil pedido, com chaves como 'p50'.")
+
+class LandingHistogram(BaseModel):
+    bin_edges: List[float] = Field(..., description="Limites das classes (histogram_bins + 1 valores), na unidade de range_unit.")
+    counts: List[int] = Field(..., description="Número de lançamentos em cada classe.")
+
+class ProjectileEnsembleResult(BaseSimulationResult):
+    samples: int
+    seed: int = Field(..., description="Semente usada; repeti-la reproduz o mesmo conjunto.")
+    clipped_samples: int = Field(..., description="Sorteios ajustados para o domínio válido (velocidade > 0, 0° <= ângulo < 90°, altura >= 0 e não abaixo do terreno).")
+    range: EnsembleStatistics
+    max_height: EnsembleStatistics
+    total_time: EnsembleStatistics
+    landing_histogram: LandingHistogram
+    range_unit: str
+    height_unit: str
+    time_unit: str
+
+
+# Curvas alcance × ângulo e parábola de segurança
+
+MAX_ENVELOPE_POINTS = 10_000
+
+class ProjectileEnvelopeParams(BaseSimulationParams):
+    initial_velocity: float = Field(..., gt=0, description="Velocidade de lançamento.")
+    initial_velocity_unit: ALLOWED_VELOCITY_UNITS = Field("m/s", description="Unidade da velocidade de lançamento.")
+    initial_height: float = Field(0.0, ge=0, description="Altura do ponto de lançamento.")
+    initial_height_unit: ALLOWED_LENGTH_UNITS = Field("m", description="Unidade da altura de lançamento.")
+    gravity: float = Field(9.81, gt=0, description="Aceleração da gravidade (m/s^2).")
+    min_angle: float = Field(0.0, ge=0, lt=90, description="Menor ângulo da grade, em graus.")
+    max_angle: float = Field(90.0, gt=0, le=90, description="Maior ângulo da grade, em graus.")
+    angle_points: int = Field(181, ge=2, le=MAX_ENVELOPE_POINTS, description="Número de ângulos, igualmente espaçados entre min_angle e max_angle.")
+    envelope_points: int = Field(200, ge=2, le=MAX_ENVELOPE_POINTS, description="Número de pontos da parábola de segurança.")
+    output_units: OutputUnitSelection = Field(default_factory=OutputUnitSelection, description="Unidades de alcance, altura e tempo das curvas.")
+
+    @model_validator(mode='after')
+    def check_angle_interval(self) -> 'ProjectileEnvelopeParams':
+        if self.min_angle >= self.max_angle:
+            raise ValueError("'min_angle' deve ser menor que 'max_angle'.")
+        return self
+
+class ProjectileEnvelopeResult(BaseSimulationResult):
+    launch_angles: List[float] = Field(..., description="Grade de ângulos (graus).")
+    ranges: List[float] = Field(..., description="Alcance para cada ângulo da grade.")
+    max_heights: List[float] = Field(..., description="Altura máxima para cada ângulo da grade.")
+    flight_times: List[float] = Field(..., description="Tempo de voo para cada ângulo da grade.")
+    optimal_angle: float = Field(..., description="Ângulo de alcance máximo (45° apenas com lançamento do solo).")
+    max_range: float = Field(..., description="Alcance máximo, obtido no ângulo ótimo.")
+    envelope_x: List[float] = Field(..., description="Abscissas da parábola de segurança, de 0 ao alcance máximo.")
+    envelope_y: List[float] = Field(..., description="Ordenadas da parábola de segurança: nenhuma trajetória com essa velocidade passa acima dela.")
+    range_unit: str
+    height_unit: str
+    time_unit: str
@@ -0,0 +1,72 @@
+from typing import Annotated, List, Literal, Optional, Union
+from pydantic import BaseModel, Field
+from backend.simulations.base_simulation import BaseSimulationParams, BaseSimulationResult
+
+MAX_SCENE_PROJECTILES = 2_000
+MAX_SCENE_OBSTACLES = 10_000
+
+
+class SceneProjectile(BaseModel):
+    label: Optional[str] = Field(None, description="Identificação opcional, devolvida no resultado.")
+    initial_velocity: float = Field(..., gt=0, description="Velocidade de lançamento (m/s).")
+    launch_angle: float = Field(..., ge=-180, le=180, description="Ângulo em graus a partir do eixo x positivo (negativo aponta para baixo, acima de 90° para a esquerda).")
+    x0: float = Field(0.0, description="Posição horizontal inicial (m).")
+    y0: float = Field(0.0, ge=0, description="Altura inicial (m).")
+
+
+class RectangleObstacle(BaseModel):
+    kind: Literal["rectangle"]
+    x: float = Field(..., description="Canto inferior esquerdo, x (m).")
+    y: float = Field(..., description="Canto inferior esquerdo, y (m).")
+    width: float = Field(..., gt=0, description="Largura (m).")
+    height: float = Field(..., gt=0, description="Altura (m).")
+
+
+class SegmentObstacle(BaseModel):
+    kind: Literal["segment"]
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+
+
+SceneObstacle = Annotated[Union[RectangleObstacle, SegmentObstacle], Field(discriminator="kind")]
+
+
+class ProjectileSceneParams(BaseSimulationParams):
+    projectiles: List[SceneProjectile] = Field(..., min_length=1, max_length=MAX_SCENE_PROJECTILES, description="Lançamentos da cena (sem arrasto).")
+    obstacles: List[SceneObstacle] = Field(
+        default_factory=list, max_length=MAX_SCENE_OBSTACLES,
+        description="Obstáculos estáticos: retângulos ou segmentos (ex: trechos de terreno). Todas as coordenadas em metros.",
+    )
+    gravity: float = Field(9.81, gt=0, description="Aceleração da gravidade (m/s^2).")
+    ground: bool = Field(True, description="Se o solo plano em y = 0 encerra o voo.")
+    max_time: float = Field(60.0, gt=0, le=3600, description="Duração máxima de cada voo (s), usada quando nada é atingido.")
+    include_trajectories: bool = Field(True, description="Se cada projétil deve trazer sua trajetória até o impacto.")
+    trajectory_points: int = Field(50, ge=2, le=1000, description="Pontos por trajetória, igualmente espaçados no tempo.")
+    grid_cell_size: Optional[float] = Field(None, gt=0, description="Tamanho (m) da célula da grade de colisão. Padrão: extensão média dos obstáculos.")
+
+
+class ScenePoint(BaseModel):
+    time: float
+    x: float
+    y: float
+
+
+class SceneProjectileResult(BaseModel):
+    label: Optional[str] = None
+    outcome: Literal["obstacle", "ground", "none"] = Field(..., description="O que encerrou o voo ('none': atingiu max_time).")
+    obstacle_index: Optional[int] = Field(None, description="Índice do obstáculo atingido em 'obstacles'.")
+    impact_time: float
+    impact_x: float
+    impact_y: float
+    impact_velocity_x: float
+    impact_velocity_y: float
+    trajectory: Optional[List[ScenePoint]] = None
+
+
+class ProjectileSceneResult(BaseSimulationResult):
+    projectiles: List[SceneProjectileResult]
+    obstacle_hits: List[int] = Field(..., description="Número de projéteis que atingiram cada obstáculo.")
+    narrow_phase_tests: int = Field(..., description="Testes parábola–segmento feitos após a fase larga (todos os pares seriam projéteis × segmentos).")
+    grid_cell_size: float = Field(..., description="Tamanho da célula da grade usada (m).")
@@ -0,0 +1,74 @@
+"""
+Funções de apoio aos conjuntos de Monte Carlo do lançamento oblíquo:
+sorteio dos parâmetros incertos, voo sem arrasto em colunas (um valor por
+lançamento sorteado) e estatísticas resumidas (percentis e histograma).
+"""
+import math
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .models_projectile import ParameterDistribution
+
+
+def sample_parameter(rng: random.Random, nominal: float, distribution: Optional[ParameterDistribution], count: int) -> List[float]:
+    """Sorteia `count` valores em torno de `nominal`; sem distribuição, repete o valor nominal."""
+    if distribution is None:
+        return [nominal] * count
+    if distribution.kind == "normal":
+        return [rng.gauss(nominal, distribution.std) for _ in range(count)]
+    low, high = nominal - distribution.half_width, nominal + distribution.half_width
+    return [rng.uniform(low, high) for _ in range(count)]
+
+
+def clip_values(values: List[float], low: float, high: float) -> int:
+    """Limita os valores a [low, high] no próprio lugar e retorna quantos foram ajustados."""
+    clipped = 0
+    for i, value in enumerate(values):
+        if value < low or value > high:
+            values[i] = min(max(value, low), high)
+            clipped += 1
+    return clipped
+
+
+def vacuum_flight_columns(v0x: Sequence[float], v0y: Sequence[float], y0: Sequence[float],
+                          g: float) -> Tuple[List[float], List[float], List[float]]:
+    """Tempo de voo, alcance e altura máxima (SI) de cada lançamento sem arrasto."""
+    total_times = [(vy + math.sqrt(vy * vy + 2 * g * h)) / g for vy, h in zip(v0y, y0)]
+    ranges = [vx * t for vx, t in zip(v0x, total_times)]
+    heights = [h + (vy * vy / (2 * g) if vy > 0 else 0.0) for vy, h in zip(v0y, y0)]
+    return total_times, ranges, heights
+
+
+def percentile(sorted_values: Sequence[float], p: float) -> float:
+    """Percentil `p` (0–100) com interpolação linear entre as amostras ordenadas."""
+    position = (len(sorted_values) - 1) * p / 100
+    lower = int(math.floor(position))
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(values: Sequence[float], percentiles: Sequence[float], digits: int = 3) -> Dict[str, object]:
+    sorted_values = sorted(values)
+    mean = sum(sorted_values) / len(sorted_values)
+    variance = sum((value - mean) ** 2 for value in sorted_values) / len(sorted_values)
+    return {
+        "mean": round(mean, digits),
+        "std": round(math.sqrt(variance), digits),
+        "min": round(sorted_values[0], digits),
+        "max": round(sorted_values[-1], digits),
+        "percentiles": {f"p{p:g}": round(percentile(sorted_values, p), digits) for p in percentiles},
+    }
+
+
+def histogram(values: Sequence[float], bins: int, digits: int = 3) -> Tuple[List[float], List[int]]:
+    """Histograma com `bins` classes de mesma largura entre o menor e o maior valor."""
+    low, high = min(values), max(values)
+    if high - low < 1e-12:
+        # Todos iguais: uma classe de largura unitária centrada no valor.
+        low, high = low - 0.5, high + 0.5
+    width = (high - low) / bins
+    counts = [0] * bins
+    for value in values:
+        counts[min(int((value - low) / width), bins - 1)] += 1
+    edges = [round(low + width * i, digits) for i in range(bins + 1)]
+    return edges, counts
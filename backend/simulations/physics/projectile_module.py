@@ -1,8 +1,16 @@
 import math
-from typing import List, Optional, Type # Removed Any, Dict as they are not explicitly used after changes
+import random
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Type
+from fastapi import HTTPException
 # BaseModel is not directly used, Type is sufficient for parameter_schema
-from backend.simulations.base_simulation import SimulationModule # BaseSimulationParams not strictly needed here
-from .models_projectile import ProjectileLaunchParams, TrajectoryPoint, ProjectileLaunchResult, OutputUnitSelection
+from backend.simulations.base_simulation import SimulationModule, SimulationOperation, iter_result_events # BaseSimulationParams not strictly needed here
+from .models_projectile import (
+    ProjectileLaunchParams, TrajectoryPoint, ProjectileLaunchResult, OutputUnitSelection, ProjectileUnitView,
+    ProjectileQueryParams, ProjectileQueryResult, ProjectileState,
+    ProjectileAimParams, ProjectileAimResult, AimSolution,
+    ProjectileEnsembleParams, ProjectileEnsembleResult, EnsembleStatistics, LandingHistogram,
+    ProjectileEnvelopeParams, ProjectileEnvelopeResult,
+)
 from .unit_conversion import (
     convert_velocity_to_base,
     convert_length_to_base,
@@ -10,6 +18,20 @@ from .unit_conversion import (
     convert_length_from_base,
     convert_time_from_base
 )
+from backend.simulations.unit_registry import conversion_factor, convert_values
+from .trajectory_engine import (
+    MAX_TRAJECTORY_POINTS, TrajectoryColumns, iter_trajectory_chunks_si, scale_and_round,
+    tolerance_time_grid, tolerance_time_step, trajectory_time_grid,
+)
+from .drag_integrator import integrate_drag_batch
+from .terrain_profile import TerrainIndex
+from .projectile_ensemble import clip_values, histogram, sample_parameter, summarize, vacuum_flight_columns
+
+# Pontos calculados por vez ao transmitir a trajetória (stream_simulation).
+STREAM_CHUNK_POINTS = 256
+
+# Lançamentos com arrasto são integrados um a um (~1 ms cada); o conjunto é limitado a menos sorteios.
+MAX_DRAG_ENSEMBLE_SAMPLES = 10_000
 
 class ProjectileModule(SimulationModule):
 
@@ -31,6 +53,26 @@ class ProjectileModule(SimulationModule):
     def get_result_schema(self) -> Type[ProjectileLaunchResult]:
         return ProjectileLaunchResult
 
+    def get_operations(self) -> Dict[str, SimulationOperation]:
+        return {
+            "query": SimulationOperation(
+                ProjectileQueryParams, self.query_state,
+                "Estado do projétil (posição e velocidade) em instantes ou posições horizontais dadas, e no impacto.",
+            ),
+            "aim": SimulationOperation(
+                ProjectileAimParams, self.solve_aim,
+                "Ângulos (arco baixo/alto) para atingir um alvo com uma velocidade dada, e a velocidade mínima.",
+            ),
+            "ensemble": SimulationOperation(
+                ProjectileEnsembleParams, self.run_ensemble,
+                "Conjunto de Monte Carlo com incerteza na velocidade, no ângulo e na altura: percentis e histograma de pontos de queda.",
+            ),
+            "envelope": SimulationOperation(
+                ProjectileEnvelopeParams, self.compute_envelope,
+                "Curvas de alcance, altura máxima e tempo de voo em função do ângulo, e a parábola de segurança.",
+            ),
+        }
+
     def run_simulation(self, params: ProjectileLaunchParams) -> ProjectileLaunchResult:
         # Logic moved from perform_projectile_launch_simulation in main.py
 
@@ -51,6 +93,72 @@ class ProjectileModule(SimulationModule):
         # The problem description mentions "Lançamento Oblíquo", so `gt=0` might be more appropriate for launch_angle if strictly oblique.
         # The model has `ge=0` allowing horizontal launch. We'll stick to model validation.
 
+        launch_si = self._solve_launch(params)
+        unit_sets = params.output_unit_sets()
+
+        # A trajetória em SI é calculada uma vez; cada conjunto de unidades só reescala x e y.
+        columns_si = self._trajectory_si(params, launch_si)
+        time_column = scale_and_round(columns_si.time, 1.0)
+        trajectories = [self._scale_trajectory(columns_si, output_units, time_column) for output_units in unit_sets]
+        trajectory = trajectories[0]
+        # Os objetos de saída só são criados aqui, a partir das colunas já convertidas.
+        final_trajectory_points: List[TrajectoryPoint] = [
+            TrajectoryPoint(time=t, x=x, y=y) for t, x, y in zip(trajectory.time, trajectory.x, trajectory.y)
+        ]
+
+        unit_views = None
+        if isinstance(params.output_units, list):
+            unit_views = [
+                ProjectileUnitView(**self._summary_fields(launch_si, output_units), x=columns.x, y=columns.y)
+                for output_units, columns in zip(unit_sets, trajectories)
+            ]
+
+        return ProjectileLaunchResult(
+            **self._summary_fields(launch_si, unit_sets[0]),
+            trajectory=final_trajectory_points,
+            unit_views=unit_views,
+            parameters_used=params
+        )
+
+    def stream_simulation(self, params: ProjectileLaunchParams) -> Iterator[Dict[str, Any]]:
+        if isinstance(params.output_units, list):
+            # As visões por unidade trazem colunas inteiras no resumo; não há ganho em calcular por partes.
+            yield from iter_result_events(self.run_simulation(params))
+            return
+
+        # O resumo (analítico ou integrado) sai antes da trajetória.
+        launch_si = self._solve_launch(params)
+        output_units = params.output_unit_sets()[0]
+        # Validado antes do primeiro evento: depois dele a resposta já saiu com status 200.
+        self._check_trajectory_size(params, launch_si)
+
+        summary = self._summary_fields(launch_si, output_units)
+        summary["parameters_used"] = params.model_dump(mode="json")
+        yield {"event": "summary", "series": ["trajectory"], "data": summary}
+        # Só a grade de tempo é montada inteira; x e y são calculados e convertidos por bloco.
+        for chunk_si in self._iter_trajectory_si(params, launch_si, STREAM_CHUNK_POINTS):
+            chunk = self._scale_trajectory(chunk_si, output_units)
+            for t, x, y in zip(chunk.time, chunk.x, chunk.y):
+                yield {"event": "point", "series": "trajectory", "data": {"time": t, "x": x, "y": y}}
+
+    def _solve_launch(self, params: ProjectileLaunchParams) -> Dict[str, Any]:
+        launch_si = self._solve_launch_si(params)
+        if params.drag_model == "none":
+            return launch_si
+
+        # Com arrasto não há solução fechada: integra numericamente e substitui tempo, alcance e altura.
+        solution = integrate_drag_batch(
+            [(0.0, launch_si["y0"], launch_si["v0x"], launch_si["v0y"])], launch_si["g"],
+            params.drag_model, params.drag_coefficient, params.wind_velocity, keep_dense=True,
+        )
+        flight = solution.flights[0]
+        return {
+            **launch_si,
+            "total_time": flight.impact_time, "max_height": flight.apex_height, "max_range": flight.impact_x,
+            "apex_time": flight.apex_time, "max_acceleration": flight.max_acceleration, "drag_solution": solution,
+        }
+
+    def _solve_launch_si(self, params: ProjectileLaunchParams) -> Dict[str, float]:
         # Input conversion to SI units
         # Gravity is assumed to be in m/s^2 as per model description.
         g_si = params.gravity if params.gravity is not None else 9.81 # Default if not provided
@@ -83,108 +191,314 @@ class ProjectileModule(SimulationModule):
 
         if total_t_si < 0: total_t_si = 0.0 # Ensure non-negative time
 
-        max_r_si = v0x_si * total_t_si
-
-        trajectory_points_si: List[TrajectoryPoint] = []
-        time_step_si = 0.05 # Default time_step for SI calculations
-        current_time_si = 0.0
-
-        min_desired_points = 20
-        max_points_limit = 2000
-
-        if total_t_si > 1e-5: # Effectively non-zero flight time
-            if (total_t_si / time_step_si) < min_desired_points:
-                time_step_si = total_t_si / min_desired_points
-
-            if (total_t_si / time_step_si) > max_points_limit:
-                time_step_si = total_t_si / max_points_limit
-        # The case for total_t_si <= 1e-6 (effectively zero flight time) is handled later by appending one point.
-        # No special 'elif' needed here for adaptive time step, as it's guarded by total_t_si > 1e-5.
-
-        if total_t_si > 1e-6: # Generate trajectory if there's significant flight time
-            while current_time_si <= total_t_si + 1e-9: # Add epsilon for last point
-                x_si = v0x_si * current_time_si
-                y_si = y0_si + v0y_si * current_time_si - 0.5 * g_si * current_time_si**2
-
-                if y_si < 0: y_si = 0.0 # Object cannot go below ground
-
-                # Store SI points temporarily
-                trajectory_points_si.append(TrajectoryPoint(time=current_time_si, x=x_si, y=y_si))
-
-                if y_si == 0.0 and current_time_si > 1e-6 and abs(current_time_si - total_t_si) > 1e-9 :
-                    # If it hits ground before calculated total_t_si (e.g. due to time step choice)
-                    # and it's not already the last point, break early.
-                    # This ensures trajectory stops when it hits ground.
-                    total_t_si = current_time_si # Adjust total_t_si to actual impact time
-                    break
-
-                if current_time_si > total_t_si and abs(current_time_si - total_t_si) > 1e-9 :
-                    break
-
-                current_time_si += time_step_si
-                if time_step_si < 1e-9 : # Avoid infinite loop if time_step becomes zero
-                    if len(trajectory_points_si) >= min_desired_points: break
-                    else: break # Pathological case
-
-                if len(trajectory_points_si) > max_points_limit + 10: # Safety break
-                    break
-
-            # Ensure final point at total_t_si (and y_si=0 if applicable) is captured
-            if not trajectory_points_si or abs(trajectory_points_si[-1].time - total_t_si) > 1e-4 :
-                x_final_si = v0x_si * total_t_si
-                y_final_si = y0_si + v0y_si * total_t_si - 0.5 * g_si * total_t_si**2
-                if y_final_si < 0 : y_final_si = 0.0
-                trajectory_points_si.append(TrajectoryPoint(time=total_t_si, x=x_final_si, y=y_final_si))
-            elif trajectory_points_si: # If list is not empty
-                 # Correct y for the last point if it should be at ground
-                 last_point = trajectory_points_si[-1]
-                 if abs(last_point.time - total_t_si) < 1e-4 and last_point.y != 0.0 and y0_si + v0y_si * total_t_si - 0.5 * g_si * total_t_si**2 < 1e-3 :
-                     trajectory_points_si[-1].y = 0.0
-
-
-        else: # No significant flight time or zero flight time
-            # Append a single point representing the initial state (in SI units for now)
-            trajectory_points_si.append(TrajectoryPoint(time=0.0, x=0.0, y=y0_si))
-            if y0_si == 0.0 and abs(v0_si) < 1e-9 : # if started on ground with no velocity
-                max_h_si = 0.0 # Max height is initial height
+        if total_t_si <= 1e-6 and y0_si == 0.0 and abs(v0_si) < 1e-9 : # if started on ground with no velocity
+            max_h_si = 0.0 # Max height is initial height
+
+        launch_si = {
+            "v0x": v0x_si, "v0y": v0y_si, "y0": y0_si, "g": g_si,
+            "total_time": total_t_si, "max_height": max_h_si, "max_range": v0x_si * total_t_si,
+            "apex_time": v0y_si / g_si, "max_acceleration": g_si,
+        }
+        if params.terrain is not None:
+            launch_si.update(self._terrain_impact(self._terrain_index(params), launch_si))
+        return launch_si
+
+    def _terrain_index(self, params: ProjectileLaunchParams) -> TerrainIndex:
+        return TerrainIndex(
+            convert_values(params.terrain.vertex_positions(), params.terrain.unit, "m"),
+            convert_values(params.terrain.heights, params.terrain.unit, "m"),
+        )
 
+    def _terrain_impact(self, terrain: TerrainIndex, launch_si: Dict[str, float]) -> Dict[str, float]:
+        """Tempo, alcance, altura máxima e altura do impacto contra o terreno (substituem os do solo plano)."""
+        v0x, v0y, y0, g = (launch_si[key] for key in ("v0x", "v0y", "y0", "g"))
+        if y0 < terrain.height_at(0.0) - 1e-9:
+            raise HTTPException(status_code=400, detail="A altura inicial fica abaixo do terreno no ponto de lançamento (x = 0).")
+        impact_x = terrain.first_impact_x(y0, v0y / v0x, g / (2 * v0x * v0x))
+        total_time = impact_x / v0x
+        # Um impacto ainda na subida (contra uma encosta) acontece antes do ápice.
+        max_height = launch_si["max_height"] if v0y / g <= total_time else y0 + v0y * total_time - 0.5 * g * total_time ** 2
+        return {
+            "total_time": total_time, "max_range": impact_x, "max_height": max_height,
+            "impact_height": terrain.height_at(impact_x),
+        }
+
+    def _summary_fields(self, launch_si: Dict[str, float], output_units: OutputUnitSelection) -> Dict[str, Any]:
         # Output Conversion
-        output_units = params.output_units if params.output_units is not None else OutputUnitSelection()
-
-        final_v0x = convert_velocity_from_base(v0x_si, output_units.velocity_unit or "m/s")
-        final_v0y = convert_velocity_from_base(v0y_si, output_units.velocity_unit or "m/s")
-        final_total_t = convert_time_from_base(total_t_si, output_units.time_unit or "s")
-        final_max_r = convert_length_from_base(max_r_si, output_units.range_unit or "m")
-        final_max_h = convert_length_from_base(max_h_si, output_units.height_unit or "m")
+        final_v0x = convert_velocity_from_base(launch_si["v0x"], output_units.velocity_unit or "m/s")
+        final_v0y = convert_velocity_from_base(launch_si["v0y"], output_units.velocity_unit or "m/s")
+        final_total_t = convert_time_from_base(launch_si["total_time"], output_units.time_unit or "s")
+        final_max_r = convert_length_from_base(launch_si["max_range"], output_units.range_unit or "m")
+        final_max_h = convert_length_from_base(launch_si["max_height"], output_units.height_unit or "m")
+
+        return {
+            "initial_velocity_x": round(final_v0x, 3),
+            "initial_velocity_y": round(final_v0y, 3),
+            "total_time": round(final_total_t, 3),
+            "max_range": round(final_max_r, 3),
+            "max_height": round(final_max_h, 3),
+
+            "initial_velocity_x_unit": output_units.velocity_unit or "m/s",
+            "initial_velocity_y_unit": output_units.velocity_unit or "m/s",
+            "total_time_unit": output_units.time_unit or "s",
+            "max_range_unit": output_units.range_unit or "m",
+            "max_height_unit": output_units.height_unit or "m",
+        }
+
+    def _check_trajectory_size(self, params: ProjectileLaunchParams, launch_si: Dict[str, Any]) -> None:
+        if params.trajectory_tolerance is None:
+            return
+        # Um ponto por passo mais o ápice e o impacto.
+        expected_points = launch_si["total_time"] / tolerance_time_step(launch_si["max_acceleration"], params.trajectory_tolerance) + 3
+        if expected_points > MAX_TRAJECTORY_POINTS:
+            raise HTTPException(status_code=400, detail=f"A tolerância pedida gera cerca de {int(expected_points)} pontos e excede o limite de {MAX_TRAJECTORY_POINTS}. Aumente a tolerância.")
+
+    def _trajectory_si(self, params: ProjectileLaunchParams, launch_si: Dict[str, Any]) -> TrajectoryColumns:
+        return next(self._iter_trajectory_si(params, launch_si))
+
+    def _iter_trajectory_si(self, params: ProjectileLaunchParams, launch_si: Dict[str, Any],
+                            chunk_points: Optional[int] = None) -> Iterator[TrajectoryColumns]:
+        """Trajetória em SI em blocos de até `chunk_points` pontos (um único bloco sem `chunk_points`)."""
+        self._check_trajectory_size(params, launch_si)
+
+        # No modo por tolerância, o limite de erro usa a maior aceleração do voo (g sem arrasto).
+        if params.trajectory_tolerance is not None:
+            times = tolerance_time_grid(launch_si["total_time"], launch_si["apex_time"], launch_si["max_acceleration"], params.trajectory_tolerance)
+        else:
+            times = trajectory_time_grid(launch_si["total_time"], params.trajectory_points)
+
+        if "drag_solution" not in launch_si:
+            yield from iter_trajectory_chunks_si(
+                launch_si["v0x"], launch_si["v0y"], launch_si["y0"], launch_si["g"], launch_si["total_time"],
+                times, chunk_points, impact_y=launch_si.get("impact_height"),
+            )
+            return
+        # A saída densa do integrador é amostrada na mesma grade de tempo do caso sem arrasto.
+        size = chunk_points or len(times)
+        for start in range(0, len(times), size):
+            yield launch_si["drag_solution"].sample(0, times[start:start + size], snap_impact=start + size >= len(times))
+
+    def _scale_trajectory(self, columns_si: TrajectoryColumns, output_units: OutputUnitSelection,
+                          time_column: Optional[List[float]] = None) -> TrajectoryColumns:
+        # Time is always in seconds for trajectory points as per model spec
+        return TrajectoryColumns(
+            time_column if time_column is not None else scale_and_round(columns_si.time, 1.0),
+            scale_and_round(columns_si.x, conversion_factor("m", output_units.range_unit or "m")),
+            scale_and_round(columns_si.y, conversion_factor("m", output_units.height_unit or "m")),
+        )
 
-        final_trajectory_points: List[TrajectoryPoint] = []
-        for point_si in trajectory_points_si:
-            # Time is always in seconds for trajectory points as per model spec
-            time_val = round(point_si.time, 3)
-            x_val = round(convert_length_from_base(point_si.x, output_units.range_unit or "m"), 3)
-            y_val = round(convert_length_from_base(point_si.y, output_units.height_unit or "m"), 3)
-            final_trajectory_points.append(TrajectoryPoint(time=time_val, x=x_val, y=y_val))
+    # --- Consulta analítica ---
+
+    def query_state(self, params: ProjectileQueryParams) -> ProjectileQueryResult:
+        """
+        Responde perguntas pontuais ("onde está em t=1,3 s", "quando passa por x=40 m",
+        "qual a velocidade no impacto") direto das equações fechadas, sem gerar a trajetória.
+        """
+        if params.drag_model != "none":
+            raise HTTPException(status_code=400, detail="A consulta analítica só está disponível sem arrasto (drag_model='none').")
+        launch_si = self._solve_launch_si(params)
+        output_units = params.output_unit_sets()[0]
+        range_unit = output_units.range_unit or "m"
+        range_factor = conversion_factor("m", range_unit)
+
+        # v0x > 0 sempre (velocidade positiva e ângulo < 90°), então x(t) é invertível.
+        position_times = [x / range_factor / launch_si["v0x"] for x in params.x_positions]
+
+        return ProjectileQueryResult(
+            states_at_times=self._states_at(launch_si, output_units, params.times),
+            states_at_positions=self._states_at(launch_si, output_units, position_times),
+            impact=self._states_at(launch_si, output_units, [launch_si["total_time"]])[0],
+            range_unit=range_unit,
+            height_unit=output_units.height_unit or "m",
+            velocity_unit=output_units.velocity_unit or "m/s",
+            parameters_used=params.model_dump(),
+        )
 
-        # Ensure at least one point in final trajectory if total_t_si was ~0
-        if not final_trajectory_points:
-             x_val = round(convert_length_from_base(0.0, output_units.range_unit or "m"),3)
-             y_val = round(convert_length_from_base(y0_si, output_units.height_unit or "m"),3)
-             final_trajectory_points.append(TrajectoryPoint(time=0.0, x=x_val, y=y_val))
+    def _states_at(self, launch_si: Dict[str, float], output_units: OutputUnitSelection,
+                   times: Sequence[float]) -> List[Optional[ProjectileState]]:
+        v0x, v0y, y0, g, total_time = (launch_si[key] for key in ("v0x", "v0y", "y0", "g", "total_time"))
+        impact_height = launch_si.get("impact_height")
+        range_factor = conversion_factor("m", output_units.range_unit or "m")
+        height_factor = conversion_factor("m", output_units.height_unit or "m")
+        velocity_factor = conversion_factor("m/s", output_units.velocity_unit or "m/s")
+
+        states: List[Optional[ProjectileState]] = []
+        for t in times:
+            if not -1e-9 <= t <= total_time + 1e-9:
+                states.append(None)
+                continue
+            vy = v0y - g * t
+            y = y0 + v0y * t - 0.5 * g * t * t
+            if impact_height is None:
+                y = max(y, 0.0)
+            elif t >= total_time:
+                y = impact_height
+            states.append(ProjectileState(
+                time=round(t, 3),
+                x=round(v0x * t * range_factor, 3),
+                y=round(y * height_factor, 3),
+                velocity_x=round(v0x * velocity_factor, 3),
+                velocity_y=round(vy * velocity_factor, 3),
+                speed=round(math.hypot(v0x, vy) * velocity_factor, 3),
+            ))
+        return states
+
+    # --- Problema inverso ---
+
+    def solve_aim(self, params: ProjectileAimParams) -> ProjectileAimResult:
+        """
+        Resolve analiticamente o lançamento que passa pelo alvo (x, y). Da equação
+        da trajetória, tan θ = (v² ± √(v⁴ − g(g·x² + 2·Δy·v²))) / (g·x), com
+        Δy = y_alvo − y0; a velocidade mínima é v² = g(Δy + √(x² + Δy²)).
+        """
+        g = params.gravity
+        target_x = convert_length_to_base(params.target_x, params.target_unit)
+        delta_y = convert_length_to_base(params.target_y, params.target_unit) - convert_length_to_base(params.initial_height, params.initial_height_unit)
+        velocity_unit = params.output_units.velocity_unit or "m/s"
+
+        min_speed_squared = g * (delta_y + math.hypot(target_x, delta_y))
+        minimum_velocity = self._aim_solution(math.atan2(min_speed_squared, g * target_x), math.sqrt(min_speed_squared), target_x, velocity_unit)
+
+        reachable = True
+        low_arc = high_arc = None
+        if params.initial_velocity is not None:
+            v = convert_velocity_to_base(params.initial_velocity, params.initial_velocity_unit)
+            discriminant = v ** 4 - g * (g * target_x ** 2 + 2 * delta_y * v ** 2)
+            reachable = discriminant >= 0
+            if reachable:
+                root = math.sqrt(discriminant)
+                low_angle = math.atan2(v * v - root, g * target_x)
+                high_angle = math.atan2(v * v + root, g * target_x)
+                # O lançamento aceita 0° <= ângulo < 90°; um arco baixo descendente não é representável.
+                if low_angle >= 0:
+                    low_arc = self._aim_solution(low_angle, v, target_x, velocity_unit)
+                high_arc = self._aim_solution(high_angle, v, target_x, velocity_unit)
+
+        return ProjectileAimResult(
+            reachable=reachable,
+            low_arc=low_arc,
+            high_arc=high_arc,
+            minimum_velocity=minimum_velocity,
+            velocity_unit=velocity_unit,
+            parameters_used=params.model_dump(),
+        )
 
+    def _aim_solution(self, angle_rad: float, speed_si: float, target_x_si: float, velocity_unit: str) -> AimSolution:
+        return AimSolution(
+            launch_angle=round(math.degrees(angle_rad), 4),
+            initial_velocity=round(convert_velocity_from_base(speed_si, velocity_unit), 4),
+            time_to_target=round(target_x_si / (speed_si * math.cos(angle_rad)), 4),
+        )
 
-        return ProjectileLaunchResult(
-            initial_velocity_x=round(final_v0x, 3),
-            initial_velocity_y=round(final_v0y, 3),
-            total_time=round(final_total_t, 3),
-            max_range=round(final_max_r, 3),
-            max_height=round(final_max_h, 3),
-            trajectory=final_trajectory_points,
+    # --- Conjunto de Monte Carlo ---
+
+    def run_ensemble(self, params: ProjectileEnsembleParams) -> ProjectileEnsembleResult:
+        """
+        Sorteia `samples` lançamentos a partir das distribuições dos parâmetros e
+        calcula todos de uma vez (colunas fechadas sem arrasto, integrador em lote
+        com arrasto), devolvendo só as estatísticas em vez das trajetórias.
+        """
+        if params.drag_model != "none" and params.samples > MAX_DRAG_ENSEMBLE_SAMPLES:
+            raise HTTPException(status_code=400, detail=f"Conjuntos com arrasto são limitados a {MAX_DRAG_ENSEMBLE_SAMPLES} sorteios.")
+
+        seed = params.seed if params.seed is not None else random.SystemRandom().randrange(2 ** 32)
+        rng = random.Random(seed)
+        count = params.samples
+        velocities = sample_parameter(rng, params.initial_velocity, params.distributions.get("initial_velocity"), count)
+        angles = sample_parameter(rng, params.launch_angle, params.distributions.get("launch_angle"), count)
+        heights = sample_parameter(rng, params.initial_height or 0.0, params.distributions.get("initial_height"), count)
+        clipped = clip_values(velocities, 1e-9, math.inf) + clip_values(angles, 0.0, 89.999) + clip_values(heights, 0.0, math.inf)
+
+        g = params.gravity if params.gravity is not None else 9.81
+        velocities = convert_values(velocities, params.initial_velocity_unit or "m/s", "m/s")
+        v0x = [v * math.cos(math.radians(a)) for v, a in zip(velocities, angles)]
+        v0y = [v * math.sin(math.radians(a)) for v, a in zip(velocities, angles)]
+        y0 = convert_values(heights, params.initial_height_unit or "m", "m")
+
+        terrain = self._terrain_index(params) if params.terrain is not None else None
+        if terrain is not None:
+            clipped += clip_values(y0, terrain.height_at(0.0), math.inf)
+
+        if params.drag_model == "none":
+            total_times, ranges, max_heights = vacuum_flight_columns(v0x, v0y, y0, g)
+            if terrain is not None:
+                for i in range(count):
+                    impact = self._terrain_impact(terrain, {"v0x": v0x[i], "v0y": v0y[i], "y0": y0[i], "g": g, "max_height": max_heights[i]})
+                    total_times[i], ranges[i], max_heights[i] = impact["total_time"], impact["max_range"], impact["max_height"]
+        else:
+            flights = integrate_drag_batch(
+                list(zip([0.0] * count, y0, v0x, v0y)), g, params.drag_model, params.drag_coefficient, params.wind_velocity,
+            ).flights
+            total_times = [flight.impact_time for flight in flights]
+            ranges = [flight.impact_x for flight in flights]
+            max_heights = [flight.apex_height for flight in flights]
+
+        output_units = params.output_unit_sets()[0]
+        range_unit = output_units.range_unit or "m"
+        height_unit = output_units.height_unit or "m"
+        time_unit = output_units.time_unit or "s"
+        ranges = scale_and_round(ranges, conversion_factor("m", range_unit), digits=6)
+        max_heights = scale_and_round(max_heights, conversion_factor("m", height_unit), digits=6)
+        total_times = scale_and_round(total_times, conversion_factor("s", time_unit), digits=6)
+
+        bin_edges, counts = histogram(ranges, params.histogram_bins)
+        return ProjectileEnsembleResult(
+            samples=count,
+            seed=seed,
+            clipped_samples=clipped,
+            range=EnsembleStatistics(**summarize(ranges, params.percentiles)),
+            max_height=EnsembleStatistics(**summarize(max_heights, params.percentiles)),
+            total_time=EnsembleStatistics(**summarize(total_times, params.percentiles)),
+            landing_histogram=LandingHistogram(bin_edges=bin_edges, counts=counts),
+            range_unit=range_unit,
+            height_unit=height_unit,
+            time_unit=time_unit,
+            parameters_used=params.model_dump(),
+        )
 
-            initial_velocity_x_unit=output_units.velocity_unit or "m/s",
-            initial_velocity_y_unit=output_units.velocity_unit or "m/s",
-            total_time_unit=output_units.time_unit or "s",
-            max_range_unit=output_units.range_unit or "m",
-            max_height_unit=output_units.height_unit or "m",
+    # --- Curvas em função do ângulo ---
+
+    def compute_envelope(self, params: ProjectileEnvelopeParams) -> ProjectileEnvelopeResult:
+        """
+        Alcance, altura máxima e tempo de voo em uma grade de ângulos, em forma
+        fechada. A parábola de segurança y = y0 + v²/2g − g·x²/2v² é a envoltória
+        de todas as trajetórias com velocidade v; ela toca o solo no alcance
+        máximo R = (v/g)·√(v² + 2g·y0), atingido em tan θ* = v/√(v² + 2g·y0).
+        """
+        g = params.gravity
+        v = convert_velocity_to_base(params.initial_velocity, params.initial_velocity_unit)
+        y0 = convert_length_to_base(params.initial_height, params.initial_height_unit)
+
+        angle_step = (params.max_angle - params.min_angle) / (params.angle_points - 1)
+        angles = [params.min_angle + angle_step * i for i in range(params.angle_points - 1)] + [params.max_angle]
+        radians = [math.radians(angle) for angle in angles]
+        flight_times, ranges, max_heights = vacuum_flight_columns(
+            [v * math.cos(a) for a in radians], [v * math.sin(a) for a in radians], [y0] * len(radians), g,
+        )
 
-            parameters_used=params
+        launch_speed = math.sqrt(v * v + 2 * g * y0)
+        max_range = v * launch_speed / g
+        envelope_step = max_range / (params.envelope_points - 1)
+        envelope_x = [envelope_step * i for i in range(params.envelope_points - 1)] + [max_range]
+        envelope_y = [max(y0 + v * v / (2 * g) - g * x * x / (2 * v * v), 0.0) for x in envelope_x]
+        envelope_y[-1] = 0.0
+
+        range_unit = params.output_units.range_unit or "m"
+        height_unit = params.output_units.height_unit or "m"
+        time_unit = params.output_units.time_unit or "s"
+        range_factor = conversion_factor("m", range_unit)
+        height_factor = conversion_factor("m", height_unit)
+        return ProjectileEnvelopeResult(
+            launch_angles=[round(angle, 6) for angle in angles],
+            ranges=scale_and_round(ranges, range_factor),
+            max_heights=scale_and_round(max_heights, height_factor),
+            flight_times=scale_and_round(flight_times, conversion_factor("s", time_unit)),
+            optimal_angle=round(math.degrees(math.atan2(v, launch_speed)), 4),
+            max_range=round(max_range * range_factor, 3),
+            envelope_x=scale_and_round(envelope_x, range_factor),
+            envelope_y=scale_and_round(envelope_y, height_factor),
+            range_unit=range_unit,
+            height_unit=height_unit,
+            time_unit=time_unit,
+            parameters_used=params.model_dump(),
         )
@@ -0,0 +1,109 @@
+import math
+from typing import List, Tuple, Type
+
+from backend.simulations.base_simulation import SimulationModule
+from .models_projectile_scene import (
+    ProjectileSceneParams, ProjectileSceneResult, SceneProjectileResult, ScenePoint,
+    RectangleObstacle, SceneObstacle,
+)
+from .scene_geometry import Launch, Segment, UniformSegmentGrid, first_segment_hit
+from .trajectory_engine import trajectory_time_grid
+
+
+def obstacle_segments(obstacles: List[SceneObstacle]) -> Tuple[List[Segment], List[int]]:
+    """Segmentos de todos os obstáculos (retângulos viram suas 4 arestas) e o obstáculo de origem de cada um."""
+    segments: List[Segment] = []
+    owners: List[int] = []
+    for index, obstacle in enumerate(obstacles):
+        if isinstance(obstacle, RectangleObstacle):
+            x1, y1 = obstacle.x, obstacle.y
+            x2, y2 = x1 + obstacle.width, y1 + obstacle.height
+            edges = [Segment(x1, y1, x2, y1), Segment(x2, y1, x2, y2), Segment(x2, y2, x1, y2), Segment(x1, y2, x1, y1)]
+        else:
+            edges = [Segment(obstacle.x1, obstacle.y1, obstacle.x2, obstacle.y2)]
+        segments.extend(edges)
+        owners.extend([index] * len(edges))
+    return segments, owners
+
+
+class ProjectileSceneModule(SimulationModule):
+
+    def get_name(self) -> str:
+        return "projectile-scene"
+
+    def get_display_name(self) -> str:
+        return "Cena de Lançamentos"
+
+    def get_category(self) -> str:
+        return "Physics"
+
+    def get_description(self) -> str:
+        return "Vários projéteis e obstáculos em uma mesma cena: onde e quando cada projétil colide."
+
+    def get_parameter_schema(self) -> Type[ProjectileSceneParams]:
+        return ProjectileSceneParams
+
+    def get_result_schema(self) -> Type[ProjectileSceneResult]:
+        return ProjectileSceneResult
+
+    def get_execution_cost(self) -> str:
+        # Centenas de projéteis com percurso na grade em Python puro.
+        return "heavy"
+
+    def run_simulation(self, params: ProjectileSceneParams) -> ProjectileSceneResult:
+        """
+        Para cada projétil, o voo termina no primeiro obstáculo atingido, no solo
+        (y = 0, se ativo) ou em max_time. A grade de colisão é montada uma vez por
+        cena e compartilhada por todos os projéteis.
+        """
+        g = params.gravity
+        segments, owners = obstacle_segments(params.obstacles)
+        grid = UniformSegmentGrid(segments, params.grid_cell_size)
+        obstacle_hits = [0] * len(params.obstacles)
+        narrow_phase_tests = 0
+
+        results: List[SceneProjectileResult] = []
+        for projectile in params.projectiles:
+            angle = math.radians(projectile.launch_angle)
+            launch = Launch(projectile.x0, projectile.y0, projectile.initial_velocity * math.cos(angle), projectile.initial_velocity * math.sin(angle), g)
+            if params.ground:
+                t_end = (launch.vy + math.sqrt(launch.vy ** 2 + 2 * g * launch.y0)) / g
+                outcome = "ground"
+            else:
+                t_end = params.max_time
+                outcome = "none"
+
+            hit, tests = first_segment_hit(grid, launch, t_end)
+            narrow_phase_tests += tests
+            obstacle_index = None
+            if hit is not None:
+                t_end, outcome, obstacle_index = hit.time, "obstacle", owners[hit.segment_index]
+                obstacle_hits[obstacle_index] += 1
+
+            x, y = launch.position(t_end)
+            if outcome == "ground":
+                y = 0.0
+            trajectory = None
+            if params.include_trajectories:
+                times = trajectory_time_grid(t_end, params.trajectory_points)
+                trajectory = [ScenePoint(time=round(t, 4), x=round(px, 3), y=round(py, 3)) for t, (px, py) in zip(times, map(launch.position, times))]
+                trajectory[-1] = ScenePoint(time=round(t_end, 4), x=round(x, 3), y=round(y, 3))
+            results.append(SceneProjectileResult(
+                label=projectile.label,
+                outcome=outcome,
+                obstacle_index=obstacle_index,
+                impact_time=round(t_end, 4),
+                impact_x=round(x, 3),
+                impact_y=round(y, 3),
+                impact_velocity_x=round(launch.vx, 3),
+                impact_velocity_y=round(launch.vy - g * t_end, 3),
+                trajectory=trajectory,
+            ))
+
+        return ProjectileSceneResult(
+            projectiles=results,
+            obstacle_hits=obstacle_hits,
+            narrow_phase_tests=narrow_phase_tests,
+            grid_cell_size=round(grid.cell_size, 6),
+            parameters_used=params.model_dump(),
+        )
@@ -0,0 +1,190 @@
+"""
+Geometria de colisão entre trajetórias parabólicas (sem arrasto) e segmentos
+de reta estáticos.
+
+- Fase estreita: a interseção parábola–segmento é resolvida analiticamente
+  (a distância com sinal à reta do segmento é um polinômio de 2º grau em t).
+- Fase larga: os segmentos são indexados em uma grade uniforme; a trajetória é
+  percorrida em trechos de aproximadamente uma célula e só os segmentos das
+  células cobertas pela caixa de cada trecho são testados, uma vez cada.
+"""
+import math
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+# Limite de células por eixo na escolha automática do tamanho da célula.
+MAX_GRID_CELLS_PER_AXIS = 1024
+# Raízes em t <= EVENT_EPSILON_S são ignoradas, para que um lançamento sobre um segmento não colida consigo mesmo.
+EVENT_EPSILON_S = 1e-9
+
+
+class Segment(NamedTuple):
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+
+
+class Launch(NamedTuple):
+    """Estado inicial de um lançamento, em SI: y(t) = y0 + vy·t − g·t²/2."""
+    x0: float
+    y0: float
+    vx: float
+    vy: float
+    g: float
+
+    def position(self, t: float) -> Tuple[float, float]:
+        return self.x0 + self.vx * t, self.y0 + self.vy * t - 0.5 * self.g * t * t
+
+
+class SegmentHit(NamedTuple):
+    time: float
+    segment_index: int
+
+
+def _quadratic_roots(a: float, b: float, c: float) -> List[float]:
+    """Raízes reais de a·t² + b·t + c (forma numericamente estável)."""
+    if abs(a) < 1e-15:
+        return [-c / b] if abs(b) > 1e-15 else []
+    discriminant = b * b - 4 * a * c
+    if discriminant < 0:
+        return []
+    q = -0.5 * (b + math.copysign(math.sqrt(discriminant), b))
+    return [q / a, c / q] if q != 0 else [0.0]
+
+
+def parabola_segment_hit(launch: Launch, segment: Segment, t_max: float) -> Optional[float]:
+    """
+    Primeiro instante em (0, t_max] em que a trajetória cruza o segmento, ou None.
+    Com d = P2 − P1, a reta do segmento é d_x·(y − y1) − d_y·(x − x1) = 0; o
+    parâmetro s = (P − P1)·d / |d|² indica se o cruzamento cai dentro dele.
+    """
+    dx, dy = segment.x2 - segment.x1, segment.y2 - segment.y1
+    length_squared = dx * dx + dy * dy
+    if length_squared == 0:
+        return None
+    rel_x, rel_y = launch.x0 - segment.x1, launch.y0 - segment.y1
+    a = -0.5 * dx * launch.g
+    b = dx * launch.vy - dy * launch.vx
+    c = dx * rel_y - dy * rel_x
+
+    best = None
+    for t in _quadratic_roots(a, b, c):
+        if t <= EVENT_EPSILON_S or t > t_max or (best is not None and t >= best):
+            continue
+        px = rel_x + launch.vx * t
+        py = rel_y + launch.vy * t - 0.5 * launch.g * t * t
+        s = (px * dx + py * dy) / length_squared
+        if -1e-12 <= s <= 1 + 1e-12:
+            best = t
+    return best
+
+
+class UniformSegmentGrid:
+    """
+    Grade uniforme sobre a caixa envolvente dos segmentos; cada célula guarda os
+    índices dos segmentos cuja caixa a intercepta. Sem `cell_size`, usa a
+    extensão média dos segmentos (limitada a MAX_GRID_CELLS_PER_AXIS por eixo).
+    """
+
+    def __init__(self, segments: Sequence[Segment], cell_size: Optional[float] = None):
+        self.segments = list(segments)
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        if not self.segments:
+            self.x_min = self.y_min = self.x_max = self.y_max = 0.0
+            self.cell_size = cell_size or 1.0
+            return
+
+        self.x_min = min(min(s.x1, s.x2) for s in self.segments)
+        self.x_max = max(max(s.x1, s.x2) for s in self.segments)
+        self.y_min = min(min(s.y1, s.y2) for s in self.segments)
+        self.y_max = max(max(s.y1, s.y2) for s in self.segments)
+        if cell_size is None:
+            mean_extent = sum(max(abs(s.x2 - s.x1), abs(s.y2 - s.y1)) for s in self.segments) / len(self.segments)
+            span = max(self.x_max - self.x_min, self.y_max - self.y_min)
+            cell_size = max(mean_extent, span / MAX_GRID_CELLS_PER_AXIS, 1e-9)
+        self.cell_size = cell_size
+
+        for index, s in enumerate(self.segments):
+            (i_lo, i_hi), (j_lo, j_hi) = self._cell_span(min(s.x1, s.x2), max(s.x1, s.x2), min(s.y1, s.y2), max(s.y1, s.y2))
+            for i in range(i_lo, i_hi + 1):
+                for j in range(j_lo, j_hi + 1):
+                    self.cells.setdefault((i, j), []).append(index)
+
+    def _cell_span(self, x_lo: float, x_hi: float, y_lo: float, y_hi: float) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        to_cell = lambda value, origin: int((value - origin) // self.cell_size)
+        return (to_cell(x_lo, self.x_min), to_cell(x_hi, self.x_min)), (to_cell(y_lo, self.y_min), to_cell(y_hi, self.y_min))
+
+    def candidates(self, x_lo: float, x_hi: float, y_lo: float, y_hi: float) -> Iterator[int]:
+        """Índices (possivelmente repetidos) dos segmentos nas células que cobrem a caixa dada."""
+        if not self.cells or x_hi < self.x_min or x_lo > self.x_max or y_hi < self.y_min or y_lo > self.y_max:
+            return
+        (i_lo, i_hi), (j_lo, j_hi) = self._cell_span(
+            max(x_lo, self.x_min), min(x_hi, self.x_max), max(y_lo, self.y_min), min(y_hi, self.y_max),
+        )
+        for i in range(i_lo, i_hi + 1):
+            for j in range(j_lo, j_hi + 1):
+                yield from self.cells.get((i, j), ())
+
+    def entry_time(self, launch: Launch, t: float) -> Optional[float]:
+        """
+        Menor instante >= t em que a trajetória pode estar dentro da caixa da
+        grade (estimativa conservadora), ou None se ela não volta mais à caixa.
+        """
+        for _ in range(4):
+            x, y = launch.position(t)
+            next_t = t
+            if x < self.x_min or x > self.x_max:
+                target = self.x_min if x < self.x_min else self.x_max
+                if (target - x) * launch.vx <= 0:
+                    return None
+                next_t = (target - launch.x0) / launch.vx
+            if y > self.y_max:
+                # Ramo descendente de y(t) = y_max.
+                next_t = max(next_t, (launch.vy + math.sqrt(launch.vy ** 2 + 2 * launch.g * (launch.y0 - self.y_max))) / launch.g)
+            elif y < self.y_min and launch.vy - launch.g * t <= 0:
+                return None
+            if next_t <= t:
+                return t
+            t = next_t
+        return t
+
+
+def first_segment_hit(grid: UniformSegmentGrid, launch: Launch, t_end: float) -> Tuple[Optional[SegmentHit], int]:
+    """
+    Primeira colisão da trajetória com os segmentos da grade em (0, t_end], e
+    quantos segmentos passaram pela fase estreita. Cada segmento encontrado é
+    testado uma única vez no intervalo inteiro; o percurso para assim que o
+    trecho atual passa do melhor instante já encontrado, pois qualquer colisão
+    anterior estaria em uma célula já visitada.
+    """
+    best: Optional[SegmentHit] = None
+    tested = set()
+    # Sem velocidade (no ápice de um lançamento vertical), o trecho é limitado pela queda de uma célula.
+    max_chunk = math.sqrt(2 * grid.cell_size / launch.g)
+    t = 0.0
+    while True:
+        limit = t_end if best is None else min(t_end, best.time)
+        entry = grid.entry_time(launch, t)
+        if entry is None or entry >= limit:
+            break
+        t = entry
+        speed = math.hypot(launch.vx, launch.vy - launch.g * t)
+        t_next = min(t + min(grid.cell_size / speed if speed > 0 else max_chunk, max_chunk), t_end)
+
+        xa, ya = launch.position(t)
+        xb, yb = launch.position(t_next)
+        y_hi = max(ya, yb)
+        apex_time = launch.vy / launch.g
+        if t < apex_time < t_next:
+            y_hi = launch.position(apex_time)[1]
+        for index in grid.candidates(min(xa, xb), max(xa, xb), min(ya, yb), y_hi):
+            if index in tested:
+                continue
+            tested.add(index)
+            hit_time = parabola_segment_hit(launch, grid.segments[index], t_end)
+            if hit_time is not None and (best is None or hit_time < best.time):
+                best = SegmentHit(hit_time, index)
+        if t_next >= t_end:
+            break
+        t = t_next
+    return best, len(tested)
@@ -0,0 +1,105 @@
+"""
+Busca do impacto de uma trajetória parabólica (sem arrasto) em um terreno
+linear por partes.
+
+Escrita em função de x, a trajetória é Y(x) = y0 + s·x − c·x² (s = tan θ,
+c = g / 2vx²), côncava. Em cada segmento do terreno a diferença Y − H é um
+polinômio de 2º grau, resolvido analiticamente. Para não percorrer segmento a
+segmento, o índice guarda a altura máxima do terreno em blocos de
+BLOCK_FANOUT^k segmentos: como Y é côncava, seu mínimo em um intervalo está em
+uma das pontas, e um bloco inteiro pode ser descartado quando esse mínimo fica
+acima do ponto mais alto do bloco.
+"""
+import bisect
+import math
+from typing import List, Optional, Sequence
+
+BLOCK_FANOUT = 16
+
+
+class TerrainIndex:
+    """
+    Terreno com vértices (xs, heights) em SI, xs estritamente crescente. Fora
+    do intervalo dos vértices o terreno continua plano, na altura do vértice
+    da ponta.
+    """
+
+    def __init__(self, xs: Sequence[float], heights: Sequence[float]):
+        self.xs = list(xs)
+        self.heights = list(heights)
+        # levels[k][j]: altura máxima dos vértices dos segmentos j·F^(k+1) até (j+1)·F^(k+1) (inclusive as pontas).
+        self.levels: List[List[float]] = []
+        segment_count = len(self.xs) - 1
+        block_maxima = self.heights
+        size = 1
+        while size * BLOCK_FANOUT < segment_count:
+            size *= BLOCK_FANOUT
+            if size == BLOCK_FANOUT:
+                block_maxima = [max(self.heights[i:i + size + 1]) for i in range(0, segment_count, size)]
+            else:
+                block_maxima = [max(block_maxima[i:i + BLOCK_FANOUT]) for i in range(0, len(block_maxima), BLOCK_FANOUT)]
+            self.levels.append(block_maxima)
+
+    def height_at(self, x: float) -> float:
+        if x <= self.xs[0]:
+            return self.heights[0]
+        if x >= self.xs[-1]:
+            return self.heights[-1]
+        i = bisect.bisect_right(self.xs, x) - 1
+        x1, x2 = self.xs[i], self.xs[i + 1]
+        return self.heights[i] + (self.heights[i + 1] - self.heights[i]) * (x - x1) / (x2 - x1)
+
+    def first_impact_x(self, y0: float, slope: float, curvature: float) -> float:
+        """
+        Menor x >= 0 em que Y(x) = y0 + slope·x − curvature·x² chega ao terreno.
+        Exige Y(0) >= H(0) e curvature > 0 (a trajetória sempre acaba descendo).
+        """
+        trajectory = lambda x: y0 + slope * x - curvature * x * x
+
+        if self.xs[0] > 0:
+            hit = self._segment_hit(y0, slope, curvature, 0.0, self.xs[0], self.heights[0], 0.0)
+            if hit is not None:
+                return hit
+        i = max(bisect.bisect_right(self.xs, 0.0) - 1, 0)
+        segment_count = len(self.xs) - 1
+        while i < segment_count:
+            # Maior bloco alinhado em i que pode ser descartado inteiro.
+            skipped = False
+            for level in range(len(self.levels) - 1, -1, -1):
+                size = BLOCK_FANOUT ** (level + 1)
+                if i % size:
+                    continue
+                end = min(i + size, segment_count)
+                x_start, x_end = max(self.xs[i], 0.0), self.xs[end]
+                if min(trajectory(x_start), trajectory(x_end)) > self.levels[level][i // size]:
+                    i = end
+                    skipped = True
+                    break
+            if skipped:
+                continue
+            x1, x2 = self.xs[i], self.xs[i + 1]
+            h1 = self.heights[i]
+            hit = self._segment_hit(y0, slope, curvature, max(x1, 0.0), x2, h1 + (self.heights[i + 1] - h1) * (max(x1, 0.0) - x1) / (x2 - x1), (self.heights[i + 1] - h1) / (x2 - x1))
+            if hit is not None:
+                return hit
+            i += 1
+        # Além do último vértice, o terreno é plano e a trajetória sempre o atinge.
+        return self._segment_hit(y0, slope, curvature, max(self.xs[-1], 0.0), math.inf, self.heights[-1], 0.0)
+
+    @staticmethod
+    def _segment_hit(y0: float, slope: float, curvature: float, x_lo: float, x_hi: float,
+                     h_lo: float, terrain_slope: float) -> Optional[float]:
+        """
+        Primeiro x em [x_lo, x_hi] com Y(x) <= H(x), sendo H(x) = h_lo + terrain_slope·(x − x_lo).
+        Com u = x − x_lo, D(u) = Y − H = −c·u² + b·u + k é côncava; se D(0) > 0, o impacto é a maior raiz.
+        """
+        k = y0 + slope * x_lo - curvature * x_lo * x_lo - h_lo
+        b = slope - 2 * curvature * x_lo - terrain_slope
+        if k <= 0:
+            # Já no terreno no início do trecho: só segue voando se estiver subindo em relação a ele.
+            if k < 0 or b <= 0:
+                return x_lo
+            return x_lo + b / curvature if x_lo + b / curvature <= x_hi else None
+        root = math.sqrt(b * b + 4 * curvature * k)
+        u = (b + root) / (2 * curvature) if b >= 0 else 2 * k / (root - b)
+        return x_lo + u if x_lo + u <= x_hi else None
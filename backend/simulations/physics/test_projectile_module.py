@@ -1,9 +1,19 @@
 import pytest
 import math
+import random
+from fastapi import HTTPException
+from pydantic import ValidationError
 
 from backend.simulations.physics.projectile_module import ProjectileModule
-from backend.simulations.physics.models_projectile import ProjectileLaunchParams, TrajectoryPoint, OutputUnitSelection
+from backend.simulations.physics.models_projectile import (
+    ProjectileLaunchParams, TrajectoryPoint, OutputUnitSelection,
+    ProjectileQueryParams, ProjectileAimParams, ProjectileEnsembleParams, ProjectileEnvelopeParams, TerrainProfile,
+)
 from backend.simulations.physics import unit_conversion as uc
+from backend.simulations.physics.terrain_profile import TerrainIndex
+from backend.simulations.physics.trajectory_engine import (
+    compute_trajectory_si, iter_trajectory_chunks_si, scale_and_round, trajectory_time_grid,
+)
 
 # Instantiate the module once for all tests
 module = ProjectileModule()
@@ -386,3 +396,342 @@ def test_input_validation_original(): # Renamed to avoid conflict if parts were
         ProjectileLaunchParams(initial_velocity=10, launch_angle=45, initial_height=0, gravity=0)
     with pytest.raises(ValueError, match="Input should be greater than 0"):
         ProjectileLaunchParams(initial_velocity=10, launch_angle=45, initial_height=0, gravity=-9.81)
+
+# Modo de alta resolução: número exato de pontos pedido pelo cliente
+def test_high_resolution_trajectory_points():
+    params = ProjectileLaunchParams(
+        initial_velocity=10, launch_angle=45, initial_height=0, gravity=9.81,
+        output_units=SI_OUTPUT_UNITS, trajectory_points=100_000
+    )
+    result = module.run_simulation(params)
+    assert len(result.trajectory) == 100_000
+    assert result.trajectory[0].time == 0.0
+    assert math.isclose(result.trajectory[-1].time, result.total_time, abs_tol=1e-3)
+    assert result.trajectory[-1].y == 0.0
+    assert math.isclose(result.trajectory[-1].x, result.max_range, rel_tol=1e-3)
+    assert all(point.y >= 0 for point in result.trajectory)
+
+def test_trajectory_points_limit():
+    with pytest.raises(ValueError, match="less than or equal to 100000"):
+        ProjectileLaunchParams(initial_velocity=10, launch_angle=45, trajectory_points=100_001)
+
+def test_trajectory_engine_unit_scaling_matches_scalar_conversion():
+    columns = compute_trajectory_si(v0x=7.0, v0y=7.0, y0=3.0, g=9.81, total_time=1.7676)
+    factor = uc.convert_length_from_base(1.0, "ft")
+    assert scale_and_round(columns.x, factor) == [round(uc.convert_length_from_base(x, "ft"), 3) for x in columns.x]
+
+@pytest.mark.parametrize("v0x, v0y, y0, total_time, impact_y", [
+    (7.0, 7.0, 3.0, 1.7676, None),
+    (10.0, 10.0, 0.0, 2.0387, None),
+    (10.0, 10.0, 0.0, 2.2, None), # grade além do impacto: termina no primeiro ponto no solo
+    (8.0, 3.0, 5.0, 1.1, 1.5),
+])
+def test_trajectory_chunks_match_single_pass(v0x, v0y, y0, total_time, impact_y):
+    times = trajectory_time_grid(total_time, 1001)
+    whole = compute_trajectory_si(v0x, v0y, y0, 9.81, total_time, points=1001, impact_y=impact_y)
+    chunks = list(iter_trajectory_chunks_si(v0x, v0y, y0, 9.81, total_time, times, chunk_size=64, impact_y=impact_y))
+    assert max(len(chunk.time) for chunk in chunks) <= 64
+    assert [value for chunk in chunks for value in chunk.time] == whole.time
+    assert [value for chunk in chunks for value in chunk.y] == whole.y
+
+def test_drag_stream_matches_regular_result_across_chunks():
+    params = ProjectileLaunchParams(initial_velocity=40, launch_angle=50, drag_model="quadratic", drag_coefficient=0.005, trajectory_points=1000)
+    points = [event["data"] for event in module.stream_simulation(params) if event["event"] == "point"]
+    assert points == [point.model_dump() for point in module.run_simulation(params).trajectory]
+    assert points[-1]["y"] == 0.0
+
+# Amostragem por tolerância: a poligonal fica a no máximo `trajectory_tolerance` da parábola
+@pytest.mark.parametrize("velocity, angle, height", [(20, 45, 0), (50, 60, 0), (5, 0, 10)])
+def test_tolerance_sampling_bounds_chart_error(velocity, angle, height):
+    tolerance = 0.01
+    params = ProjectileLaunchParams(
+        initial_velocity=velocity, launch_angle=angle, initial_height=height,
+        output_units=SI_OUTPUT_UNITS, trajectory_tolerance=tolerance
+    )
+    result = module.run_simulation(params)
+    default_result = module.run_simulation(params.model_copy(update={"trajectory_tolerance": None}))
+    assert len(result.trajectory) < len(default_result.trajectory)
+
+    v0x = velocity * math.cos(math.radians(angle))
+    v0y = velocity * math.sin(math.radians(angle))
+    for start, end in zip(result.trajectory, result.trajectory[1:]):
+        for k in range(1, 10):
+            x = start.x + (end.x - start.x) * k / 10
+            y = start.y + (end.y - start.y) * k / 10
+            t = x / v0x
+            assert abs(y - (height + v0y * t - 0.5 * 9.81 * t * t)) <= tolerance + 2e-3 # + arredondamento a 3 casas
+
+    assert max(point.y for point in result.trajectory) == result.max_height # ápice incluído
+    assert result.trajectory[-1].y == 0.0
+    assert result.trajectory[-1].x == result.max_range
+
+def test_tolerance_sampling_validation():
+    with pytest.raises(ValueError, match="trajectory_tolerance"):
+        ProjectileLaunchParams(initial_velocity=10, launch_angle=45, trajectory_points=100, trajectory_tolerance=0.01)
+    with pytest.raises(HTTPException) as exc_info:
+        module.run_simulation(ProjectileLaunchParams(initial_velocity=100, launch_angle=45, trajectory_tolerance=1e-9))
+    assert exc_info.value.status_code == 400
+
+# Consulta analítica (operação 'query')
+def test_query_state_matches_trajectory():
+    launch = dict(initial_velocity=20, launch_angle=45, initial_height=3, output_units=SI_OUTPUT_UNITS, trajectory_points=101)
+    trajectory = module.run_simulation(ProjectileLaunchParams(**launch)).trajectory
+    query_params = ProjectileQueryParams(**{**launch, "trajectory_points": None}, times=[p.time for p in trajectory[:-1]])
+    result = module.query_state(query_params)
+    # Os instantes da trajetória vêm arredondados a 1 ms: até ~0,01 m de diferença a 20 m/s.
+    for point, state in zip(trajectory, result.states_at_times):
+        assert math.isclose(state.x, point.x, abs_tol=1e-2)
+        assert math.isclose(state.y, point.y, abs_tol=1e-2)
+
+def test_query_state_positions_impact_and_units():
+    params = ProjectileQueryParams(
+        initial_velocity=20, launch_angle=45, output_units=OutputUnitSelection(range_unit="ft", velocity_unit="km/h"),
+        times=[-1.0, 100.0], x_positions=[uc.convert_length_from_base(20.0, "ft"), 1e6],
+    )
+    result = module.query_state(params)
+    assert result.states_at_times == [None, None]
+    reached, missed = result.states_at_positions
+    assert missed is None
+    assert math.isclose(reached.time, 20.0 / (20 * math.cos(math.radians(45))), abs_tol=1e-3)
+    assert result.range_unit == "ft" and result.velocity_unit == "km/h"
+    # Lançamento do solo: no impacto a velocidade tem o mesmo módulo da inicial.
+    assert result.impact.y == 0.0
+    assert math.isclose(result.impact.speed, uc.convert_velocity_from_base(20, "km/h"), abs_tol=1e-3)
+    assert math.isclose(result.impact.velocity_y, -result.impact.velocity_x, abs_tol=1e-3)
+
+# Problema inverso (operação 'aim')
+def test_aim_solutions_hit_the_target():
+    result = module.solve_aim(ProjectileAimParams(target_x=30, target_y=5, initial_velocity=25, initial_height=1))
+    assert result.reachable
+    assert result.low_arc.launch_angle < result.minimum_velocity.launch_angle < result.high_arc.launch_angle
+    assert result.minimum_velocity.initial_velocity < 25
+    for solution in (result.low_arc, result.high_arc, result.minimum_velocity):
+        state = module.query_state(ProjectileQueryParams(
+            initial_velocity=solution.initial_velocity, launch_angle=solution.launch_angle, initial_height=1, x_positions=[30],
+        )).states_at_positions[0]
+        assert math.isclose(state.y, 5.0, abs_tol=2e-3)
+        assert math.isclose(state.time, solution.time_to_target, abs_tol=2e-3)
+
+def test_aim_ground_target_matches_range_formula():
+    # Alcance máximo v²/g a 45°: a velocidade mínima para atingi-lo é exatamente v.
+    result = module.solve_aim(ProjectileAimParams(target_x=20.0 ** 2 / 9.81, initial_velocity=20))
+    assert math.isclose(result.minimum_velocity.launch_angle, 45.0, abs_tol=1e-3)
+    assert math.isclose(result.minimum_velocity.initial_velocity, 20.0, abs_tol=1e-3)
+    assert math.isclose(result.low_arc.launch_angle, 45.0, abs_tol=0.1)
+
+def test_aim_unreachable_and_descending_low_arc():
+    unreachable = module.solve_aim(ProjectileAimParams(target_x=300, initial_velocity=10, output_units=OutputUnitSelection(velocity_unit="km/h")))
+    assert not unreachable.reachable
+    assert unreachable.low_arc is None and unreachable.high_arc is None
+    assert unreachable.velocity_unit == "km/h"
+    assert unreachable.minimum_velocity.initial_velocity > uc.convert_velocity_from_base(10, "km/h")
+    # De um ponto alto, o alvo próximo no solo exigiria um arco baixo com ângulo negativo.
+    from_cliff = module.solve_aim(ProjectileAimParams(target_x=5, initial_height=50, initial_velocity=20))
+    assert from_cliff.reachable and from_cliff.low_arc is None and from_cliff.high_arc is not None
+
+# Modo com arrasto (integração numérica)
+def test_drag_with_zero_coefficient_matches_vacuum_solution():
+    launch = dict(initial_velocity=30, launch_angle=40, initial_height=2, output_units=SI_OUTPUT_UNITS)
+    vacuum = module.run_simulation(ProjectileLaunchParams(**launch))
+    integrated = module.run_simulation(ProjectileLaunchParams(**launch, drag_model="linear", drag_coefficient=0.0))
+    assert integrated.total_time == vacuum.total_time
+    assert integrated.max_range == vacuum.max_range
+    assert math.isclose(integrated.max_height, vacuum.max_height, abs_tol=1e-3)
+    assert len(integrated.trajectory) == len(vacuum.trajectory)
+    for a, b in zip(integrated.trajectory, vacuum.trajectory):
+        assert math.isclose(a.x, b.x, abs_tol=1e-3) and math.isclose(a.y, b.y, abs_tol=1e-3)
+
+def test_linear_drag_matches_closed_form():
+    k, wind, g = 0.3, -2.0, 9.81
+    params = ProjectileLaunchParams(
+        initial_velocity=20, launch_angle=45, initial_height=2, output_units=SI_OUTPUT_UNITS,
+        drag_model="linear", drag_coefficient=k, wind_velocity=wind,
+    )
+    result = module.run_simulation(params)
+    v0 = 20 * math.cos(math.radians(45))
+    # 'time' vem arredondado a 1 ms, o que já desloca a posição em até ~0,01 m.
+    for point in result.trajectory:
+        t = point.time
+        x = (v0 - wind) / k * (1 - math.exp(-k * t)) + wind * t
+        y = 2 + (v0 + g / k) / k * (1 - math.exp(-k * t)) - g * t / k
+        assert math.isclose(point.x, x, abs_tol=1e-2)
+        assert math.isclose(point.y, max(y, 0.0), abs_tol=1e-2)
+    assert result.trajectory[-1].y == 0.0
+    assert result.trajectory[-1].x == result.max_range
+
+def test_quadratic_drag_and_wind_effects():
+    launch = dict(initial_velocity=30, launch_angle=40, output_units=SI_OUTPUT_UNITS)
+    vacuum = module.run_simulation(ProjectileLaunchParams(**launch))
+    drag = module.run_simulation(ProjectileLaunchParams(**launch, drag_model="quadratic", drag_coefficient=0.005))
+    tailwind = module.run_simulation(ProjectileLaunchParams(**launch, drag_model="quadratic", drag_coefficient=0.005, wind_velocity=5))
+    assert drag.max_range < vacuum.max_range and drag.max_height < vacuum.max_height
+    assert drag.max_range < tailwind.max_range < vacuum.max_range
+    assert math.isclose(max(point.y for point in drag.trajectory), drag.max_height, abs_tol=2e-3)
+    assert drag.trajectory[-1].time == drag.total_time and drag.trajectory[-1].y == 0.0
+
+def test_drag_tolerance_sampling_and_query_restriction():
+    params = ProjectileLaunchParams(initial_velocity=30, launch_angle=40, drag_model="quadratic", drag_coefficient=0.005)
+    default_result = module.run_simulation(params)
+    coarse = module.run_simulation(params.model_copy(update={"trajectory_tolerance": 0.01}))
+    assert len(coarse.trajectory) < len(default_result.trajectory)
+    assert coarse.max_range == default_result.max_range
+    with pytest.raises(HTTPException) as exc_info:
+        module.query_state(ProjectileQueryParams(initial_velocity=30, launch_angle=40, drag_model="linear", drag_coefficient=0.1, times=[1.0]))
+    assert exc_info.value.status_code == 400
+
+# Conjuntos de Monte Carlo
+def test_ensemble_is_reproducible_and_ordered():
+    params = ProjectileEnsembleParams(
+        initial_velocity=20, launch_angle=45, samples=2000, seed=7,
+        distributions={"initial_velocity": {"kind": "normal", "std": 1.0}, "launch_angle": {"kind": "uniform", "half_width": 5}},
+    )
+    first = module.run_ensemble(params)
+    assert first.model_dump() == module.run_ensemble(params).model_dump()
+    values = [first.range.percentiles[key] for key in ("p5", "p25", "p50", "p75", "p95")]
+    assert values == sorted(values)
+    assert first.range.min <= values[0] and values[-1] <= first.range.max
+    assert sum(first.landing_histogram.counts) == 2000
+    assert len(first.landing_histogram.bin_edges) == len(first.landing_histogram.counts) + 1
+    # Alcance nominal 40,77 m; a média do conjunto fica próxima dele.
+    assert math.isclose(first.range.mean, 40.77, rel_tol=0.05)
+    assert module.run_ensemble(params.model_copy(update={"seed": None})).seed is not None
+
+def test_ensemble_without_spread_matches_single_launch():
+    launch = dict(initial_velocity=25, launch_angle=30, initial_height=3, output_units=SI_OUTPUT_UNITS)
+    single = module.run_simulation(ProjectileLaunchParams(**launch))
+    ensemble = module.run_ensemble(ProjectileEnsembleParams(**launch, samples=10, seed=1))
+    assert ensemble.range.std == 0.0 and ensemble.clipped_samples == 0
+    assert math.isclose(ensemble.range.mean, single.max_range, abs_tol=1e-3)
+    assert math.isclose(ensemble.max_height.percentiles["p50"], single.max_height, abs_tol=1e-3)
+    assert math.isclose(ensemble.total_time.max, single.total_time, abs_tol=1e-3)
+
+def test_ensemble_clipping_drag_and_validation():
+    clipped = module.run_ensemble(ProjectileEnsembleParams(
+        initial_velocity=10, launch_angle=85, samples=500, seed=3,
+        distributions={"launch_angle": {"kind": "uniform", "half_width": 10}},
+    ))
+    assert clipped.clipped_samples > 0
+    drag = module.run_ensemble(ProjectileEnsembleParams(
+        initial_velocity=30, launch_angle=40, samples=50, seed=3, drag_model="quadratic", drag_coefficient=0.005,
+        distributions={"initial_velocity": {"kind": "normal", "std": 0.5}},
+    ))
+    vacuum = module.run_simulation(ProjectileLaunchParams(initial_velocity=30, launch_angle=40))
+    assert drag.range.max < vacuum.max_range
+    with pytest.raises(ValidationError):
+        ProjectileEnsembleParams(initial_velocity=10, launch_angle=45, distributions={"initial_velocity": {"kind": "normal"}})
+    with pytest.raises(ValidationError):
+        ProjectileEnsembleParams(initial_velocity=10, launch_angle=45, percentiles=[50, 101])
+
+# Curvas em função do ângulo e parábola de segurança
+def test_envelope_curves_match_single_launches():
+    envelope = module.compute_envelope(ProjectileEnvelopeParams(initial_velocity=20, initial_height=5, angle_points=19, min_angle=0, max_angle=90))
+    assert envelope.launch_angles[0] == 0 and envelope.launch_angles[-1] == 90 and len(envelope.ranges) == 19
+    for angle, expected_range, expected_height, expected_time in zip(envelope.launch_angles[:-1], envelope.ranges, envelope.max_heights, envelope.flight_times):
+        single = module.run_simulation(ProjectileLaunchParams(initial_velocity=20, launch_angle=angle, initial_height=5, output_units=SI_OUTPUT_UNITS))
+        assert math.isclose(single.max_range, expected_range, abs_tol=1e-3)
+        assert math.isclose(single.max_height, expected_height, abs_tol=1e-3)
+        assert math.isclose(single.total_time, expected_time, abs_tol=1e-3)
+    # Nenhum ponto da grade ultrapassa o ótimo, e o ótimo fica abaixo de 45° ao lançar de uma altura.
+    assert max(envelope.ranges) <= envelope.max_range and envelope.optimal_angle < 45
+
+def test_envelope_safety_parabola_bounds_trajectories():
+    envelope = module.compute_envelope(ProjectileEnvelopeParams(initial_velocity=15, envelope_points=50))
+    assert envelope.optimal_angle == 45.0
+    assert math.isclose(envelope.max_range, 15 ** 2 / 9.81, abs_tol=1e-3)
+    assert envelope.envelope_x[-1] == envelope.max_range and envelope.envelope_y[-1] == 0.0
+    assert math.isclose(envelope.envelope_y[0], 15 ** 2 / (2 * 9.81), abs_tol=1e-3)
+    for angle in (20, 45, 70):
+        trajectory = module.run_simulation(ProjectileLaunchParams(initial_velocity=15, launch_angle=angle, output_units=SI_OUTPUT_UNITS)).trajectory
+        for point in trajectory:
+            assert point.y <= 15 ** 2 / (2 * 9.81) - 9.81 * point.x ** 2 / (2 * 15 ** 2) + 1e-3
+    with pytest.raises(ValueError):
+        ProjectileEnvelopeParams(initial_velocity=15, min_angle=60, max_angle=30)
+
+# Perfil de terreno
+def test_terrain_index_matches_segment_by_segment_search():
+    def linear_search(terrain, y0, slope, curvature):
+        for x1, x2, h1, h2 in zip(terrain.xs, terrain.xs[1:], terrain.heights, terrain.heights[1:]):
+            if x2 <= 0:
+                continue
+            lo = max(x1, 0.0)
+            hit = TerrainIndex._segment_hit(y0, slope, curvature, lo, x2, h1 + (h2 - h1) * (lo - x1) / (x2 - x1), (h2 - h1) / (x2 - x1))
+            if hit is not None:
+                return hit
+        return TerrainIndex._segment_hit(y0, slope, curvature, max(terrain.xs[-1], 0.0), math.inf, terrain.heights[-1], 0.0)
+
+    rng = random.Random(5)
+    for vertex_count in (2, 17, 300, 5000):
+        for _ in range(50):
+            xs = [rng.uniform(-20, 0)]
+            for _ in range(vertex_count - 1):
+                xs.append(xs[-1] + rng.uniform(0.1, 3))
+            terrain = TerrainIndex(xs, [rng.uniform(-10, 15) for _ in xs])
+            angle = math.radians(rng.uniform(0, 85))
+            speed = rng.uniform(5, 50)
+            y0, slope, curvature = terrain.height_at(0.0) + rng.uniform(0, 20), math.tan(angle), 9.81 / (2 * (speed * math.cos(angle)) ** 2)
+            assert terrain.first_impact_x(y0, slope, curvature) == linear_search(terrain, y0, slope, curvature)
+
+def test_flat_terrain_matches_flat_ground():
+    launch = dict(initial_velocity=20, launch_angle=45, initial_height=2, output_units=SI_OUTPUT_UNITS)
+    flat = module.run_simulation(ProjectileLaunchParams(**launch))
+    terrain = module.run_simulation(ProjectileLaunchParams(**launch, terrain=TerrainProfile(x=[-1, 1000], heights=[0, 0])))
+    assert (terrain.total_time, terrain.max_range, terrain.max_height) == (flat.total_time, flat.max_range, flat.max_height)
+    assert terrain.trajectory == flat.trajectory
+
+def test_terrain_hill_and_valley_impacts():
+    launch = dict(initial_velocity=20, launch_angle=45, initial_height=2, output_units=SI_OUTPUT_UNITS)
+    hill = module.run_simulation(ProjectileLaunchParams(**launch, terrain=TerrainProfile(x=[0, 20, 25, 100], heights=[0, 0, 10, 10])))
+    # Y(x) = 2 + x − 9,81·x²/400 = 10 na descida.
+    expected_x = (1 + math.sqrt(1 - 4 * 9.81 / 400 * 8)) / (2 * 9.81 / 400)
+    assert math.isclose(hill.max_range, expected_x, abs_tol=1e-3)
+    assert hill.trajectory[-1].y == 10.0 and hill.trajectory[-1].x == hill.max_range
+
+    valley = module.run_simulation(ProjectileLaunchParams(**launch, terrain=TerrainProfile(spacing=50, heights=[0, -30])))
+    assert valley.trajectory[-1].y == -30.0
+    assert all(point.y > -30.0 for point in valley.trajectory[:-1])
+
+    # Encosta íngreme atingida ainda na subida: a altura máxima é a do impacto.
+    wall = module.run_simulation(ProjectileLaunchParams(**launch, terrain=TerrainProfile(x=[0, 5, 5.001], heights=[0, 0, 100])))
+    assert math.isclose(wall.max_range, 5.0, abs_tol=1e-3) and wall.max_height == wall.trajectory[-1].y
+
+def test_terrain_validation():
+    with pytest.raises(ValidationError):
+        TerrainProfile(x=[0, 0], heights=[1, 2])
+    with pytest.raises(ValidationError):
+        TerrainProfile(heights=[1, 2])
+    with pytest.raises(ValidationError):
+        ProjectileLaunchParams(initial_velocity=10, launch_angle=30, drag_model="linear", drag_coefficient=0.1, terrain={"spacing": 1, "heights": [0, 0]})
+    with pytest.raises(HTTPException) as exc_info:
+        module.run_simulation(ProjectileLaunchParams(initial_velocity=10, launch_angle=30, terrain={"spacing": 1, "heights": [5, 5]}))
+    assert exc_info.value.status_code == 400
+
+# Vários conjuntos de unidades em uma chamada
+def test_output_unit_list_projects_one_computation():
+    unit_sets = [
+        {"velocity_unit": "m/s", "time_unit": "s", "range_unit": "m", "height_unit": "m"},
+        {"velocity_unit": "mph", "time_unit": "min", "range_unit": "ft", "height_unit": "ft"},
+    ]
+    launch = dict(initial_velocity=25, launch_angle=35, initial_height=1.5)
+    result = module.run_simulation(ProjectileLaunchParams(**launch, output_units=unit_sets))
+    assert len(result.unit_views) == 2
+    for units, view in zip(unit_sets, result.unit_views):
+        single = module.run_simulation(ProjectileLaunchParams(**launch, output_units=units))
+        assert (view.max_range, view.max_height, view.total_time, view.initial_velocity_x) == \
+            (single.max_range, single.max_height, single.total_time, single.initial_velocity_x)
+        assert view.max_range_unit == units["range_unit"] and view.total_time_unit == units["time_unit"]
+        assert view.x == [point.x for point in single.trajectory]
+        assert view.y == [point.y for point in single.trajectory]
+    # Os campos principais e 'trajectory' seguem o primeiro conjunto.
+    assert result.max_range == result.unit_views[0].max_range
+    assert [point.x for point in result.trajectory] == result.unit_views[0].x
+    assert module.run_simulation(ProjectileLaunchParams(**launch)).unit_views is None
+
+def test_output_unit_list_validation_and_stream():
+    with pytest.raises(ValidationError):
+        ProjectileLaunchParams(initial_velocity=10, launch_angle=30, output_units=[])
+    with pytest.raises(ValidationError):
+        ProjectileLaunchParams(initial_velocity=10, launch_angle=30, output_units=[{"range_unit": "m"}] * 9)
+    params = ProjectileLaunchParams(initial_velocity=10, launch_angle=30, output_units=[{"range_unit": "m"}, {"range_unit": "km"}])
+    events = list(module.stream_simulation(params))
+    assert events[0]["event"] == "summary" and len(events[0]["data"]["unit_views"]) == 2
+    assert sum(1 for event in events if event["event"] == "point") == len(module.run_simulation(params).trajectory)
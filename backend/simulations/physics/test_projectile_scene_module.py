@@ -0,0 +1,87 @@
+import math
+import random
+
+import pytest
+from pydantic import ValidationError
+
+from backend.simulations.physics.projectile_scene_module import ProjectileSceneModule, obstacle_segments
+from backend.simulations.physics.models_projectile_scene import ProjectileSceneParams
+from backend.simulations.physics.scene_geometry import Launch, Segment, UniformSegmentGrid, first_segment_hit, parabola_segment_hit
+
+module = ProjectileSceneModule()
+
+
+def test_parabola_segment_hit_analytic():
+    launch = Launch(0.0, 0.0, 10.0, 10.0, 10.0)
+    # Parede vertical em x = 5: atingida em t = 0,5 s, na altura 5 − 1,25 = 3,75 m.
+    assert math.isclose(parabola_segment_hit(launch, Segment(5, 0, 5, 10), 10.0), 0.5)
+    # Abaixo do ponto de passagem: não há colisão.
+    assert parabola_segment_hit(launch, Segment(5, 0, 5, 3), 10.0) is None
+    # Plataforma horizontal em y = 3,2: a subida cruza em t = 0,4 s, a descida em t = 1,6 s.
+    assert math.isclose(parabola_segment_hit(launch, Segment(0, 3.2, 20, 3.2), 10.0), 0.4)
+    assert math.isclose(parabola_segment_hit(launch, Segment(10, 3.2, 20, 3.2), 10.0), 1.6)
+    # Fora do intervalo de tempo pedido.
+    assert parabola_segment_hit(launch, Segment(10, 3.2, 20, 3.2), 1.0) is None
+
+
+def test_grid_matches_all_pairs_search():
+    rng = random.Random(0)
+    obstacles = []
+    for i in range(200):
+        x, y = rng.uniform(5, 300), rng.uniform(0, 60)
+        if i % 2:
+            obstacles.append({"kind": "rectangle", "x": x, "y": y, "width": rng.uniform(1, 6), "height": rng.uniform(1, 6)})
+        else:
+            obstacles.append({"kind": "segment", "x1": x, "y1": y, "x2": x + rng.uniform(-8, 8), "y2": y + rng.uniform(-8, 8)})
+    projectiles = [
+        {"initial_velocity": rng.uniform(10, 50), "launch_angle": rng.uniform(-30, 170), "x0": rng.uniform(0, 40), "y0": rng.uniform(0, 10)}
+        for _ in range(200)
+    ]
+    params = ProjectileSceneParams(projectiles=projectiles, obstacles=obstacles, include_trajectories=False)
+    result = module.run_simulation(params)
+
+    segments, owners = obstacle_segments(params.obstacles)
+    assert result.narrow_phase_tests < len(segments) * len(projectiles) / 10
+    for projectile, outcome in zip(params.projectiles, result.projectiles):
+        angle = math.radians(projectile.launch_angle)
+        launch = Launch(projectile.x0, projectile.y0, projectile.initial_velocity * math.cos(angle), projectile.initial_velocity * math.sin(angle), 9.81)
+        t_ground = (launch.vy + math.sqrt(launch.vy ** 2 + 2 * 9.81 * launch.y0)) / 9.81
+        hits = [(t, owners[i]) for i, segment in enumerate(segments) if (t := parabola_segment_hit(launch, segment, t_ground)) is not None]
+        if hits:
+            t, owner = min(hits)
+            assert (outcome.outcome, outcome.obstacle_index, outcome.impact_time) == ("obstacle", owner, round(t, 4))
+        else:
+            assert (outcome.outcome, outcome.impact_time) == ("ground", round(t_ground, 4))
+    assert sum(result.obstacle_hits) == sum(1 for outcome in result.projectiles if outcome.outcome == "obstacle")
+
+
+def test_scene_outcomes_and_trajectories():
+    params = ProjectileSceneParams(
+        projectiles=[
+            {"label": "parede", "initial_velocity": 20, "launch_angle": 30},
+            {"label": "livre", "initial_velocity": 20, "launch_angle": 150},
+            {"label": "sem solo", "initial_velocity": 5, "launch_angle": 0, "x0": -50, "y0": 1},
+        ],
+        obstacles=[{"kind": "rectangle", "x": 10, "y": 0, "width": 2, "height": 20}],
+        trajectory_points=10,
+    )
+    parede, livre, _ = module.run_simulation(params).projectiles
+    assert parede.label == "parede" and parede.outcome == "obstacle" and parede.obstacle_index == 0
+    assert math.isclose(parede.impact_x, 10.0, abs_tol=1e-3)
+    assert len(parede.trajectory) == 10 and parede.trajectory[-1].time == parede.impact_time
+    assert livre.outcome == "ground" and livre.impact_y == 0.0 and livre.impact_x < 0
+    assert math.isclose(livre.impact_x, 20 ** 2 * math.sin(math.radians(300)) / 9.81, abs_tol=1e-3)
+
+    no_ground = module.run_simulation(params.model_copy(update={"ground": False, "max_time": 3.0, "include_trajectories": False}))
+    falling = no_ground.projectiles[2]
+    assert falling.outcome == "none" and falling.impact_time == 3.0 and falling.trajectory is None
+    assert math.isclose(falling.impact_y, 1 - 0.5 * 9.81 * 9, abs_tol=1e-3)
+
+
+def test_empty_grid_and_validation():
+    grid = UniformSegmentGrid([])
+    assert first_segment_hit(grid, Launch(0, 0, 1, 1, 9.81), 1.0) == (None, 0)
+    with pytest.raises(ValidationError):
+        ProjectileSceneParams(projectiles=[])
+    with pytest.raises(ValidationError):
+        ProjectileSceneParams(projectiles=[{"initial_velocity": 10, "launch_angle": 45}], obstacles=[{"kind": "circle", "x": 0}])
@@ -0,0 +1,135 @@
+"""
+Motor colunar para trajetórias de lançamento oblíquo sem arrasto.
+
+Em vez de montar um TrajectoryPoint por passo, calcula a grade de tempo e as
+colunas x/y como listas inteiras (uma operação por coluna), aplica o
+recorte no solo e a conversão de unidades por fator multiplicativo, e deixa a
+criação dos objetos de saída para o final.
+"""
+import math
+from typing import Iterator, List, NamedTuple, Optional
+
+DEFAULT_TIME_STEP_S = 0.05
+MIN_DESIRED_POINTS = 20
+MAX_ADAPTIVE_POINTS = 2000
+# Limite para o número de pontos pedido explicitamente (modo de alta resolução).
+MAX_TRAJECTORY_POINTS = 100_000
+
+
+class TrajectoryColumns(NamedTuple):
+    time: List[float]
+    x: List[float]
+    y: List[float]
+
+
+def trajectory_time_grid(total_time: float, points: Optional[int] = None) -> List[float]:
+    """
+    Grade de tempo da trajetória. Sem `points`, usa o passo padrão de 0,05 s,
+    ajustado para ficar entre MIN_DESIRED_POINTS e MAX_ADAPTIVE_POINTS; com
+    `points`, distribui exatamente esse número de pontos entre 0 e total_time.
+    """
+    if total_time <= 1e-6:
+        return [0.0]
+
+    if points is not None:
+        time_step = total_time / (points - 1)
+        return [i * time_step for i in range(points - 1)] + [total_time]
+
+    time_step = DEFAULT_TIME_STEP_S
+    if total_time > 1e-5:
+        if total_time / time_step < MIN_DESIRED_POINTS:
+            time_step = total_time / MIN_DESIRED_POINTS
+        if total_time / time_step > MAX_ADAPTIVE_POINTS:
+            time_step = total_time / MAX_ADAPTIVE_POINTS
+
+    steps_count = int(math.floor((total_time + 1e-9) / time_step)) + 1
+    times = [i * time_step for i in range(steps_count)]
+    # Garante o ponto de impacto quando a grade não cai sobre ele.
+    if abs(times[-1] - total_time) > 1e-4:
+        times.append(total_time)
+    return times
+
+
+def tolerance_time_step(g: float, tolerance: float) -> float:
+    """
+    Maior passo de tempo para o qual a poligonal fica a no máximo `tolerance`
+    metros da parábola. Entre dois pontos, o desvio da corda é g·Δt²/8 (só em y,
+    já que x é linear no tempo), independentemente da velocidade.
+    """
+    return math.sqrt(8 * tolerance / g)
+
+
+def tolerance_time_grid(total_time: float, apex_time: float, g: float, tolerance: float) -> List[float]:
+    """Grade uniforme em cada lado do ápice, com o ápice e o impacto sempre incluídos."""
+    if total_time <= 1e-6:
+        return [0.0]
+
+    max_step = tolerance_time_step(g, tolerance)
+    breakpoints = [0.0] + ([apex_time] if 1e-9 < apex_time < total_time - 1e-9 else []) + [total_time]
+    times = [0.0]
+    for start, end in zip(breakpoints, breakpoints[1:]):
+        count = max(1, math.ceil((end - start) / max_step - 1e-9))
+        step = (end - start) / count
+        times.extend(start + step * i for i in range(1, count))
+        times.append(end)
+    return times
+
+
+def compute_trajectory_si(v0x: float, v0y: float, y0: float, g: float, total_time: float,
+                          points: Optional[int] = None, tolerance: Optional[float] = None,
+                          impact_y: Optional[float] = None) -> TrajectoryColumns:
+    """
+    Calcula as colunas (t, x, y) em SI, com y limitado ao solo e truncadas no impacto.
+    Com `tolerance`, os pontos são espaçados pelo erro máximo da poligonal (ver tolerance_time_grid).
+    """
+    if tolerance is not None:
+        times = tolerance_time_grid(total_time, v0y / g, g, tolerance)
+    else:
+        times = trajectory_time_grid(total_time, points)
+    return next(iter_trajectory_chunks_si(v0x, v0y, y0, g, total_time, times, impact_y=impact_y))
+
+
+def iter_trajectory_chunks_si(v0x: float, v0y: float, y0: float, g: float, total_time: float,
+                              times: List[float], chunk_size: Optional[int] = None,
+                              impact_y: Optional[float] = None) -> Iterator[TrajectoryColumns]:
+    """
+    Colunas (t, x, y) em SI na grade `times`, em blocos de até `chunk_size`
+    pontos (um único bloco sem `chunk_size`), para que a trajetória possa ser
+    transmitida sem montar todas as colunas. Com `impact_y` (terreno), não há
+    recorte em y = 0: os pontos anteriores ao impacto já estão acima do
+    terreno e o último passa a ser o próprio impacto.
+    """
+    if len(times) == 1:
+        yield TrajectoryColumns([0.0], [0.0], [y0])
+        return
+
+    last = len(times) - 1
+    size = chunk_size or len(times)
+    for start in range(0, len(times), size):
+        ts = times[start:start + size]
+        end = start + len(ts) - 1
+        xs = [v0x * t for t in ts]
+        ys = [y0 + v0y * t - 0.5 * g * t * t for t in ts]
+        if impact_y is not None:
+            if end == last:
+                ys[-1] = impact_y
+            yield TrajectoryColumns(ts, xs, ys)
+            continue
+        ys = [y if y > 0.0 else 0.0 for y in ys]
+
+        # Impacto antecipado por arredondamento: a trajetória termina no primeiro ponto no solo.
+        impact_index = next((i for i in range(max(start, 1), min(end, last - 1) + 1)
+                             if ys[i - start] == 0.0 and abs(times[i] - total_time) > 1e-9), None)
+        if impact_index is not None:
+            count = impact_index - start + 1
+            yield TrajectoryColumns(ts[:count], xs[:count], ys[:count])
+            return
+        if end == last and abs(ts[-1] - total_time) < 1e-4 and y0 + v0y * total_time - 0.5 * g * total_time * total_time < 1e-3:
+            ys[-1] = 0.0
+        yield TrajectoryColumns(ts, xs, ys)
+
+
+def scale_and_round(values: List[float], factor: float, digits: int = 3) -> List[float]:
+    if factor == 1.0:
+        return [round(value, digits) for value in values]
+    return [round(value * factor, digits) for value in values]
@@ -0,0 +1,89 @@
+"""
+Registro de unidades compartilhado pelos módulos de simulação.
+
+Cada unidade pertence a uma grandeza e tem dois fatores em relação à unidade
+base da grandeza (m, m/s, s, L, mol): para a base e a partir dela. Todos os
+pares (origem, destino) da mesma grandeza são resolvidos uma única vez, na
+importação, em uma tabela de fatores multiplicativos; converter uma série
+inteira é então uma busca na tabela e uma multiplicação por valor.
+"""
+from typing import Dict, List, Sequence, Tuple
+
+# Fatores de conversão
+KM_PER_M = 0.001
+M_PER_KM = 1000.0
+FT_PER_M = 3.28084
+M_PER_FT = 0.3048
+MI_PER_M = 0.000621371
+M_PER_MI = 1609.34
+S_PER_H = 3600.0
+MIN_PER_S = 1.0 / 60.0
+S_PER_MIN = 60.0
+L_PER_ML = 0.001
+ML_PER_L = 1000.0
+MOL_PER_MMOL = 0.001
+MMOL_PER_MOL = 1000.0
+
+# grandeza -> unidade -> (fator para a base, fator a partir da base).
+# Os dois fatores são guardados separadamente para manter exatamente as constantes já usadas (ex: ft).
+UNIT_DEFINITIONS: Dict[str, Dict[str, Tuple[float, float]]] = {
+    "length": {
+        "m": (1.0, 1.0),
+        "km": (M_PER_KM, KM_PER_M),
+        "ft": (M_PER_FT, FT_PER_M),
+        "mi": (M_PER_MI, MI_PER_M),
+    },
+    "velocity": {
+        "m/s": (1.0, 1.0),
+        "km/h": (M_PER_KM / S_PER_H, KM_PER_M * S_PER_H),
+        "ft/s": (M_PER_FT, 1 / M_PER_FT),
+        "mph": (M_PER_MI / S_PER_H, MI_PER_M * S_PER_H),
+    },
+    "time": {
+        "s": (1.0, 1.0),
+        "min": (S_PER_MIN, MIN_PER_S),
+    },
+    "volume": {
+        "L": (1.0, 1.0),
+        "mL": (L_PER_ML, ML_PER_L),
+    },
+    "amount": {
+        "mol": (1.0, 1.0),
+        "mmol": (MOL_PER_MMOL, MMOL_PER_MOL),
+    },
+}
+
+UNIT_DIMENSIONS: Dict[str, str] = {
+    unit: dimension for dimension, units in UNIT_DEFINITIONS.items() for unit in units
+}
+
+
+def _build_factor_table() -> Dict[Tuple[str, str], float]:
+    table: Dict[Tuple[str, str], float] = {}
+    for units in UNIT_DEFINITIONS.values():
+        for from_unit, (to_base, _) in units.items():
+            for to_unit, (_, from_base) in units.items():
+                table[(from_unit, to_unit)] = 1.0 if from_unit == to_unit else to_base * from_base
+    return table
+
+
+_FACTOR_TABLE = _build_factor_table()
+
+
+def conversion_factor(from_unit: str, to_unit: str) -> float:
+    """Fator multiplicativo que leva valores de `from_unit` para `to_unit`."""
+    factor = _FACTOR_TABLE.get((from_unit, to_unit))
+    if factor is None:
+        for unit in (from_unit, to_unit):
+            if unit not in UNIT_DIMENSIONS:
+                raise ValueError(f"Unidade desconhecida: {unit}")
+        raise ValueError(f"Não é possível converter {UNIT_DIMENSIONS[from_unit]} ({from_unit}) em {UNIT_DIMENSIONS[to_unit]} ({to_unit}).")
+    return factor
+
+
+def convert_values(values: Sequence[float], from_unit: str, to_unit: str) -> List[float]:
+    """Converte uma série inteira com um único fator."""
+    factor = conversion_factor(from_unit, to_unit)
+    if factor == 1.0:
+        return list(values)
+    return [value * factor for value in values]
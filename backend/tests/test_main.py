@@ -304,3 +304,81 @@ def test_mendelian_cross_invalid_allele_definition_long():
     assert response.status_code == 400
     # CORRIGIDO para corresponder à mensagem exata do backend
     assert "Alelos dominante e recessivo devem ser caracteres únicos." in response.json().get("detail", "")
+
+# Testes para o endpoint de execução em lote
+def test_batch_projectile_mixed_valid_and_invalid():
+    valid_payload = {"initial_velocity": 20, "launch_angle": 45}
+    response = client.post("/api/simulation/projectile-launch/batch", json=[
+        valid_payload,
+        {"initial_velocity": -5, "launch_angle": 45},
+        valid_payload,
+    ])
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [item["index"] for item in results] == [0, 1, 2]
+    assert results[0]["status_code"] == 200
+    assert results[0]["result"]["max_range"] > 0
+    assert results[1]["status_code"] == 422
+    assert "error" in results[1]
+    # Payloads idênticos devem produzir o mesmo resultado
+    assert results[2]["result"] == results[0]["result"]
+
+def test_batch_accepts_items_wrapper():
+    response = client.post("/api/simulation/acid-base/batch", json={"items": [
+        {"acid_concentration": 0.1, "acid_volume": 50, "base_concentration": 0.1, "base_volume": 50},
+    ]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results[0]["status_code"] == 200
+    assert results[0]["result"]["final_ph"] == 7.0
+
+def test_batch_unknown_experiment():
+    response = client.post("/api/simulation/does-not-exist/batch", json=[])
+    assert response.status_code == 404
+
+def test_batch_payload_must_be_list():
+    response = client.post("/api/simulation/projectile-launch/batch", json={"initial_velocity": 20})
+    assert response.status_code == 400
+
+def test_projectile_scene_endpoint():
+    response = client.post("/api/simulation/projectile-scene/start", json={
+        "projectiles": [{"initial_velocity": 20, "launch_angle": 30}, {"initial_velocity": 20, "launch_angle": 60}],
+        "obstacles": [{"kind": "segment", "x1": 15, "y1": 0, "x2": 15, "y2": 6}],
+        "include_trajectories": False,
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert [projectile["outcome"] for projectile in data["projectiles"]] == ["obstacle", "ground"]
+    assert data["obstacle_hits"] == [1]
+
+def test_acid_base_speciation_endpoint():
+    response = client.post("/api/simulation/acid-base-speciation/start", json={
+        "name": "H2CO3", "pka_values": [6.35, 10.33], "concentration": 0.01, "ph_points": 15,
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert data["species"] == ["H₂A", "HA⁻", "A²⁻"]
+    assert len(data["diagram_ph"]) == 15 and len(data["diagram_alpha"]) == 3
+
+def test_solution_mixer_endpoint():
+    response = client.post("/api/simulation/solution-mixer/start", json={"solutions": [
+        {"name": "CH3COOH", "kind": "acid", "concentration": 0.1, "volume_ml": 50, "ka_values": [1.8e-5]},
+        {"name": "NaOH", "kind": "base", "concentration": 0.1, "volume_ml": 25},
+        {"name": "HCl", "kind": "acid", "concentration": 0.1, "volume_ml": 5},
+    ]})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "Ácida"
+    assert [species["forms"] for species in data["species"]] == [["HA", "A⁻"], ["M⁺"], ["A⁻"]]
+
+def test_titration_volume_increment_depends_on_sampling():
+    payload = {
+        "acid_concentration": 0.1, "acid_volume": 50,
+        "titrant_is_acid": False, "titrant_concentration": 0.1, "final_titrant_volume_ml": 60,
+    }
+    response = client.post("/api/simulation/acid-base-titration/start", json=payload)
+    assert response.status_code == 422
+    assert "volume_increment_ml" in response.json()["detail"][0]["msg"]
+    response = client.post("/api/simulation/acid-base-titration/start", json={**payload, "sampling": "adaptive", "max_points": 40})
+    assert response.status_code == 200
+    assert len(response.json()["titration_curve"]) <= 40
@@ -0,0 +1,124 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.result_encoding import decode_columnar
+from backend.simulations.chemistry import acid_base_titration_module
+from backend.simulations.chemistry.models_acid_base import TitrationParams
+
+client = TestClient(app)
+
+def read_ndjson(response):
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+def test_projectile_stream_matches_regular_response():
+    payload = {"initial_velocity": 25, "launch_angle": 40, "initial_height": 2}
+    regular = client.post("/api/simulation/projectile-launch/start", json=payload).json()
+    response = client.post("/api/simulation/projectile-launch/start", json=payload, headers={"Accept": "application/x-ndjson"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    events = read_ndjson(response)
+    assert events[0]["event"] == "summary"
+    assert events[0]["series"] == ["trajectory"]
+    assert events[0]["data"]["max_range"] == regular["max_range"]
+    assert "trajectory" not in events[0]["data"]
+    points = [event["data"] for event in events if event["event"] == "point"]
+    assert points == regular["trajectory"]
+    assert events[-1] == {"event": "end", "points": len(points)}
+
+def test_titration_stream_emits_summary_then_points():
+    payload = {
+        "acid_concentration": 0.1, "acid_volume": 50,
+        "titrant_is_acid": False, "titrant_concentration": 0.1,
+        "initial_titrant_volume_ml": 1, "final_titrant_volume_ml": 60, "volume_increment_ml": 1,
+    }
+    response = client.post("/api/simulation/acid-base-titration/start", json=payload, headers={"Accept": "application/x-ndjson"})
+    assert response.status_code == 200
+    events = read_ndjson(response)
+    assert events[0]["event"] == "summary"
+    assert events[0]["data"]["message"] == "Curva de titulação gerada com 60 pontos."
+    assert events[0]["data"]["equivalence_points_ml"] == [50.0]
+    assert [event["data"]["titrant_volume_added_ml"] for event in events[1:-2]] == [float(v) for v in range(1, 61)]
+    # O ponto de inflexão depende da curva inteira e chega depois dos pontos.
+    regular = client.post("/api/simulation/acid-base-titration/start", json=payload).json()
+    assert events[-2] == {"event": "summary_update", "data": {"inflection_points_ml": regular["inflection_points_ml"]}}
+    assert [event["data"] for event in events[1:-2]] == regular["titration_curve"]
+    assert events[-1] == {"event": "end", "points": 60}
+
+def test_titration_stream_sends_summary_before_computing_points(monkeypatch):
+    params = TitrationParams(
+        acid_concentration=0.1, acid_volume=50, titrant_is_acid=False, titrant_concentration=0.1,
+        final_titrant_volume_ml=100, volume_increment_ml=0.02,
+    )
+    computed_chunks = []
+    original_compute = acid_base_titration_module.compute_titration_ph
+    monkeypatch.setattr(acid_base_titration_module, "compute_titration_ph",
+                        lambda system, volumes: computed_chunks.append(len(volumes)) or original_compute(system, volumes))
+    events = acid_base_titration_module.AcidBaseTitrationModule().stream_simulation(params)
+    assert next(events)["event"] == "summary"
+    assert computed_chunks == []
+    next(events)
+    assert computed_chunks == [acid_base_titration_module.STREAM_CHUNK_POINTS]
+
+def test_stream_errors_are_reported_before_streaming_starts():
+    payload = {
+        "acid_concentration": 0.1, "acid_volume": 50,
+        "titrant_is_acid": False, "titrant_concentration": 0.1,
+        "final_titrant_volume_ml": 60, "volume_increment_ml": 0.001,
+    }
+    response = client.post("/api/simulation/acid-base-titration/start", json=payload, headers={"Accept": "application/x-ndjson"})
+    assert response.status_code == 400
+
+def test_projectile_stream_rejects_oversized_tolerance_before_summary():
+    payload = {"initial_velocity": 50, "launch_angle": 45, "trajectory_tolerance": 1e-9}
+    regular = client.post("/api/simulation/projectile-launch/start", json=payload)
+    response = client.post("/api/simulation/projectile-launch/start", json=payload, headers={"Accept": "application/x-ndjson"})
+    assert regular.status_code == 400
+    assert response.status_code == 400
+    assert response.json()["detail"] == regular.json()["detail"]
+
+def test_default_stream_for_modules_without_series():
+    response = client.post("/api/simulation/mendelian-genetics/start", json={"parent1_genotype": "Aa", "parent2_genotype": "Aa"},
+                           headers={"Accept": "application/x-ndjson"})
+    events = read_ndjson(response)
+    assert [event["event"] for event in events] == ["summary", "end"]
+    assert len(events[0]["data"]["offspring_genotypes"]) == 3
+
+def test_columnar_projectile_round_trip():
+    payload = {"initial_velocity": 30, "launch_angle": 50}
+    regular = client.post("/api/simulation/projectile-launch/start", json=payload).json()
+    response = client.post("/api/simulation/projectile-launch/start", json=payload,
+                           headers={"Accept": "application/vnd.simulajuls.columnar"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.simulajuls.columnar"
+
+    decoded = decode_columnar(response.content)
+    assert decoded["dtype"] == "float64"
+    assert decoded["result"]["max_range"] == regular["max_range"]
+    trajectory = decoded["series"]["trajectory"]
+    assert trajectory["length"] == len(regular["trajectory"])
+    assert trajectory["columns"]["x"]["values"] == [point["x"] for point in regular["trajectory"]]
+    # Os dados começam alinhados a 8 bytes e ocupam 3 colunas de float64
+    header_length = int.from_bytes(response.content[4:8], "little")
+    assert (8 + header_length) % 8 == 0
+    assert len(response.content) - 8 - header_length == 3 * 8 * trajectory["length"]
+
+def test_columnar_float32_titration():
+    payload = {
+        "acid_concentration": 0.1, "acid_volume": 50,
+        "titrant_is_acid": False, "titrant_concentration": 0.1,
+        "initial_titrant_volume_ml": 1, "final_titrant_volume_ml": 20, "volume_increment_ml": 1,
+    }
+    response = client.post("/api/simulation/acid-base-titration/start", json=payload,
+                           headers={"Accept": "application/vnd.simulajuls.columnar; dtype=float32"})
+    decoded = decode_columnar(response.content)
+    assert decoded["dtype"] == "float32"
+    volumes = decoded["series"]["titration_curve"]["columns"]["titrant_volume_added_ml"]["values"]
+    assert volumes == [float(v) for v in range(1, 21)]
+
+def test_columnar_rejects_unknown_dtype():
+    response = client.post("/api/simulation/projectile-launch/start", json={"initial_velocity": 30, "launch_angle": 50},
+                           headers={"Accept": "application/vnd.simulajuls.columnar; dtype=int8"})
+    assert response.status_code == 406
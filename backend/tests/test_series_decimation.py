@@ -0,0 +1,72 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.series_decimation import decimate_result, lttb_indices
+from backend.simulation_cache import simulation_cache
+from backend.simulations.physics.models_projectile import ProjectileLaunchParams
+from backend.simulations.physics.projectile_module import ProjectileModule
+
+client = TestClient(app)
+
+def test_lttb_keeps_endpoints_and_spikes():
+    ys = [0.0] * 100
+    ys[37] = 5.0
+    ys[80] = -3.0
+    indices = lttb_indices(list(range(100)), [ys], 10)
+    assert len(indices) == 10
+    assert indices[0] == 0 and indices[-1] == 99
+    assert indices == sorted(indices)
+    assert 37 in indices and 80 in indices
+
+def test_lttb_returns_all_points_below_threshold():
+    assert lttb_indices([0, 1, 2], [[1, 2, 3]], 10) == [0, 1, 2]
+    assert lttb_indices(list(range(50)), [list(range(50))], 2) == [0, 49]
+
+def test_decimate_result_does_not_modify_original():
+    result = ProjectileModule().run_simulation(ProjectileLaunchParams(initial_velocity=30, launch_angle=45, trajectory_points=5000))
+    decimated = decimate_result(result, 300)
+    assert len(result.trajectory) == 5000
+    assert len(decimated.trajectory) == 300
+    assert decimated.trajectory[0] == result.trajectory[0]
+    assert decimated.trajectory[-1] == result.trajectory[-1]
+    # O ápice é o ponto mais marcante da curva e deve sobreviver à redução.
+    assert abs(max(point.y for point in decimated.trajectory) - result.max_height) < 1e-2
+    assert decimated.max_range == result.max_range
+
+def test_start_endpoint_decimates_all_formats_from_one_cached_result():
+    simulation_cache.clear()
+    hits_before = simulation_cache.stats()["modules"].get("projectile-launch", {}).get("hits", 0)
+    payload = {"initial_velocity": 30, "launch_angle": 45, "trajectory_points": 2000}
+    url = "/api/simulation/projectile-launch/start"
+
+    full = client.post(url, json=payload).json()
+    phone = client.post(url, params={"max_points": 100}, json=payload).json()
+    projector = client.post(url, params={"max_points": 500, "decimate": "lttb"}, json=payload).json()
+    assert len(full["trajectory"]) == 2000
+    assert len(phone["trajectory"]) == 100
+    assert len(projector["trajectory"]) == 500
+    assert simulation_cache.stats()["modules"]["projectile-launch"]["hits"] - hits_before == 2
+
+    streamed = client.post(url, params={"max_points": 100}, json=payload, headers={"Accept": "application/x-ndjson"})
+    events = [json.loads(line) for line in streamed.text.splitlines() if line]
+    assert [event["data"] for event in events if event["event"] == "point"] == phone["trajectory"]
+
+def test_start_endpoint_rejects_invalid_decimation_options():
+    payload = {"initial_velocity": 30, "launch_angle": 45}
+    url = "/api/simulation/projectile-launch/start"
+    assert client.post(url, params={"max_points": 1}, json=payload).status_code == 422
+    assert client.post(url, params={"max_points": 100, "decimate": "minmax"}, json=payload).status_code == 422
+
+def test_decimation_keeps_unit_views_aligned():
+    params = ProjectileLaunchParams(
+        initial_velocity=30, launch_angle=40, trajectory_points=2000,
+        output_units=[{"range_unit": "m", "height_unit": "m"}, {"range_unit": "ft", "height_unit": "ft"}],
+    )
+    reduced = decimate_result(ProjectileModule().run_simulation(params), 50)
+    assert len(reduced.trajectory) == 50
+    metric, imperial = reduced.unit_views
+    assert metric.x == [point.x for point in reduced.trajectory]
+    assert metric.y == [point.y for point in reduced.trajectory]
+    assert len(imperial.x) == len(imperial.y) == 50
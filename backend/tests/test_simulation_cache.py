@@ -0,0 +1,134 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend import simulation_cache as cache_module
+from backend.main import app
+from backend.simulation_cache import SimulationResultCache, params_fingerprint, simulation_cache
+from backend.simulation_executor import simulation_executor
+from backend.simulations.chemistry.models_acid_base import AcidBaseSimulationParams
+from backend.simulations.physics.models_projectile import OutputUnitSelection, ProjectileLaunchParams
+
+client = TestClient(app)
+
+def test_fingerprint_resolves_defaults_and_normalizes_floats():
+    implicit = ProjectileLaunchParams(initial_velocity=0.1 + 0.2, launch_angle=45)
+    explicit = ProjectileLaunchParams(
+        initial_velocity=0.3, launch_angle=45.0, initial_height=0.0,
+        output_units=OutputUnitSelection(velocity_unit="m/s", time_unit="s", range_unit="m", height_unit="m"),
+    )
+    assert params_fingerprint("projectile-launch", implicit) == params_fingerprint("projectile-launch", explicit)
+    different = ProjectileLaunchParams(initial_velocity=0.3, launch_angle=45, output_units=OutputUnitSelection(range_unit="ft"))
+    assert params_fingerprint("projectile-launch", different) != params_fingerprint("projectile-launch", explicit)
+
+def test_lru_eviction_and_counters():
+    cache = SimulationResultCache(max_entries=2, ttl_seconds=60)
+    params = [ProjectileLaunchParams(initial_velocity=v, launch_angle=30) for v in (1, 2, 3)]
+    keys = [params_fingerprint("projectile-launch", p) for p in params]
+    cache.put(keys[0], params[0])
+    cache.put(keys[1], params[1])
+    assert cache.get(keys[0]) is params[0] # keys[0] passa a ser o mais recente
+    cache.put(keys[2], params[2])
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is params[2]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 1)
+    assert stats["modules"]["projectile-launch"] == {"hits": 2, "misses": 1}
+
+def test_ttl_expiration(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = SimulationResultCache(max_entries=10, ttl_seconds=5)
+    cache.put("acid-base:abc", ProjectileLaunchParams(initial_velocity=1, launch_angle=10))
+    now[0] += 6
+    assert cache.get("acid-base:abc") is None
+    assert cache.stats()["entries"] == 0
+
+def test_module_can_be_disabled():
+    cache = SimulationResultCache(max_entries=10, ttl_seconds=60)
+    cache.put("acid-base:abc", ProjectileLaunchParams(initial_velocity=1, launch_angle=10))
+    cache.set_module_enabled("acid-base", False)
+    assert not cache.is_enabled_for("acid-base")
+    assert cache.stats()["entries"] == 0
+    cache.set_module_enabled("acid-base", True)
+    assert cache.is_enabled_for("acid-base")
+
+def test_endpoint_serves_repeated_requests_from_cache():
+    simulation_cache.clear()
+    payload = {"parent1_genotype": "Aa", "parent2_genotype": "aa"}
+    before = simulation_cache.stats()["modules"].get("mendelian-genetics", {"hits": 0, "misses": 0})
+    first = client.post("/api/simulation/mendelian-genetics/start", json=payload)
+    second = client.post("/api/simulation/mendelian-genetics/start", json=payload)
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    after = client.get("/api/simulation-cache/stats").json()["modules"]["mendelian-genetics"]
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+
+def test_identical_concurrent_requests_are_coalesced(monkeypatch):
+
+    simulation_cache.clear()
+    module_instance = main.simulation_modules_registry["projectile-launch"]
+    calls = []
+    original_run = simulation_executor.run_simulation
+
+    async def slow_run(module, params):
+        calls.append(params)
+        await asyncio.sleep(0.05)
+        return await original_run(module, params)
+
+    monkeypatch.setattr(simulation_executor, "run_simulation", slow_run)
+
+    async def fire():
+        params = [ProjectileLaunchParams(initial_velocity=33, launch_angle=21) for _ in range(10)]
+        other = ProjectileLaunchParams(initial_velocity=34, launch_angle=21)
+        return await asyncio.gather(*[main.dispatch_simulation(module_instance, p) for p in params + [other]])
+
+    results = asyncio.run(fire())
+    assert len(calls) == 2
+    assert all(result is results[0] for result in results[:10])
+    assert results[10].parameters_used.initial_velocity == 34
+    assert main._inflight_simulations == {}
+
+def test_coalesced_errors_reach_every_waiter(monkeypatch):
+
+    async def failing_run(module, params):
+        await asyncio.sleep(0.01)
+        raise HTTPException(status_code=400, detail="falhou")
+
+    monkeypatch.setattr(simulation_executor, "run_simulation", failing_run)
+    module_instance = main.simulation_modules_registry["acid-base"]
+
+    async def fire():
+        params = AcidBaseSimulationParams(acid_concentration=0.3, acid_volume=10)
+        return await asyncio.gather(*[main.dispatch_simulation(module_instance, params) for _ in range(3)], return_exceptions=True)
+
+    outcomes = asyncio.run(fire())
+    assert all(isinstance(outcome, HTTPException) and outcome.detail == "falhou" for outcome in outcomes)
+    assert main._inflight_simulations == {}
+
+def test_stream_serves_cached_result_without_recomputing(monkeypatch):
+    simulation_cache.clear()
+    payload = {"initial_velocity": 27, "launch_angle": 33}
+    regular = client.post("/api/simulation/projectile-launch/start", json=payload).json()
+    module_instance = main.simulation_modules_registry["projectile-launch"]
+    monkeypatch.setattr(module_instance, "stream_simulation", lambda params: pytest.fail("resultado em cache foi recalculado"))
+    response = client.post("/api/simulation/projectile-launch/start", json=payload, headers={"Accept": "application/x-ndjson"})
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[0]["data"]["max_range"] == regular["max_range"]
+    assert [event["data"] for event in events if event["event"] == "point"] == regular["trajectory"]
+
+def test_stream_counts_toward_pending_limit(monkeypatch):
+    simulation_cache.clear()
+    payload = {"initial_velocity": 28, "launch_angle": 33}
+    monkeypatch.setattr(simulation_executor, "max_pending", 0)
+    response = client.post("/api/simulation/projectile-launch/start", json=payload, headers={"Accept": "application/x-ndjson"})
+    assert response.status_code == 503
+    monkeypatch.setattr(simulation_executor, "max_pending", 4)
+    response = client.post("/api/simulation/projectile-launch/start", json=payload, headers={"Accept": "application/x-ndjson"})
+    assert response.status_code == 200
+    assert simulation_executor.pending == 0
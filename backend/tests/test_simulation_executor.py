@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from backend.main import app, simulation_modules_registry
+from backend.simulation_cache import simulation_cache
+from backend.simulation_executor import SimulationExecutor, parse_pool_overrides, simulation_executor
+from backend.simulations.chemistry.models_acid_base import TitrationParams
+from backend.simulations.physics.models_projectile import ProjectileLaunchParams
+
+client = TestClient(app)
+
+def make_executor(**kwargs) -> SimulationExecutor:
+    options = {"thread_workers": 2, "process_workers": 1, "max_pending": 4}
+    options.update(kwargs)
+    return SimulationExecutor(**options)
+
+def test_parse_pool_overrides_ignores_invalid_entries():
+    overrides = parse_pool_overrides("projectile-launch=process, acid-base=fiber,,acid-base-titration=thread")
+    assert overrides == {"projectile-launch": "process", "acid-base-titration": "thread"}
+
+def test_pool_kind_follows_cost_hint_and_overrides(monkeypatch):
+    executor = make_executor(pool_overrides={"projectile-launch": "process"})
+    acid_base = simulation_modules_registry["acid-base"]
+    assert executor.pool_kind_for(acid_base) == "thread"
+    assert executor.pool_kind_for(simulation_modules_registry["projectile-launch"]) == "process"
+    monkeypatch.setattr(acid_base, "get_execution_cost", lambda: "heavy")
+    assert executor.pool_kind_for(acid_base) == "process"
+
+def test_run_simulation_in_thread_pool():
+    executor = make_executor()
+    params = ProjectileLaunchParams(initial_velocity=10, launch_angle=45)
+    result = asyncio.run(executor.run_simulation(simulation_modules_registry["projectile-launch"], params))
+    assert result.max_range > 0
+    assert executor.pending == 0
+
+def test_run_simulation_in_process_pool_reraises_http_errors():
+    executor = make_executor(pool_overrides={"acid-base-titration": "process"})
+    params = TitrationParams(
+        acid_concentration=0.1, acid_volume=50,
+        titrant_is_acid=False, titrant_concentration=0.1,
+        final_titrant_volume_ml=100, volume_increment_ml=0.001,
+    )
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(executor.run_simulation(simulation_modules_registry["acid-base-titration"], params))
+    assert exc_info.value.status_code == 400
+    assert "excede o limite" in exc_info.value.detail
+
+def test_full_queue_returns_503(monkeypatch):
+    simulation_cache.clear() # garante que a requisição chegue ao executor
+    monkeypatch.setattr(simulation_executor, "max_pending", 0)
+    response = client.post("/api/simulation/projectile-launch/start", json={"initial_velocity": 10, "launch_angle": 45})
+    assert response.status_code == 503
+    assert response.headers.get("retry-after") == "1"
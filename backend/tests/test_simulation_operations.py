@@ -0,0 +1,62 @@
+from fastapi.testclient import TestClient
+
+from backend.main import app
+
+client = TestClient(app)
+
+def test_experiments_list_their_operations():
+    experiments = {experiment["id"]: experiment for experiment in client.get("/api/experiments").json()}
+    assert "query" in experiments["projectile-launch"]["operations"]
+    assert experiments["acid-base"]["operations"] == []
+
+def test_projectile_query_operation():
+    response = client.post("/api/simulation/projectile-launch/operations/query", json={
+        "initial_velocity": 20, "launch_angle": 45, "times": [0, 1.3, 5], "x_positions": [40],
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert data["states_at_times"][1]["time"] == 1.3
+    assert data["states_at_times"][2] is None
+    assert data["states_at_positions"][0]["x"] == 40.0
+    assert data["impact"]["y"] == 0.0
+
+def test_operation_errors():
+    url = "/api/simulation/projectile-launch/operations/query"
+    assert client.post("/api/simulation/projectile-launch/operations/unknown", json={}).status_code == 404
+    assert client.post("/api/simulation/unknown/operations/query", json={}).status_code == 404
+    assert client.post(url, json={"launch_angle": 45}).status_code == 422
+    assert client.post(url, content="not json", headers={"Content-Type": "application/json"}).status_code == 400
+
+def test_projectile_aim_operation():
+    response = client.post("/api/simulation/projectile-launch/operations/aim", json={
+        "target_x": 30, "target_y": 5, "initial_velocity": 25, "initial_height": 1,
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert data["reachable"] is True
+    assert data["low_arc"]["launch_angle"] < data["high_arc"]["launch_angle"]
+    assert data["velocity_unit"] == "m/s"
+    assert client.post("/api/simulation/projectile-launch/operations/aim", json={"target_x": 0}).status_code == 422
+
+def test_projectile_ensemble_operation():
+    response = client.post("/api/simulation/projectile-launch/operations/ensemble", json={
+        "initial_velocity": 20, "launch_angle": 45, "samples": 500, "seed": 11,
+        "distributions": {"launch_angle": {"kind": "normal", "std": 2}},
+        "percentiles": [10, 90], "histogram_bins": 5,
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert data["seed"] == 11 and data["samples"] == 500
+    assert set(data["range"]["percentiles"]) == {"p10", "p90"}
+    assert len(data["landing_histogram"]["counts"]) == 5
+
+def test_projectile_envelope_operation():
+    response = client.post("/api/simulation/projectile-launch/operations/envelope", json={
+        "initial_velocity": 72, "initial_velocity_unit": "km/h", "angle_points": 91,
+        "output_units": {"range_unit": "ft"},
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["launch_angles"]) == len(data["ranges"]) == 91
+    assert data["range_unit"] == "ft" and data["height_unit"] == "m"
+    assert data["ranges"][45] == data["max_range"]
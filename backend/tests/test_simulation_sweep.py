@@ -0,0 +1,117 @@
+import math
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend import simulation_sweep
+from backend.simulation_executor import simulation_executor
+from backend.simulation_sweep import SweepAxis, SweepRequest, build_sweep_grid
+
+client = TestClient(app)
+
+def test_axis_step_includes_stop():
+    assert SweepAxis(start=0, stop=89, step=1).expand() == [float(i) for i in range(90)]
+
+def test_axis_log_grid():
+    values = SweepAxis(start=1e-6, stop=1e-3, num=4, scale="log").expand()
+    assert len(values) == 4
+    for expected, value in zip([1e-6, 1e-5, 1e-4, 1e-3], values):
+        assert math.isclose(value, expected, rel_tol=1e-9)
+
+def test_axis_requires_step_or_num():
+    with pytest.raises(ValueError):
+        SweepAxis(start=0, stop=10)
+
+def test_grid_is_c_ordered_and_supports_nested_fields():
+    sweep = SweepRequest(
+        base={"initial_velocity": 10, "launch_angle": 45},
+        axes={"launch_angle": SweepAxis(values=[30, 60]), "output_units.range_unit": SweepAxis(values=["m", "ft"])},
+    )
+    axis_values, shape, payloads = build_sweep_grid(sweep)
+    assert shape == [2, 2]
+    assert [(p["launch_angle"], p["output_units"]["range_unit"]) for p in payloads] == [(30, "m"), (30, "ft"), (60, "m"), (60, "ft")]
+    assert "output_units" not in sweep.base # o payload base não é alterado
+
+def test_grid_too_large(monkeypatch):
+    monkeypatch.setattr(simulation_sweep, "MAX_SWEEP_POINTS", 10)
+    sweep = SweepRequest(axes={"launch_angle": SweepAxis(start=0, stop=20, step=1)})
+    with pytest.raises(HTTPException) as exc_info:
+        build_sweep_grid(sweep)
+    assert exc_info.value.status_code == 400
+
+def test_sweep_endpoint_projectile_columns():
+    response = client.post("/api/simulation/projectile-launch/sweep", json={
+        "base": {"initial_velocity": 20},
+        "axes": {
+            "launch_angle": {"start": 0, "stop": 89, "step": 1},
+            "initial_velocity": {"values": [10, 20, 30]},
+        },
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert data["shape"] == [90, 3]
+    assert len(data["columns"]["max_range"]) == 270
+    assert data["errors"] == []
+    # 45° com v0=20 m/s: alcance = v0²/g
+    index_45_20 = 45 * 3 + 1
+    assert math.isclose(data["columns"]["max_range"][index_45_20], 400 / 9.81, rel_tol=1e-3)
+
+def test_sweep_endpoint_reports_per_item_errors():
+    response = client.post("/api/simulation/projectile-launch/sweep", json={
+        "base": {"launch_angle": 30},
+        "axes": {"initial_velocity": {"values": [10, -1]}},
+    })
+    data = response.json()
+    assert data["columns"]["max_range"][1] is None
+    assert data["errors"][0]["index"] == 1
+    assert data["errors"][0]["status_code"] == 422
+
+def test_sweep_respects_pending_limit(monkeypatch):
+    monkeypatch.setattr(simulation_executor, "max_pending", 0)
+    response = client.post("/api/simulation/projectile-launch/sweep", json={
+        "base": {"initial_velocity": 20}, "axes": {"launch_angle": {"values": [30, 45]}},
+    })
+    assert response.status_code == 503
+
+def test_sweep_fan_out_reserves_one_slot_per_chunk(monkeypatch):
+    monkeypatch.setattr(simulation_executor, "max_pending", 2)
+    monkeypatch.setattr(simulation_executor, "pending", 1)
+    response = client.post("/api/simulation/projectile-launch/sweep", json={
+        "base": {"initial_velocity": 20}, "axes": {"launch_angle": {"start": 0, "stop": 89, "step": 1}},
+    })
+    assert response.status_code == 503
+
+def test_grid_limit_is_checked_before_expanding_axes(monkeypatch):
+    monkeypatch.setattr(SweepAxis, "expand", lambda self: pytest.fail("eixo expandido antes da verificação do limite"))
+    sweep = SweepRequest(axes={"launch_angle": SweepAxis(start=0, stop=1e12, step=1e-3)})
+    with pytest.raises(HTTPException) as exc_info:
+        build_sweep_grid(sweep)
+    assert exc_info.value.status_code == 400
+
+def test_axis_rejects_unbounded_definitions():
+    with pytest.raises(ValueError):
+        SweepAxis(start=0, stop=1, num=simulation_sweep.MAX_SWEEP_POINTS + 1)
+    with pytest.raises(ValueError):
+        SweepAxis(start=0, stop=1e300, step=1e-300)
+
+def test_sweep_titration_flattens_list_fields():
+    response = client.post("/api/simulation/acid-base-titration/sweep", json={
+        "base": {
+            "acid_volume": 50, "acid_ka": 1.8e-5,
+            "titrant_is_acid": False, "titrant_concentration": 0.1,
+            "final_titrant_volume_ml": 80, "volume_increment_ml": 0.5,
+        },
+        "axes": {"acid_concentration": {"values": [0.05, 0.1]}},
+    })
+    data = response.json()
+    assert data["errors"] == []
+    columns = data["columns"]
+    # Equivalência em C·V/Ct: 25 mL e 50 mL.
+    for expected, volume in zip([25.0, 50.0], columns["equivalence_points_ml"]):
+        assert abs(volume - expected) < 1.0
+    assert columns["equivalence_points_ml_count"] == [1, 1]
+    assert columns["titration_curve_count"] == [161, 161]
+    assert all(ph > 12 for ph in columns["titration_curve.last.ph"])
+    assert columns["titration_curve.first.ph"][0] < columns["titration_curve.last.ph"][0]
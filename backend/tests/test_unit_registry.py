@@ -0,0 +1,36 @@
+import math
+
+import pytest
+
+from backend.simulations.unit_registry import UNIT_DEFINITIONS, conversion_factor, convert_values
+from backend.simulations.physics import unit_conversion as uc
+
+
+def test_factors_match_legacy_scalar_conversions():
+    for unit in ("m", "km", "ft", "mi"):
+        assert conversion_factor("m", unit) == uc.convert_length_from_base(1.0, unit)
+    for unit in ("m/s", "km/h", "ft/s", "mph"):
+        assert conversion_factor("m/s", unit) == uc.convert_velocity_from_base(1.0, unit)
+        assert math.isclose(conversion_factor(unit, "m/s"), uc.convert_velocity_to_base(1.0, unit))
+    assert conversion_factor("s", "min") == uc.convert_time_from_base(1.0, "min")
+
+
+def test_round_trips_and_chemistry_units():
+    for units in UNIT_DEFINITIONS.values():
+        for a in units:
+            for b in units:
+                assert math.isclose(conversion_factor(a, b) * conversion_factor(b, a), 1.0, rel_tol=1e-5)
+    assert convert_values([250.0, 1000.0], "mL", "L") == [0.25, 1.0]
+    assert convert_values([0.002], "mol", "mmol") == [2.0]
+    values = [1.0, 2.0]
+    copy = convert_values(values, "L", "L")
+    assert copy == values and copy is not values
+
+
+def test_unknown_or_incompatible_units():
+    with pytest.raises(ValueError):
+        conversion_factor("m", "furlong")
+    with pytest.raises(ValueError):
+        conversion_factor("mL", "m")
+    with pytest.raises(ValueError):
+        uc.convert_length_to_base(1.0, "m/s")